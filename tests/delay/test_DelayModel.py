@@ -0,0 +1,37 @@
+import unittest
+import math
+from network_envs.delay.ExponentialDelayModel import ExponentialDelayModel
+from network_envs.delay.MM1DelayModel import MM1DelayModel
+from network_envs.delay.PiecewiseDelayModel import PiecewiseDelayModel
+
+
+class test_DelayModel(unittest.TestCase):
+
+
+    def test_exponential(self):
+        """Test that the default curve is the original one."""
+        model = ExponentialDelayModel()
+        for load_rate in (0.0, 0.1, 0.35, 0.9, 1.0):
+            self.assertEqual(model.delay(load_rate),
+                             (20 / math.exp(3)) * math.exp(3 * load_rate))
+
+    def test_mm1(self):
+        """Test that the M/M/1 delay grows as 1 / (1 - load rate) and is
+        capped.
+        """
+        model = MM1DelayModel(service_delay=2.0, max_delay=50.0)
+        self.assertEqual(model.delay(0.0), 2.0)
+        self.assertEqual(model.delay(0.5), 4.0)
+        self.assertEqual(model.delay(0.99), 50.0)
+        self.assertEqual(model.delay(1.0), 50.0)
+
+    def test_piecewise(self):
+        """Test that the table is interpolated and validated."""
+        model = PiecewiseDelayModel([0.0, 0.5, 1.0], [1.0, 2.0, 10.0])
+        self.assertEqual(model.delay(0.25), 1.5)
+        self.assertEqual(model.delay(0.75), 6.0)
+        self.assertEqual(model.delay(1.0), 10.0)
+        with self.assertRaises(ValueError):
+            PiecewiseDelayModel([0.0, 1.0], [1.0])
+        with self.assertRaises(ValueError):
+            PiecewiseDelayModel([0.5, 0.5], [1.0, 2.0])
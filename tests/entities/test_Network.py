@@ -1,15 +1,34 @@
 import unittest
 from pathlib import Path
 import json
+import math
+import tempfile
+import networkx as nx
+import numpy as np
 from uav_mobility_app.network_envs.entities.NetworkLink import NetworkLink
 from uav_mobility_app.network_envs.entities.NetworkDevice import NetworkDevice
 from uav_mobility_app.network_envs.entities.NetworkNode import NetworkNode
 from uav_mobility_app.network_envs.entities.Network import Network
 from uav_mobility_app.network_envs.entities.Network import ExtendedNetworkLink
 from uav_mobility_app.network_envs.utils.NetworkJSONParser import parse_json
+from network_envs.enums.MobilityMode import MobilityMode
+from network_envs.enums.PathCost import PathCost
+from network_envs.enums.NetworkLinkTier import NetworkLinkTier
+from network_envs.delay.MM1DelayModel import MM1DelayModel
+from network_envs.delay.PiecewiseDelayModel import PiecewiseDelayModel
+from network_envs.enums.GraphBackendType import GraphBackendType
+from network_envs.enums.AllocationEventType import AllocationEventType
 
 class test_Network(unittest.TestCase):
+    """Runs against the NetworkX backend. test_Network_array runs the
+    same tests against the array backend.
+    """
 
+    backend: GraphBackendType = GraphBackendType.NETWORKX
+
+    def build_network(self, configuration: Path, **kwargs) -> Network:
+        """Creates a Network that uses the backend under test."""
+        return Network(configuration, backend=self.backend, **kwargs)
 
     def test_initialization(self):
         """Checks that the initialization of a Network is consistent.
@@ -29,7 +48,7 @@ class test_Network(unittest.TestCase):
                 input_data["network_nodes"])))
             n_network_devices: int = len(input_data["network_devices"])
             n_network_links: int = len(input_data["network_links"])
-            net = Network(input_path)
+            net = self.build_network(input_path)
             self.assertEqual(len(net.nodes),
                             n_network_devices + n_network_nodes)
             self.assertEqual(len(net.gateways), n_gws)
@@ -45,7 +64,7 @@ class test_Network(unittest.TestCase):
         input_path: Path = Path.cwd().joinpath("input", "network_00.json")
         input_data = parse_json(input_path)
         expected_nodes: list[NetworkNode] = input_data["network_nodes"]
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_nodes = zip(net.network_nodes, expected_nodes)
         for (n1, n2) in zipped_nodes:
             self.assertEqual(n1.id, n2.id)
@@ -62,7 +81,7 @@ class test_Network(unittest.TestCase):
         expected_gateways: list[NetworkNode] = list(filter(
             lambda network_node: network_node.node_type == "GW",
             input_data))
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_gateways = zip(net.gateways, expected_gateways)
         for (g1, g2) in zipped_gateways:
             self.assertEqual(g1.id, g2.id)
@@ -79,7 +98,7 @@ class test_Network(unittest.TestCase):
         expected_switches: list[NetworkNode] = list(filter(
             lambda network_node: network_node.node_type == "SW",
             input_data))
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_switches = zip(net.switches, expected_switches)
         for (s1, s2) in zipped_switches:
             self.assertEqual(s1.id, s2.id)
@@ -96,7 +115,7 @@ class test_Network(unittest.TestCase):
         expected_access_points: list[NetworkNode] = list(filter(
             lambda network_node: network_node.node_type == "AP",
             input_data))
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_access_points = zip(net.switches, expected_access_points)
         for (a1, a2) in zipped_access_points:
             self.assertEqual(a1.id, a2.id)
@@ -111,7 +130,7 @@ class test_Network(unittest.TestCase):
         input_path: Path = Path.cwd().joinpath("input", "network_00.json")
         input_data = parse_json(input_path)
         expected_devices : list[NetworkDevice] = input_data["network_devices"]
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_devices = zip(net.network_devices, expected_devices)
         for (d1, d2) in zipped_devices:
             self.assertEqual(d1.id, d2.id)
@@ -132,7 +151,7 @@ class test_Network(unittest.TestCase):
         expected_uavs: list[NetworkDevice] = list(filter(
             lambda network_device: network_device.device_type == "UAV",
             input_data))
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_uavs = zip(net.uavs, expected_uavs)
         for (u1, u2) in zipped_uavs:
             self.assertEqual(u1.id, u2.id)
@@ -153,7 +172,7 @@ class test_Network(unittest.TestCase):
         expected_cams: list[NetworkDevice] = list(filter(
             lambda network_device: network_device.device_type == "CAM",
             input_data))
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_cams = zip(net.cams, expected_cams)
         for (c1, c2) in zipped_cams:
             self.assertEqual(c1.id, c2.id)
@@ -172,7 +191,7 @@ class test_Network(unittest.TestCase):
         input_data = parse_json(input_path)
         expected_links = input_data["network_links"]
         expected_links: list[NetworkLink] = [l[2] for l in expected_links]
-        net = Network(input_path)
+        net = self.build_network(input_path)
         zipped_links = zip(net.network_links, expected_links)
         for (l1, l2) in zipped_links:
             self.assertEqual(l1.id, l2.id)
@@ -186,7 +205,7 @@ class test_Network(unittest.TestCase):
         """Test that the expected shortest paths from the testing
         scenario are returned in different situations.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
 
         uav0: NetworkDevice = None
         for uav in net.uavs:
@@ -226,7 +245,7 @@ class test_Network(unittest.TestCase):
         that the NetworkDevice request are allocated in all the
         NetworkLinks that make up the path.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
 
         uav0: NetworkDevice = None
         for uav in net.uavs:
@@ -266,7 +285,7 @@ class test_Network(unittest.TestCase):
         """Test that given a NetworkDevice, the path were its resources
         are allocated is returned. The order of NetworksLink is irrelevant.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
         uav0: NetworkDevice = None
         for uav in net.uavs:
             if (uav.name == "uav_00"):
@@ -303,7 +322,7 @@ class test_Network(unittest.TestCase):
         requested resources are removed from all the NetworkLinks of the
         Network.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
         uav0: NetworkDevice = None
         for uav in net.uavs:
             if (uav.name == "uav_00"):
@@ -342,7 +361,7 @@ class test_Network(unittest.TestCase):
         ExtendedNewtorkLinks that are returned lead to the gw of the
         network.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
         ap0: NetworkNode = list(filter(lambda ap: ap.name == "ap_00",
                                   net.access_points))[0]
         switch_01: NetworkNode = list(filter(lambda ap: ap.name == "switch_01",
@@ -367,7 +386,7 @@ class test_Network(unittest.TestCase):
         NetworkDeviceType.UAV is generated, the NetworkLinks are updated
         consistenly and that the NetworkDevice is set to active.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
         seed: int = 0
         uav = net.generate_uav_event(seed=seed)
         self.assertTrue(uav.is_active)
@@ -382,7 +401,7 @@ class test_Network(unittest.TestCase):
         NetworkDeviceType.CAM only inactive cameras are taken into
         account and that the chosen is set to active.
         """
-        net: Network = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
         seed: int = 0
         n_cams: int = len(net.cams)
         for i in range(n_cams):
@@ -392,3 +411,581 @@ class test_Network(unittest.TestCase):
             self.assertEqual(n_inactive_cameras, n_cams - i)
             cam = net.generate_cam_event(seed=seed)
             self.assertTrue(cam.is_active)
+
+    def test_k_shortest_paths_to_gw(self):
+        """Test that the candidate paths are loopless, lead to the
+        gateway, are sorted by delay and avoid the NetworkLinks without
+        enough throughput.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        gateway: NetworkNode = net.gateways[0]
+        paths = net.k_shortest_paths_to_gw(uav0, gateway, 4)
+        self.assertEqual(len(paths), 4)
+        delays: list[float] = []
+        for path in paths:
+            self.assertEqual(path[0][0], uav0)
+            self.assertEqual(path[-1][1], gateway)
+            nodes = [u for (u, _, _) in path] + [gateway]
+            self.assertEqual(len(nodes), len(set(nodes)))
+            delays.append(sum(l["data"].delay for (_, _, l) in path))
+        self.assertEqual(delays, sorted(delays))
+        switch_01: NetworkNode = list(filter(lambda s: s.name == "switch_01",
+                                        net.switches))[0]
+        switch_04: NetworkNode = list(filter(lambda s: s.name == "switch_04",
+                                        net.switches))[0]
+        net[switch_01][switch_04]["data"].available_throughput = 0.0
+        for path in net.k_shortest_paths_to_gw(uav0, gateway, 10):
+            self.assertFalse((switch_01, switch_04) in
+                             [(u, v) for (u, v, _) in path])
+
+    def test_k_shortest_paths_to_gw_all(self):
+        """Test that, when k exceeds the number of paths, every loopless
+        path with enough throughput is found, as networkx finds them.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        gateway: NetworkNode = net.gateways[0]
+        switch_02: NetworkNode = list(filter(lambda s: s.name == "switch_02",
+                                        net.switches))[0]
+        switch_05: NetworkNode = list(filter(lambda s: s.name == "switch_05",
+                                        net.switches))[0]
+        net[switch_02][switch_05]["data"].available_throughput = 0.0
+        routable = nx.DiGraph()
+        routable.add_edges_from(
+            (u, v) for (u, v, l) in net.edges(data="data")
+            if (net.is_routable(u, v, l, uav0.throughput_req)))
+        expected = {tuple(p) for p in nx.all_simple_paths(routable,
+                                                          uav0,
+                                                          gateway)}
+        paths = net.k_shortest_paths_to_gw(uav0, gateway, 1000)
+        found = {tuple([u for (u, _, _) in path] + [gateway])
+                 for path in paths}
+        self.assertEqual(len(paths), len(found))
+        self.assertEqual(found, expected)
+        delays = [sum(l["data"].delay for (_, _, l) in path)
+                  for path in paths]
+        self.assertEqual(delays, sorted(delays))
+
+    def test_shortest_path_to_gw_reuses_allocation(self):
+        """Test that the throughput that a NetworkDevice is using counts
+        as available when it is routed again.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        gateway: NetworkNode = net.gateways[0]
+        path: list[NetworkLink] = net.shortest_path_to_gw(uav0, gateway)
+        self.assertTrue(net.assign_path_to_device(uav0, path))
+        # Leave 50 Gb/s everywhere, so only the NetworkLinks of the
+        # current path fit the 100 Gb/s of the UAV
+        for l in net.network_links:
+            if (net.link_tier(l) != NetworkLinkTier.ACCESS):
+                net.set_background_load(l, l.available_throughput - 50.0)
+        self.assertEqual(net.shortest_path_to_gw(uav0, gateway), path)
+        self.assertEqual(net.widest_path_to_gw(uav0, gateway), path)
+
+    def test_shortest_path_to_gw_no_path(self):
+        """Test that the graph is not modified when looking for a path,
+        even if there is none.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        switch_01: NetworkNode = list(filter(lambda s: s.name == "switch_01",
+                                        net.switches))[0]
+        n_edges: int = net.number_of_edges()
+        for v in net[switch_01]:
+            net[switch_01][v]["data"].available_throughput = 0.0
+        with self.assertRaises(nx.NetworkXNoPath):
+            net.shortest_path_to_gw(uav0, net.gateways[0])
+        with self.assertRaises(nx.NetworkXNoPath):
+            net.widest_path_to_gw(uav0, net.gateways[0])
+        self.assertEqual(net.number_of_edges(), n_edges)
+        for (_, _, attr) in net.edges(data=True):
+            self.assertEqual(list(attr.keys()), ["data"])
+
+    def test_widest_path_to_gw(self):
+        """Test that the widest path maximizes the bottleneck among all
+        the paths to the gateway.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        gateway: NetworkNode = net.gateways[0]
+        switches: dict[str, NetworkNode] = {s.name: s for s in net.switches}
+        net[switches["switch_01"]][switches["switch_04"]]["data"]\
+            .available_throughput = 300.0
+        net[switches["switch_02"]][switches["switch_04"]]["data"]\
+            .available_throughput = 500.0
+        path = net.widest_path_to_gw(uav0, gateway)
+        self.assertEqual(path[0], net[uav0][net.attached_ap(uav0)]["data"])
+        bottleneck = min(l.available_throughput for l in path[::2])
+        self.assertEqual(bottleneck, 1000.0)
+        self.assertNotIn(
+            net[switches["switch_01"]][switches["switch_04"]]["data"], path)
+
+    def test_min_delay_widest_path_to_gw(self):
+        """Test that the path has the least delay and, among the paths
+        with that delay, the largest bottleneck.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav2: NetworkDevice = list(filter(lambda u: u.name == "uav_02",
+                                          net.uavs))[0]
+        gateway: NetworkNode = net.gateways[0]
+        switches: dict[str, NetworkNode] = {s.name: s for s in net.switches}
+        # Both two-switch paths end up with the same delay
+        net[switches["switch_02"]][switches["switch_04"]]["data"]\
+            .available_throughput = 800.0
+        net[switches["switch_05"]][gateway]["data"]\
+            .available_throughput = 800.0
+        net[switches["switch_02"]][switches["switch_05"]]["data"]\
+            .available_throughput = 900.0
+        net[switches["switch_04"]][gateway]["data"]\
+            .available_throughput = 900.0
+        path = net.min_delay_widest_path_to_gw(uav2, gateway)
+        delay = sum(l.delay for l in path[::2])
+        shortest = net.shortest_path_to_gw(uav2, gateway)
+        self.assertAlmostEqual(delay, sum(l.delay for l in shortest[::2]))
+        for nodes in nx.all_simple_paths(net, uav2, gateway):
+            links = net.path_links(nodes)[::2]
+            if (math.isclose(sum(l.delay for l in links), delay)):
+                self.assertGreaterEqual(
+                    min(l.available_throughput for l in path[::2]),
+                    min(l.available_throughput for l in links))
+
+    def test_delay_constrained_path_to_gw(self):
+        """Test that the path meets the delay requirement while
+        disturbing as few workflows as possible, and that infeasible
+        requests are detected.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        cam0: NetworkDevice = list(filter(lambda c: c.name == "cam_00",
+                                          net.cams))[0]
+        gateway: NetworkNode = net.gateways[0]
+        nodes: dict[str, NetworkNode] = {n.name: n for n in net.network_nodes}
+        # Without load, the least disturbing path is the shortest one
+        self.assertEqual(net.delay_constrained_path_to_gw(uav0, gateway),
+                         net.shortest_path_to_gw(uav0, gateway))
+        net.assign_path_to_device(cam0, net.shortest_path_to_gw(cam0, gateway))
+        # The shortest undisturbed detour exceeds the delay requirement
+        net[nodes["switch_02"]][nodes["switch_05"]]["data"]\
+            .available_throughput = 100.0
+        net[nodes["switch_05"]][nodes["gateway"]]["data"]\
+            .available_throughput = 300.0
+        path = net.delay_constrained_path_to_gw(uav0, gateway)
+        self.assertLessEqual(sum(l.delay for l in path[::2]), uav0.delay_req)
+        self.assertNotIn(
+            net[nodes["switch_02"]][nodes["switch_05"]]["data"], path)
+        # Only the NetworkLink between ap_00 and switch_01 is shared
+        changes = [l for l in path[::2] if len(l.routed_flows) > 0]
+        self.assertEqual(len(changes), 1)
+        path = net.delay_constrained_path_to_gw(uav0, gateway, PathCost.HOPS)
+        self.assertEqual(len(path), 8)
+        net[nodes["switch_01"]][nodes["switch_04"]]["data"]\
+            .available_throughput = 100.0
+        net[nodes["switch_01"]][nodes["switch_02"]]["data"]\
+            .available_throughput = 100.0
+        net[nodes["switch_04"]][nodes["gateway"]]["data"]\
+            .available_throughput = 100.0
+        net[nodes["switch_05"]][nodes["gateway"]]["data"]\
+            .available_throughput = 100.0
+        with self.assertRaises(nx.NetworkXNoPath):
+            net.delay_constrained_path_to_gw(uav0, gateway)
+
+    def test_link_stats(self):
+        """Test that the per-tier utilization and the most loaded
+        NetworkLinks follow the allocations.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        cam0: NetworkDevice = list(filter(lambda c: c.name == "cam_00",
+                                          net.cams))[0]
+        gateway: NetworkNode = net.gateways[0]
+        for tier in NetworkLinkTier:
+            self.assertEqual(net.tier_utilization(tier), 0.0)
+        self.assertEqual(net.most_loaded_links(3), [])
+        path = net.shortest_path_to_gw(cam0, gateway)
+        net.assign_path_to_device(cam0, path)
+        backhaul = [l for l in net.network_links
+                    if net.link_tier(l) == NetworkLinkTier.BACKHAUL]
+        self.assertAlmostEqual(
+            net.tier_utilization(NetworkLinkTier.BACKHAUL),
+            2 * cam0.throughput_req / sum(l.max_throughput for l in backhaul))
+        self.assertTrue(net.set_background_load(path[4], 500.0))
+        top = net.most_loaded_links(3)
+        self.assertEqual(top[0], (path[4], 0.6))
+        self.assertEqual(len(top), 3)
+        self.assertEqual(top[1][1], 0.1)
+        net.free_path_device(cam0, path)
+        self.assertEqual(net.most_loaded_links(3), [(path[4], 0.5)])
+        net.set_background_load(path[4], 0.0)
+        self.assertEqual(net.most_loaded_links(3), [])
+
+    def test_can_admit(self):
+        """Test that the capacity of the APs is the bottleneck of the
+        widest path to the gateway and that it is updated.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        cam0: NetworkDevice = list(filter(lambda c: c.name == "cam_00",
+                                          net.cams))[0]
+        nodes: dict[str, NetworkNode] = {n.name: n for n in net.network_nodes}
+        self.assertEqual(net.ap_capacity(nodes["ap_00"]), 1000.0)
+        self.assertTrue(net.can_admit(cam0))
+        net.set_background_load(
+            net[nodes["switch_01"]][nodes["switch_04"]]["data"], 950.0)
+        net.set_background_load(
+            net[nodes["switch_02"]][nodes["switch_01"]]["data"], 980.0)
+        self.assertEqual(net.ap_capacity(nodes["ap_00"]), 50.0)
+        self.assertEqual(net.ap_capacity(nodes["ap_01"]), 50.0)
+        self.assertEqual(net.ap_capacity(nodes["ap_02"]), 1000.0)
+        self.assertFalse(net.can_admit(cam0))
+        self.assertTrue(net.can_admit(cam0, nodes["ap_02"]))
+        self.assertFalse(net.assign_path_to_device(
+            cam0,
+            net.shortest_path_to_gw(cam0, net.gateways[0])))
+
+    def test_bottleneck_widths_cache(self):
+        """Test that the cached bottleneck widths always match a fresh
+        computation and that they are kept up to date without searching
+        the whole Network again.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        net.rng = np.random.default_rng(0)
+        gateway: NetworkNode = net.gateways[0]
+        widths = net.bottleneck_widths()
+        searches = []
+        backend_tree = net._backend.bottleneck_tree
+        net._backend.bottleneck_tree = lambda gateways: (
+            searches.append(gateways) or backend_tree(gateways))
+        tree_links = set(net._bottleneck_parents.values())
+        tree_links |= {net._reverse_links[l] for l in tree_links}
+        spare = next(l for l in net.network_links
+                     if (net.link_tier(l) != NetworkLinkTier.ACCESS
+                         and l not in tree_links))
+        # Lowering an edge out of the tree and raising it back are free
+        net.set_background_load(spare, 700.0)
+        self.assertIs(net.bottleneck_widths(), widths)
+        net.set_background_load(spare, 0.0)
+        self.assertIs(net.bottleneck_widths(), widths)
+        core = [l for l in net.network_links
+                if (net.link_tier(l) != NetworkLinkTier.ACCESS)]
+        for _ in range(100):
+            device = net.generate_uav_event()
+            net.free_path_device(device, net.get_path_device(device))
+            try:
+                net.assign_path_to_device(
+                    device,
+                    net.shortest_path_to_gw(device, gateway))
+            except nx.NetworkXNoPath:
+                pass
+            link = core[net.random.integers(len(core))]
+            net.set_background_load(
+                link,
+                min(net.random.uniform(0.0, 900.0),
+                    link.available_throughput))
+            self.assertEqual(net.bottleneck_widths(),
+                             backend_tree(net.gateways)[0])
+        self.assertIs(net.bottleneck_widths(), widths)
+        self.assertEqual(searches, [])
+
+    def test_bottleneck_widths_one_way(self):
+        """Test that an edge with a single direction gets no width, so
+        its source reaches the Gateways through other edges.
+        """
+        input_path: Path = Path.cwd().joinpath("input", "network_00.json")
+        with open(input_path) as input_file:
+            configuration = json.load(input_file)
+        configuration["network_links"] = [
+            l for l in configuration["network_links"]
+            if (l["name"] != "gateway | switch_04")]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            one_way_path = Path(tmp_dir).joinpath("network.json")
+            one_way_path.write_text(json.dumps(configuration))
+            net: Network = self.build_network(one_way_path)
+        nodes: dict[str, NetworkNode] = {n.name: n for n in net.network_nodes}
+        self.assertEqual(net.bottleneck_widths()[nodes["switch_04"]], 1000.0)
+        net.set_background_load(
+            net[nodes["switch_05"]][nodes["gateway"]]["data"], 600.0)
+        self.assertEqual(net.bottleneck_widths()[nodes["switch_04"]], 400.0)
+        self.assertEqual(net.bottleneck_widths(),
+                         net._backend.bottleneck_widths(net.gateways))
+
+    def test_split_flow_to_gw(self):
+        """Test that a workflow that does not fit in any single path is
+        split and allocated across several paths.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        cam0: NetworkDevice = list(filter(lambda c: c.name == "cam_00",
+                                          net.cams))[0]
+        gateway: NetworkNode = net.gateways[0]
+        nodes: dict[str, NetworkNode] = {n.name: n for n in net.network_nodes}
+        self.assertEqual(len(net.split_flow_to_gw(cam0, gateway)), 1)
+        net.set_background_load(
+            net[nodes["switch_01"]][nodes["switch_04"]]["data"], 930.0)
+        net.set_background_load(
+            net[nodes["switch_01"]][nodes["switch_02"]]["data"], 960.0)
+        with self.assertRaises(nx.NetworkXNoPath):
+            net.shortest_path_to_gw(cam0, gateway)
+        with self.assertRaises(nx.NetworkXNoPath):
+            net.split_flow_to_gw(cam0, gateway, max_paths=1)
+        split = net.split_flow_to_gw(cam0, gateway)
+        self.assertEqual([share for _, share in split], [70.0, 30.0])
+        self.assertTrue(net.assign_multipath_to_device(cam0, split))
+        access = net[cam0][nodes["ap_00"]]["data"]
+        self.assertEqual(access.allocation(cam0), cam0.throughput_req)
+        self.assertEqual(
+            net[nodes["switch_01"]][nodes["switch_04"]]["data"]
+            .available_throughput,
+            0.0)
+        self.assertFalse(net.assign_multipath_to_device(cam0, split))
+        net.free_path_device(cam0, net.get_path_device(cam0))
+        for l in net.network_links:
+            self.assertEqual(len(l.routed_flows), 0)
+        self.assertEqual(access.available_throughput, access.max_throughput)
+
+    def test_delay_model(self):
+        """Test that the DelayModel of the Network applies to all the
+        NetworkLinks and changes the chosen paths accordingly.
+        """
+        model = PiecewiseDelayModel([0.0, 0.05, 1.0], [1.0, 1.0, 100.0])
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"),
+                               delay_model=model)
+        self.assertIs(net.delay_model, model)
+        for l in net.network_links:
+            self.assertIs(l.delay_model, model)
+            self.assertEqual(l.delay, 1.0)
+        nodes: dict[str, NetworkNode] = {n.name: n for n in net.network_nodes}
+        link = net[nodes["switch_01"]][nodes["switch_04"]]["data"]
+        net.set_background_load(link, 100.0)
+        self.assertAlmostEqual(link.delay, 1.0 + 99.0 * 0.05 / 0.95)
+        net.delay_model = MM1DelayModel()
+        self.assertAlmostEqual(link.delay, 1.0 / 0.9)
+
+    def test_link_notifications(self):
+        """Test that subscribers and dirty sets receive the NetworkLinks
+        that change, whoever changes them.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        cam0: NetworkDevice = list(filter(lambda c: c.name == "cam_00",
+                                          net.cams))[0]
+        changed = []
+        net.subscribe(changed.append)
+        dirty_links = net.track_dirty_links()
+        path = net.shortest_path_to_gw(cam0, net.gateways[0])
+        net.assign_path_to_device(cam0, path)
+        self.assertEqual(changed, path)
+        self.assertEqual(dirty_links, set(path))
+        dirty_links.clear()
+        # Changes made directly on a NetworkLink are also seen
+        path[4].available_throughput = 0.0
+        self.assertEqual(dirty_links, {path[4]})
+        self.assertEqual(net.most_loaded_links(1), [(path[4], 1.0)])
+        self.assertTrue(net.untrack_dirty_links(dirty_links))
+        self.assertFalse(net.untrack_dirty_links(dirty_links))
+        self.assertTrue(net.unsubscribe(changed.append))
+        net.free_path_device(cam0, path)
+        self.assertEqual(len(changed), len(path) + 1)
+        self.assertEqual(dirty_links, {path[4]})
+
+    def test_allocation_notifications(self):
+        """Test that the allocation subscribers receive the allocations,
+        rejections and frees, and that the delay of a path counts every
+        hop once.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        cam0: NetworkDevice = list(filter(lambda c: c.name == "cam_00",
+                                          net.cams))[0]
+        events = []
+        callback = lambda t, d, p: events.append((t, d, p))
+        net.subscribe_allocations(callback)
+        path = net.shortest_path_to_gw(cam0, net.gateways[0])
+        self.assertEqual(net.path_delay(path),
+                         sum(l.delay for l in path[::2]))
+        self.assertEqual(net.path_delay(path[::2]), net.path_delay(path))
+        net.assign_path_to_device(cam0, path)
+        self.assertFalse(net.assign_path_to_device(cam0, path))
+        net.free_path_device(cam0, path)
+        net.free_path_device(cam0, path)
+        self.assertEqual([(t, d) for t, d, _ in events],
+                         [(AllocationEventType.ALLOCATED, cam0),
+                          (AllocationEventType.REJECTED, cam0),
+                          (AllocationEventType.FREED, cam0)])
+        self.assertEqual(events[0][2], [path])
+        self.assertEqual(events[2][2], [path])
+        net.assign_path_to_device(cam0, path)
+        net.hard_reset()
+        self.assertEqual(events[-1][0], AllocationEventType.FREED)
+        self.assertEqual(set(events[-1][2][0]), set(path))
+        self.assertTrue(net.unsubscribe_allocations(callback))
+        self.assertFalse(net.unsubscribe_allocations(callback))
+
+    def test_backend_queries(self):
+        """Test that the queries of the backend agree with NetworkX and
+        follow the changes of the NetworkLinks and the handovers.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        gw: NetworkNode = net.gateways[0]
+        for n in net.network_nodes + net.network_devices:
+            self.assertEqual(net.hops_to_gw(n),
+                             nx.shortest_path_length(net, n, gw))
+        for d in net.network_devices:
+            reference = nx.dijkstra_path(
+                net, d, gw, weight=lambda u, v, l: l["data"].delay)
+            self.assertEqual(
+                sum(l.delay for l in net.shortest_path_to_gw(d, gw)[::2]),
+                sum(net[u][v]["data"].delay
+                    for u, v in zip(reference[:-1], reference[1:])))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        path = net.shortest_path_to_gw(uav0, gw)
+        # The core sees the saturated NetworkLink and the handover
+        path[4].available_throughput = 0.0
+        self.assertNotIn(path[4], net.shortest_path_to_gw(uav0, gw))
+        ap5: NetworkNode = list(filter(lambda ap: ap.name == "ap_05",
+                                       net.access_points))[0]
+        net.handover_uav(uav0, ap5)
+        self.assertEqual(net.shortest_path_to_gw(uav0, gw)[0],
+                         net[uav0][ap5]["data"])
+        self.assertEqual(net.hops_to_gw(uav0), net.hops_to_gw(ap5) + 1)
+        # The edges to the new AP lead towards the Gateway, the ones
+        # back to the UAV do not
+        next_links = net.get_next_link((uav0, ap5, net[uav0][ap5]))
+        self.assertCountEqual(next_links,
+                              [(ap5, v, attr)
+                               for (_, v, attr) in net.out_edges(ap5,
+                                                                 data=True)
+                               if (v in net.network_nodes)])
+
+    def test_handover_uav(self):
+        """Test that a handover moves the UAV's NetworkLinks to the new
+        AP, updates the attachment record and notifies the subscribers.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        uav0: NetworkDevice = list(filter(lambda u: u.name == "uav_00",
+                                          net.uavs))[0]
+        ap0: NetworkNode = list(filter(lambda ap: ap.name == "ap_00",
+                                       net.access_points))[0]
+        ap3: NetworkNode = list(filter(lambda ap: ap.name == "ap_03",
+                                       net.access_points))[0]
+        up_link: NetworkLink = net[uav0][ap0]["data"]
+        down_link: NetworkLink = net[ap0][uav0]["data"]
+        handovers: list = []
+        net.subscribe_handovers(lambda *args: handovers.append(args))
+        self.assertEqual(net.attached_ap(uav0), ap0)
+        net.handover_uav(uav0, ap3)
+        net.handover_uav(uav0, ap3)
+        self.assertEqual(net.attached_ap(uav0), ap3)
+        self.assertEqual(handovers, [(uav0, ap0, ap3)])
+        self.assertFalse(net.has_edge(uav0, ap0))
+        self.assertFalse(net.has_edge(ap0, uav0))
+        self.assertEqual(net[uav0][ap3]["data"], up_link)
+        self.assertEqual(net[ap3][uav0]["data"], down_link)
+        self.assertEqual(up_link.name, "uav_00 | ap_03")
+        self.assertEqual(down_link.name, "ap_03 | uav_00")
+
+    def test_generate_uav_event_deterministic(self):
+        """Test that the same seed leads to the same handovers and that
+        the UAV always changes its AP.
+        """
+        input_path: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_a: Network = self.build_network(input_path)
+        net_b: Network = self.build_network(input_path)
+        for seed in range(20):
+            uav_a = net_a.generate_uav_event(seed=seed)
+            uav_b = net_b.generate_uav_event(seed=seed)
+            self.assertEqual(uav_a.id, uav_b.id)
+            self.assertEqual(net_a.attached_ap(uav_a).id,
+                             net_b.attached_ap(uav_b).id)
+        # Seeding does not detach the Network from a shared generator
+        generator = np.random.default_rng(0)
+        net_a.rng = generator
+        net_a.generate_uav_event(seed=1)
+        self.assertIs(net_a.rng, generator)
+        for _ in range(20):
+            previous_aps = {u: net_a.attached_ap(u) for u in net_a.uavs}
+            uav = net_a.generate_uav_event()
+            self.assertNotEqual(net_a.attached_ap(uav), previous_aps[uav])
+
+    def test_trajectory_mobility(self):
+        """Test that in MobilityMode.TRAJECTORY UAVs follow their
+        trajectories and are attached to the nearest AP.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"),
+                               mobility=MobilityMode.TRAJECTORY)
+        ap0: NetworkNode = list(filter(lambda ap: ap.name == "ap_00",
+                                       net.access_points))[0]
+        ap5: NetworkNode = list(filter(lambda ap: ap.name == "ap_05",
+                                       net.access_points))[0]
+        self.assertEqual(net.nearest_ap((0.9, -3.0)), ap0)
+        self.assertEqual(net.nearest_ap((1.2, 9.8)), ap5)
+        waypoints = [(1.0, 10.4), (0.5, 0.1)]
+        for uav in net.uavs:
+            net.set_uav_trajectory(uav, waypoints)
+        for i in range(10):
+            uav = net.generate_uav_event(seed=i)
+            self.assertTrue(uav.is_active)
+            self.assertTrue(uav.position in waypoints)
+            self.assertEqual(net.attached_ap(uav),
+                             net.nearest_ap(uav.position))
+            self.assertEqual(list(net.out_edges(uav))[0][1],
+                             net.attached_ap(uav))
+        uav = net.uavs[0]
+        self.assertTrue(net.move_uav(uav, (1.0, 4.1)))
+        self.assertFalse(net.move_uav(uav, (1.1, 3.9)))
+
+    def test_cam_lifecycle(self):
+        """Test that cameras start and stop consistently, that their
+        resources are released when they stop and that they stop once
+        their duration elapses.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"),
+                               cam_mean_duration=2.0)
+        n_cams: int = len(net.cams)
+        cam = net.generate_cam_event(seed=0)
+        self.assertTrue(cam in net.active_cams)
+        self.assertEqual(len(net.inactive_cams), n_cams - 1)
+        path = net.shortest_path_to_gw(cam, net.gateways[0])
+        net.assign_path_to_device(cam, path)
+        stopped = net.generate_cam_stop_event()
+        self.assertEqual(stopped, cam)
+        self.assertFalse(cam.is_active)
+        self.assertEqual(len(net.get_path_device(cam)), 0)
+        self.assertTrue(net.has_inactive_cams)
+        for _ in range(n_cams):
+            net.generate_cam_event()
+        self.assertFalse(net.has_inactive_cams)
+        self.assertEqual(net.generate_cam_event(), None)
+        for _ in range(200):
+            net.generate_uav_event()
+        stopped = net.expire_cams()
+        self.assertEqual(len(stopped), n_cams)
+        self.assertEqual(len(net.active_cams), 0)
+        for c in net.cams:
+            self.assertFalse(c.is_active)
+
+    def test_hard_reset(self):
+        """Test that a hard reset releases all resources and sets all
+        NetworkDevices as inactive.
+        """
+        net: Network = self.build_network(Path.cwd().joinpath("input", "network_00.json"))
+        for _ in range(3):
+            cam = net.generate_cam_event()
+            net.assign_path_to_device(
+                cam,
+                net.shortest_path_to_gw(cam, net.gateways[0]))
+        uav = net.generate_uav_event()
+        net.hard_reset()
+        self.assertFalse(uav.is_active)
+        self.assertEqual(len(net.inactive_cams), len(net.cams))
+        for l in net.network_links:
+            self.assertEqual(l.available_throughput, l.max_throughput)
+            self.assertEqual(len(l.routed_flows), 0)
+
+
+class test_Network_array(test_Network):
+
+    backend: GraphBackendType = GraphBackendType.ARRAY
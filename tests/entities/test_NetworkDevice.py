@@ -241,4 +241,12 @@ class test_NetworkDevice(unittest.TestCase):
         network_dev.is_active = True
         self.assertTrue(network_dev.is_active)
         network_dev.is_active = False
-        self.assertFalse(network_dev.is_active)
\ No newline at end of file
+        self.assertFalse(network_dev.is_active)
+
+    def test_slots(self):
+        """Test that NetworkDevices do not have a per-instance __dict__.
+        """
+        network_dev = NetworkDevice(device_id=1)
+        self.assertFalse(hasattr(network_dev, "__dict__"))
+        with self.assertRaises(AttributeError):
+            network_dev.color = "red"
@@ -3,6 +3,7 @@ import math
 from network_envs.entities.NetworkLink import NetworkLink
 from network_envs.entities.NetworkDevice import NetworkDevice
 from network_envs.enums.NetworkDeviceType import NetworkDeviceType
+from network_envs.delay.MM1DelayModel import MM1DelayModel
 
 
 class test_NetworkLink(unittest.TestCase):
@@ -301,4 +302,90 @@ class test_NetworkLink(unittest.TestCase):
         self.assertTrue(result)
         self.assertAlmostEqual(available_throughput,
                                network_link.available_throughput,
-                               delta=0.01)
\ No newline at end of file
+                               delta=0.01)
+
+    def test_route_flow_share(self):
+        """Check that part of a workflow can be routed and that removing
+        it frees only the allocated throughput.
+        """
+        network_link: NetworkLink = NetworkLink(link_id=12,
+                                                max_throughput=1000.0,
+                                                available_throughput=1000.0)
+        dev1 = NetworkDevice(device_id=1,
+                             device_type=NetworkDeviceType.CAM,
+                             delay_req=20.0,
+                             throughput_req=100.0,
+                             position=(1,1))
+        self.assertEqual(network_link.allocation(dev1), 0.0)
+        self.assertFalse(network_link.route_flow_share(dev1, 1500.0))
+        self.assertTrue(network_link.route_flow_share(dev1, 40.0))
+        self.assertFalse(network_link.route_flow_share(dev1, 40.0))
+        self.assertEqual(network_link.allocation(dev1), 40.0)
+        self.assertEqual(network_link.available_throughput, 960.0)
+        self.assertTrue(network_link.remove_flow(dev1))
+        self.assertEqual(network_link.available_throughput, 1000.0)
+        network_link.route_new_flow(dev1)
+        self.assertEqual(network_link.allocation(dev1), 100.0)
+
+    def test_delay_cache(self):
+        """Check that the delay follows the available throughput and the
+        DelayModel of the NetworkLink.
+        """
+        network_link: NetworkLink = NetworkLink(link_id=12,
+                                                max_throughput=1000.0,
+                                                available_throughput=1000.0)
+        dev1 = NetworkDevice(device_id=1,
+                             device_type=NetworkDeviceType.CAM,
+                             delay_req=20.0,
+                             throughput_req=500.0,
+                             position=(1,1))
+        self.assertEqual(network_link.delay, 20 / math.exp(3))
+        network_link.route_new_flow(dev1)
+        self.assertEqual(network_link.delay,
+                         (20 / math.exp(3)) * math.exp(3 * 0.5))
+        network_link.delay_model = MM1DelayModel()
+        self.assertEqual(network_link.delay, 2.0)
+        network_link.available_throughput = 750.0
+        self.assertEqual(network_link.delay, 4.0 / 3.0)
+        network_link.available_throughput = 500.0
+        network_link.remove_flow(dev1)
+        self.assertEqual(network_link.delay, 1.0)
+
+    def test_listeners(self):
+        """Check that the listeners are notified of every change and
+        only while they are registered.
+        """
+        network_link: NetworkLink = NetworkLink(link_id=12,
+                                                max_throughput=1000.0,
+                                                available_throughput=1000.0)
+        dev1 = NetworkDevice(device_id=1,
+                             device_type=NetworkDeviceType.CAM,
+                             delay_req=20.0,
+                             throughput_req=100.0,
+                             position=(1,1))
+        notified = []
+        listener = lambda l: notified.append(l.available_throughput)
+        network_link.add_listener(listener)
+        network_link.route_new_flow(dev1)
+        network_link.route_new_flow(dev1)
+        network_link.available_throughput = 800.0
+        network_link.available_throughput = 2000.0
+        network_link.remove_flow(dev1)
+        network_link.route_flow_share(dev1, 50.0)
+        network_link.delay_model = MM1DelayModel()
+        self.assertEqual(notified, [900.0, 800.0, 900.0, 850.0, 850.0])
+        self.assertTrue(network_link.remove_listener(listener))
+        self.assertFalse(network_link.remove_listener(listener))
+        network_link.remove_flow(dev1)
+        self.assertEqual(len(notified), 5)
+
+    def test_slots(self):
+        """Check that NetworkLinks do not have a per-instance __dict__
+        and that link_name is an alias of name.
+        """
+        network_link: NetworkLink = NetworkLink(link_id=12)
+        self.assertFalse(hasattr(network_link, "__dict__"))
+        with self.assertRaises(AttributeError):
+            network_link.color = "red"
+        network_link.link_name = "link_01"
+        self.assertEqual(network_link.name, "link_01")
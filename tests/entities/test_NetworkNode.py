@@ -114,4 +114,12 @@ class test_NetworkNode(unittest.TestCase):
         finally:
             self.assertTrue(
                 exception_raised,
-                "Changing NetworkNode's position did not raise an exception")
\ No newline at end of file
+                "Changing NetworkNode's position did not raise an exception")
+
+    def test_slots(self):
+        """Test that NetworkNodes do not have a per-instance __dict__.
+        """
+        network_node = NetworkNode(1, "sw_00", NetworkNodeType.SW, (1, 2))
+        self.assertFalse(hasattr(network_node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            network_node.color = "red"
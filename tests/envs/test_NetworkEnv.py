@@ -6,9 +6,11 @@ from network_envs.entities.NetworkDevice import NetworkDevice
 from network_envs.entities.NetworkLink import NetworkLink
 from network_envs.enums.NetworkNodeType import NetworkNodeType
 from network_envs.enums.NetworkDeviceType import NetworkDeviceType
+from network_envs.enums.ObservationFeature import ObservationFeature
 from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
 from gymnasium.spaces import Space
 import numpy as np
+import tempfile
 from pathlib import Path
 
 
@@ -205,3 +207,119 @@ class test_NetworkEnv(unittest.TestCase):
         self.assertEqual((0, 0, 0), next_links[2])
         self.assertEqual((0, 0, 0), next_links[3])
         self.assertEqual((0, 0, 0), next_links[4])
+
+    def test_reset_trace(self):
+        """Test that when a trace is given, reset replays its events in
+        order, skipping the ones that do not require routing, and starts
+        over when the trace is exhausted.
+        """
+        trace = ("timestamp,event_type,device_id,x,y,ap_id\n"
+                 "0.0,CAM_START,206,,,\n"
+                 "1.0,UAV_HANDOVER,201,,,11\n"
+                 "2.0,CAM_STOP,206,,,\n"
+                 "3.0,UAV_POSITION,200,1.0,6.2,\n")
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_path = Path(tmp_dir).joinpath("trace.csv")
+            trace_path.write_text(trace)
+            net_env = NetworkEnv(configuration=configuration,
+                                 n_actions=5,
+                                 trace=trace_path)
+            network: Network = net_env.network
+            devices = []
+            for _ in range(4):
+                net_env.reset()
+                devices.append(net_env.get_wrapper_attr("_dev").id)
+            self.assertEqual(devices, [206, 201, 200, 206])
+            uav_00 = [u for u in network.uavs if u.id == 200][0]
+            uav_01 = [u for u in network.uavs if u.id == 201][0]
+            self.assertEqual(network.attached_ap(uav_01).id, 11)
+            self.assertEqual(network.attached_ap(uav_00).name, "ap_03")
+            self.assertEqual(uav_00.position, (1.0, 6.2))
+
+    def test_reset_seed(self):
+        """Test that two NetworkEnvs reset with the same seed generate
+        the same events and that they do not interfere with each other.
+        """
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        env_a = NetworkEnv(configuration=configuration, n_actions=5)
+        env_b = NetworkEnv(configuration=configuration, n_actions=5)
+        env_c = NetworkEnv(configuration=configuration, n_actions=5)
+        env_a.reset(seed=42)
+        env_c.reset(seed=7)
+        env_b.reset(seed=42)
+        self.assertEqual(env_a.network.rng, env_a.np_random)
+        for _ in range(20):
+            self.assertEqual(env_a.get_wrapper_attr("_dev").id,
+                             env_b.get_wrapper_attr("_dev").id)
+            env_a.reset()
+            env_c.reset()
+            env_b.reset()
+
+    def test_render_mode(self):
+        """Test that unsupported render modes are rejected and that
+        rendering without a render mode does nothing.
+        """
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        with self.assertRaises(ValueError):
+            NetworkEnv(configuration=configuration, render_mode="ansi")
+        net_env = NetworkEnv(configuration=configuration)
+        net_env.reset(seed=0)
+        self.assertIsNone(net_env.render())
+        net_env.close()
+
+    def test_profiling(self):
+        """Test that the hot paths of the env and its Network are timed
+        only while profiling is on.
+        """
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = NetworkEnv(configuration=configuration,
+                             n_actions=5,
+                             profile=True)
+        net_env.reset(seed=0)
+        for _ in range(10):
+            _, _, terminated, _, _ = net_env.step(0)
+            if (terminated):
+                net_env.reset()
+        stats = net_env.profiler.stats()
+        self.assertEqual(stats["NetworkEnv.step"]["count"], 10)
+        self.assertGreater(stats["NetworkEnv._get_obs"]["count"], 10)
+        self.assertGreater(stats["Network.get_next_link"]["count"], 0)
+        self.assertGreater(stats["NetworkEnv.reset"]["total"], 0.0)
+        net_env.set_profiling(False)
+        net_env.step(0)
+        self.assertEqual(net_env.profiler.stats()["NetworkEnv.step"]["count"],
+                         10)
+
+    def test_features(self):
+        """Test that the observation space and the observations follow
+        the selected features.
+        """
+        n_actions = 4
+        features = (ObservationFeature.HOPS,
+                    ObservationFeature.BOTTLENECK,
+                    ObservationFeature.FLOWS,
+                    ObservationFeature.DELAY_BUDGET)
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = NetworkEnv(configuration=configuration,
+                             n_actions=n_actions,
+                             features=features)
+        self.assertEqual(net_env.features, features)
+        self.assertEqual(net_env.observation_space.shape,
+                         (n_actions * len(features),))
+        self.assertEqual(NetworkEnv.DEFAULT_FEATURES,
+                         (ObservationFeature.ROUTED,
+                          ObservationFeature.DELAY,
+                          ObservationFeature.THROUGHPUT))
+        obs, _ = net_env.reset(seed=0)
+        for _ in range(20):
+            self.assertEqual(obs.shape, (n_actions, len(features)))
+            self.assertTrue(net_env.observation_space.contains(
+                obs.flatten()))
+            # The best candidate gets closer to the Gateway
+            self.assertLess(obs[0][0], len(net_env.network.nodes))
+            obs, _, terminated, _, _ = net_env.step(0)
+            if (terminated):
+                obs, _ = net_env.reset()
+        with self.assertRaises(ValueError):
+            NetworkEnv(configuration=configuration, features=())
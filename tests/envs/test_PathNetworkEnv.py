@@ -0,0 +1,122 @@
+import unittest
+from network_envs.envs.PathNetworkEnv import PathNetworkEnv
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.enums.NetworkNodeType import NetworkNodeType
+from gymnasium.spaces import Space
+from pathlib import Path
+
+
+class test_PathNetworkEnv(unittest.TestCase):
+
+
+    def test_initialization(self):
+        """Test that the PathNetworkEnv is initialized as expected when
+        network_00.json is the environment used.
+        """
+        n_actions = 5
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = PathNetworkEnv(configuration=configuration,
+                                 n_actions=n_actions,
+                                 render_mode=None)
+        obs_space: Space = net_env.get_wrapper_attr("observation_space")
+        action_space: Space = net_env.get_wrapper_attr("action_space")
+        self.assertEqual(obs_space.shape[0], n_actions * 3)
+        self.assertEqual(action_space.n, n_actions)
+        self.assertEqual(len(net_env.candidates), 0)
+
+    def test_reset(self):
+        """Test that the candidate paths lead the selected NetworkDevice
+        to the gateway, are sorted by delay and that the observation
+        matches their features.
+        """
+        n_actions = 5
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = PathNetworkEnv(configuration=configuration,
+                                 n_actions=n_actions,
+                                 render_mode=None)
+        obs, _ = net_env.reset(seed=0)
+        device: NetworkDevice = net_env.get_wrapper_attr("_dev")
+        candidates = net_env.candidates
+        self.assertGreater(len(candidates), 0)
+        self.assertEqual(obs.shape, (n_actions, 3))
+        for i, path in enumerate(candidates):
+            self.assertEqual(path[0][0], device)
+            self.assertEqual(path[-1][1].node_type, NetworkNodeType.GW)
+            links: list[NetworkLink] = [l["data"] for (_, _, l) in path]
+            self.assertAlmostEqual(obs[i][0],
+                                   sum(l.delay for l in links),
+                                   places=4)
+            self.assertAlmostEqual(
+                obs[i][1],
+                min(l.available_throughput for l in links),
+                places=4)
+            self.assertEqual(obs[i][2], 0.0)
+        for i in range(len(candidates) - 1):
+            self.assertLessEqual(obs[i][0], obs[i + 1][0])
+
+    def test_step(self):
+        """Test that an episode lasts one step and that the chosen path
+        is allocated for the NetworkDevice.
+        """
+        n_actions = 5
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = PathNetworkEnv(configuration=configuration,
+                                 n_actions=n_actions,
+                                 render_mode=None)
+        net_env.reset(seed=0)
+        device: NetworkDevice = net_env.get_wrapper_attr("_dev")
+        chosen = net_env.candidates[1]
+        _, reward, terminated, _, _ = net_env.step(1)
+        self.assertTrue(terminated)
+        self.assertGreater(reward, 0)
+        for (_, _, l) in chosen:
+            self.assertTrue(device in l["data"].routed_flows)
+
+    def test_step_padded_action(self):
+        """Test that choosing a padded candidate is penalized and that
+        nothing is allocated.
+        """
+        n_actions = 5
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = PathNetworkEnv(configuration=configuration,
+                                 n_actions=n_actions,
+                                 render_mode=None)
+        net_env.reset(seed=0)
+        net_env._candidates = net_env.candidates[:1]
+        _, reward, terminated, _, _ = net_env.step(n_actions - 1)
+        self.assertTrue(terminated)
+        self.assertEqual(reward, -1)
+        for l in net_env.network.network_links:
+            self.assertEqual(len(l.routed_flows), 0)
+
+    def test_keep_path_until_step(self):
+        """Test that the current path of the device is kept while the
+        agent chooses, is not counted as changes and is only replaced
+        by a valid action.
+        """
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        net_env = PathNetworkEnv(configuration=configuration, n_actions=5)
+        net_env.reset(seed=0)
+        device: NetworkDevice = net_env.get_wrapper_attr("_dev")
+        net_env._generate_event = lambda: device
+        net_env.step(0)
+        path = net_env.network.get_path_device(device)
+        self.assertGreater(len(path), 0)
+        obs, _ = net_env.reset()
+        self.assertEqual(net_env.network.get_path_device(device), path)
+        self.assertIn(set(path),
+                      [{l["data"] for (_, _, l) in c}
+                       for c in net_env.candidates])
+        self.assertTrue(all(obs[i][2] == 0.0
+                            for i in range(len(net_env.candidates))))
+        self.assertEqual(obs[0][1], 1000.0)
+        net_env._candidates = net_env.candidates[:1]
+        _, reward, _, _, _ = net_env.step(4)
+        self.assertEqual(reward, -1)
+        self.assertEqual(net_env.network.get_path_device(device), path)
+        net_env.reset()
+        _, reward, _, _, _ = net_env.step(0)
+        self.assertGreater(reward, 0)
+        self.assertEqual(len(net_env.network.get_path_device(device)),
+                         len(path))
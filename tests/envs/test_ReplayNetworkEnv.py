@@ -0,0 +1,135 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+import gymnasium as gym
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.envs.ReplayNetworkEnv import ReplayNetworkEnv
+from network_envs.utils.TrajectoryDataset import TrajectoryDataset
+from network_envs.wrappers.TrajectoryRecorder import TrajectoryRecorder
+
+
+class test_ReplayNetworkEnv(unittest.TestCase):
+
+
+    def setUp(self):
+        self.configuration: Path = Path.cwd().joinpath("input",
+                                                       "network_00.json")
+        self.directory = tempfile.TemporaryDirectory()
+        self.dataset: Path = Path(self.directory.name)
+        env = TrajectoryRecorder(
+            NetworkEnv(configuration=self.configuration, n_actions=5),
+            self.dataset,
+            chunk_size=16,
+            snapshot_interval=7)
+        # Keep, per recorded step, the state of the live Network and
+        # what the env returned
+        self.recorded: list[dict] = []
+        obs, _ = env.reset(seed=3)
+        network = env.unwrapped.network
+        # A throughput that float32 cannot represent exactly
+        network.set_background_load(network.network_links[-1], 0.1)
+        while (len(self.recorded) < 60):
+            available = [l.available_throughput for l in network.network_links]
+            aps = [network.attached_ap(u).name for u in network.uavs]
+            device = env.unwrapped.device.name
+            action = len(self.recorded) % 3
+            next_obs, reward, terminated, truncated, _ = env.step(action)
+            self.recorded.append({"obs": np.reshape(obs, -1),
+                                  "action": action,
+                                  "next_obs": np.reshape(next_obs, -1),
+                                  "reward": reward,
+                                  "terminated": terminated,
+                                  "available": available,
+                                  "aps": aps,
+                                  "device": device})
+            obs = next_obs
+            if (terminated or truncated):
+                obs, _ = env.reset()
+        env.close()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_dataset(self):
+        """Test that the chunks are consolidated into memory-mapped
+        columns once and that the episodes are found.
+        """
+        dataset = TrajectoryDataset(self.dataset)
+        self.assertEqual(dataset.n_steps, 60)
+        self.assertIsInstance(dataset["reward"], np.memmap)
+        self.assertTrue(self.dataset.joinpath("columns",
+                                              "reward.npy").exists())
+        n_terminated = sum(r["terminated"] for r in self.recorded)
+        self.assertIn(dataset.n_episodes, (n_terminated, n_terminated + 1))
+        steps = [len(dataset.episode(i)) for i in range(dataset.n_episodes)]
+        self.assertEqual(sum(steps), 60)
+        # A second opening reuses the consolidated columns
+        np.testing.assert_array_equal(TrajectoryDataset(self.dataset)["step"],
+                                      dataset["step"])
+
+    def test_replay(self):
+        """Test that the replay serves the recorded transitions and
+        reconstructs the recorded state of the Network.
+        """
+        env = ReplayNetworkEnv(self.dataset, configuration=self.configuration)
+        network = env.network
+        row = 0
+        while (row < len(self.recorded)):
+            obs, _ = env.reset()
+            done = False
+            while (not done):
+                recorded = self.recorded[row]
+                np.testing.assert_allclose(obs, recorded["obs"])
+                self.assertEqual(env.device.name, recorded["device"])
+                self.assertEqual([l.available_throughput
+                                  for l in network.network_links],
+                                 recorded["available"])
+                self.assertEqual([network.attached_ap(u).name
+                                  for u in network.uavs],
+                                 recorded["aps"])
+                obs, reward, terminated, truncated, info = env.step(0)
+                self.assertAlmostEqual(reward, recorded["reward"], places=5)
+                self.assertEqual(info["logged_action"], recorded["action"])
+                self.assertEqual(info["action_matches"],
+                                 recorded["action"] == 0)
+                np.testing.assert_allclose(obs, recorded["next_obs"])
+                done = terminated or truncated
+                row += 1
+        with self.assertRaises(RuntimeError):
+            env.step(0)
+        self.assertIsNone(env.device)
+
+    def test_replay_out_of_order(self):
+        """Test that the recorded state of the Network is rebuilt from
+        the full snapshots when the episodes are replayed out of order.
+        """
+        env = ReplayNetworkEnv(self.dataset, configuration=self.configuration)
+        network = env.network
+        dataset = env.dataset
+        for episode in reversed(range(dataset.n_episodes)):
+            env.reset(options={"episode": episode})
+            for row in dataset.episode(episode):
+                recorded = self.recorded[row]
+                self.assertEqual([l.available_throughput
+                                  for l in network.network_links],
+                                 recorded["available"])
+                self.assertEqual([network.attached_ap(u).name
+                                  for u in network.uavs],
+                                 recorded["aps"])
+                env.step(0)
+
+    def test_make(self):
+        """Test that the replay can be created through gym.make and
+        that episodes can be chosen or drawn.
+        """
+        env = gym.make("network_envs/ReplayNetworkEnv-v0",
+                       dataset=self.dataset,
+                       shuffle=True)
+        self.assertEqual(env.action_space.n, 5)
+        _, info = env.reset(seed=0)
+        self.assertLess(info["episode"], env.unwrapped.dataset.n_episodes)
+        obs, info = env.reset(options={"episode": 0})
+        self.assertEqual(info["episode"], 0)
+        np.testing.assert_allclose(obs, self.recorded[0]["obs"])
+        self.assertIsNone(env.unwrapped.network)
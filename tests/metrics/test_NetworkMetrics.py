@@ -0,0 +1,123 @@
+import unittest
+from pathlib import Path
+from network_envs.entities.Network import Network
+from network_envs.enums.NetworkDeviceType import NetworkDeviceType
+from network_envs.delay.PiecewiseDelayModel import PiecewiseDelayModel
+from network_envs.metrics.NetworkMetrics import NetworkMetrics
+
+
+class test_NetworkMetrics(unittest.TestCase):
+
+
+    def setUp(self):
+        self.net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        self.gateway = self.net.gateways[0]
+        self.metrics = NetworkMetrics(self.net, n_bins=10)
+
+    def tearDown(self):
+        self.metrics.close()
+
+    def test_utilization_histogram(self):
+        """Test that the histogram counts every NetworkLink once and
+        follows the allocations and frees.
+        """
+        histogram = self.metrics.utilization_histogram
+        self.assertEqual(histogram.sum(), len(self.net.network_links))
+        self.assertEqual(histogram[:, 0].sum(), histogram.sum())
+        uav = self.net.uavs[0]
+        path = self.net.shortest_path_to_gw(uav, self.gateway)
+        self.assertTrue(self.net.assign_path_to_device(uav, path))
+        histogram = self.metrics.utilization_histogram
+        self.assertEqual(histogram.sum(), len(self.net.network_links))
+        # 100 of 1000 Gb/s in use moves the NetworkLinks to the 2nd bin
+        self.assertEqual(histogram[:, 1].sum(), len(path))
+        self.net.free_path_device(uav, path)
+        self.assertEqual(self.metrics.utilization_histogram[:, 0].sum(),
+                         len(self.net.network_links))
+        snapshot = self.metrics.snapshot()
+        self.assertEqual(snapshot["allocations"], 1)
+        self.assertEqual(snapshot["frees"], 1)
+        self.assertEqual(sum(snapshot["utilization_histogram"]["CORE"]),
+                         histogram[2].sum())
+
+    def test_reroutes_and_displacements(self):
+        """Test that a reroute is counted only when the NetworkLinks of
+        the NetworkDevice change and that sharing NetworkLinks with
+        other workflows is counted as displacement.
+        """
+        uav = self.net.uavs[0]
+        path = self.net.shortest_path_to_gw(uav, self.gateway)
+        self.net.assign_path_to_device(uav, path)
+        self.net.free_path_device(uav, path)
+        self.net.assign_path_to_device(uav, path)
+        self.assertEqual(self.metrics.reroutes, {})
+        self.assertEqual(self.metrics.displacements, 0)
+        self.net.free_path_device(uav, path)
+        ap = next(ap for ap in self.net.access_points
+                  if (ap != self.net.attached_ap(uav)))
+        self.net.handover_uav(uav, ap)
+        self.net.assign_path_to_device(
+            uav,
+            self.net.shortest_path_to_gw(uav, self.gateway))
+        self.assertEqual(self.metrics.reroutes, {uav: 1})
+        cam = self.net.cams[0]
+        cam_path = self.net.shortest_path_to_gw(cam, self.gateway)
+        self.net.assign_path_to_device(cam, cam_path)
+        shared = len(set(cam_path) & set(self.net.get_path_device(uav)))
+        self.assertEqual(self.metrics.displacements, shared)
+
+    def test_rejections_and_violations(self):
+        """Test that the allocations that do not fit are counted as
+        rejections per type and the ones that exceed the delay
+        requirement as violations.
+        """
+        uav = self.net.uavs[0]
+        path = self.net.shortest_path_to_gw(uav, self.gateway)
+        link = path[-1]
+        self.assertTrue(self.net.set_background_load(link,
+                                                     link.max_throughput))
+        self.assertFalse(self.net.assign_path_to_device(uav, path))
+        self.assertEqual(self.metrics.rejections[NetworkDeviceType.UAV], 1)
+        self.assertEqual(self.metrics.rejections[NetworkDeviceType.CAM], 0)
+        self.assertEqual(self.metrics.allocations, 0)
+        self.net.set_background_load(link, 0.0)
+        self.net.delay_model = PiecewiseDelayModel([0.0, 1.0], [30.0, 30.0])
+        self.assertTrue(self.net.assign_path_to_device(uav, path))
+        self.assertEqual(self.metrics.delay_violations, 1)
+
+    def test_to_text(self):
+        """Test that the text export follows the exposition format."""
+        uav = self.net.uavs[0]
+        path = self.net.shortest_path_to_gw(uav, self.gateway)
+        self.net.assign_path_to_device(uav, path)
+        text = self.metrics.to_text(prefix="uav")
+        self.assertTrue(text.endswith("\n"))
+        lines = text.splitlines()
+        self.assertIn("# TYPE uav_allocations_total counter", lines)
+        self.assertIn("uav_allocations_total 1", lines)
+        self.assertIn('uav_rejections_total{device_type="UAV"} 0', lines)
+        count_lines = [l for l in lines
+                       if (l.startswith("uav_link_utilization_count"))]
+        self.assertEqual(len(count_lines), 4)
+        self.assertEqual(sum(int(l.split()[-1]) for l in count_lines),
+                         len(self.net.network_links))
+        # 100 of 1000 Gb/s in use in every NetworkLink of the path
+        sum_lines = [l for l in lines
+                     if (l.startswith("uav_link_utilization_sum"))]
+        self.assertEqual(len(sum_lines), 4)
+        self.assertAlmostEqual(sum(float(l.split()[-1]) for l in sum_lines),
+                               0.1 * len(path))
+        for line in lines:
+            if (not line.startswith("#")):
+                float(line.split()[-1])
+
+    def test_close(self):
+        """Test that the aggregates are no longer updated once closed."""
+        self.metrics.close()
+        uav = self.net.uavs[0]
+        self.net.assign_path_to_device(
+            uav,
+            self.net.shortest_path_to_gw(uav, self.gateway))
+        self.assertEqual(self.metrics.allocations, 0)
+        self.assertEqual(self.metrics.utilization_histogram[:, 0].sum(),
+                         len(self.net.network_links))
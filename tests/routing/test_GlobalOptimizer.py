@@ -0,0 +1,126 @@
+import unittest
+from pathlib import Path
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.enums.ResetStrategy import ResetStrategy
+from network_envs.routing.GlobalOptimizer import GlobalOptimizer
+from network_envs.routing.Migration import Migration
+from network_envs.routing.MigrationPlan import MigrationPlan
+
+
+class test_GlobalOptimizer(unittest.TestCase):
+
+
+    def setUp(self):
+        self.net: Network = Network(
+            Path.cwd().joinpath("input", "network_00.json"))
+        self.nodes: dict[str, NetworkNode] = {
+            n.name: n for n in self.net.network_nodes}
+        self.devices: dict[str, NetworkDevice] = {
+            d.name: d for d in self.net.network_devices}
+
+    def _route(self, device_name: str, node_names: list[str]) -> None:
+        device = self.devices[device_name]
+        device.is_active = True
+        path = self.net.path_links(
+            [device] + [self.nodes[n] for n in node_names])
+        self.assertTrue(self.net.assign_path_to_device(device, path))
+
+    def test_empty(self):
+        """Test that there is nothing to do in an idle Network."""
+        plan = GlobalOptimizer().optimize(self.net)
+        self.assertEqual(plan.migrations, [])
+        self.assertFalse(plan.is_improvement)
+
+    def test_keeps_good_allocation(self):
+        """Test that the workflows routed through the shortest paths of
+        an unloaded Network are not moved.
+        """
+        for name in ("cam_00", "cam_02", "cam_04"):
+            device = self.devices[name]
+            device.is_active = True
+            self.net.assign_path_to_device(
+                device,
+                self.net.shortest_path_to_gw(device, self.net.gateways[0]))
+        plan = GlobalOptimizer().optimize(self.net)
+        self.assertEqual(plan.migrations, [])
+
+    def test_defragmentation(self):
+        """Test that the workflows squeezed through a loaded NetworkLink
+        are spread and that the plan can be applied.
+        """
+        self.net.set_background_load(
+            self.net[self.nodes["switch_01"]][self.nodes["switch_04"]]["data"],
+            500.0)
+        for name in ("cam_00", "cam_01", "uav_00", "uav_01"):
+            self._route(name, ["ap_" + name[-2:], "switch_01", "switch_04",
+                               "gateway"])
+        plan = GlobalOptimizer().optimize(self.net)
+        self.assertTrue(plan.is_improvement)
+        self.assertLess(plan.delay_after, plan.delay_before)
+        self.assertLess(plan.max_utilization_after,
+                        plan.max_utilization_before)
+        self.assertEqual(plan.unrouted, [])
+        self.assertLess(len(plan.migrations), 4)
+        self.assertTrue(plan.apply(self.net))
+        for m in plan.migrations:
+            self.assertEqual(set(self.net.get_path_device(m.device)),
+                             set(m.new_path))
+        for name in ("cam_00", "cam_01", "uav_00", "uav_01"):
+            self.assertGreater(
+                len(self.net.get_path_device(self.devices[name])), 0)
+        self.assertFalse(GlobalOptimizer().optimize(self.net).is_improvement)
+
+    def test_defrag_reset(self):
+        """Test that the defragmentation reset keeps the workflows routed
+        instead of releasing them.
+        """
+        for strategy in ResetStrategy:
+            env = NetworkEnv(Path.cwd().joinpath("input", "network_00.json"),
+                             hard_reset_period=5,
+                             reset_strategy=strategy)
+            env.reset(seed=1)
+            # The fifth reset triggers the periodic reset
+            for _ in range(4):
+                terminated = False
+                steps = 0
+                while (not terminated and steps < 10):
+                    _, _, terminated, _, _ = env.step(0)
+                    steps += 1
+                env.reset()
+            routed = [l for l in env.network.network_links
+                      if len(l.routed_flows) > 0]
+            if (strategy == ResetStrategy.HARD):
+                self.assertEqual(len(routed), 0)
+            else:
+                self.assertGreater(len(routed), 0)
+
+    def test_defrag_reset_fallback(self):
+        """Test that the defragmentation reset falls back to the hard
+        reset when the plan cannot be allocated.
+        """
+        env = NetworkEnv(Path.cwd().joinpath("input", "network_00.json"),
+                         hard_reset_period=1,
+                         reset_strategy=ResetStrategy.DEFRAG)
+        env.reset(seed=1)
+        net = env.network
+        uav = net.uavs[0]
+        full_path = net.shortest_path_to_gw(uav, net.gateways[0])
+        net.set_background_load(full_path[1], full_path[1].max_throughput)
+        cam = next(c for c in net.cams
+                   if (c != env.device
+                       and full_path[1] not in net.shortest_path_to_gw(
+                           c, net.gateways[0])))
+        cam.is_active = True
+        path = net.shortest_path_to_gw(cam, net.gateways[0])
+        self.assertTrue(net.assign_path_to_device(cam, path))
+        plan = MigrationPlan([Migration(cam, path, path),
+                              Migration(uav, [], full_path)],
+                             1.0, 0.0, 1.0, 0.0)
+        env._optimizer.optimize = lambda network: plan
+        env.reset()
+        self.assertEqual(net.get_path_device(cam), [])
+        self.assertFalse(any(len(l.routed_flows) > 0
+                             for l in net.network_links))
@@ -0,0 +1,76 @@
+import unittest
+from pathlib import Path
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.enums.NetworkEventType import NetworkEventType
+from network_envs.routing.LeastChangesPolicy import LeastChangesPolicy
+from network_envs.routing.MinDelayPolicy import MinDelayPolicy
+from network_envs.routing.MinHopPolicy import MinHopPolicy
+from network_envs.routing.PolicyEvaluator import generate_events
+from network_envs.routing.PolicyEvaluator import evaluate_policy
+
+
+class test_PolicyEvaluator(unittest.TestCase):
+
+
+    def setUp(self):
+        self.config: Path = Path.cwd().joinpath("input", "network_00.json")
+
+    def test_generate_events(self):
+        """Test that the generated events are reproducible and do not
+        modify the Network.
+        """
+        net = Network(self.config)
+        events = generate_events(net, 50, seed=3)
+        self.assertEqual(events, generate_events(net, 50, seed=3))
+        self.assertEqual(len(events), 50)
+        self.assertEqual(len(net.active_cams), 0)
+
+    def test_evaluate_policy(self):
+        """Test that two policies evaluated on the same events receive
+        the same routing requests.
+        """
+        events = generate_events(Network(self.config), 100, seed=7)
+        delay = evaluate_policy(Network(self.config), MinDelayPolicy(),
+                                events)
+        hops = evaluate_policy(Network(self.config), MinHopPolicy(),
+                               events)
+        self.assertEqual(delay["requests"], hops["requests"])
+        self.assertEqual(delay["admitted"] + delay["rejected"],
+                         delay["requests"])
+        self.assertGreater(delay["admitted"], 0)
+        self.assertEqual(delay["delay_violations"], 0)
+
+    def test_keep_current_path(self):
+        """Test that the policies see the current path of the
+        NetworkDevice, so LeastChangesPolicy keeps a path that
+        MinDelayPolicy abandons even if other workflows share it.
+        """
+        for policy, kept in ((LeastChangesPolicy(), True),
+                             (MinDelayPolicy(), False)):
+            net = Network(self.config)
+            devices = {d.name: d for d in net.network_devices}
+            nodes = {n.name: n for n in net.network_nodes}
+            routes = {"uav_00": ["ap_00", "switch_01", "switch_02",
+                                 "switch_05", "gateway"],
+                      "cam_01": ["ap_01", "switch_01", "switch_04",
+                                 "gateway"],
+                      "cam_02": ["ap_02", "switch_02", "switch_05",
+                                 "gateway"]}
+            for name, node_names in routes.items():
+                device = devices[name]
+                device.is_active = True
+                self.assertTrue(net.assign_path_to_device(
+                    device,
+                    net.path_links([device]
+                                   + [nodes[n] for n in node_names])))
+            uav = devices["uav_00"]
+            path = set(net.get_path_device(uav))
+            handover = NetworkEvent(0.0,
+                                    NetworkEventType.UAV_HANDOVER,
+                                    uav.id,
+                                    ap_id=nodes["ap_00"].id)
+            result = evaluate_policy(net, policy, [handover])
+            self.assertEqual(result["admitted"], 1)
+            self.assertEqual(set(net.get_path_device(uav)) == path, kept)
+            self.assertEqual(result["mean_changes"] == 0, kept)
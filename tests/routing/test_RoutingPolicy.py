@@ -0,0 +1,205 @@
+import unittest
+from pathlib import Path
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.enums.NetworkLinkTier import NetworkLinkTier
+from network_envs.routing.MinDelayPolicy import MinDelayPolicy
+from network_envs.routing.MinHopPolicy import MinHopPolicy
+from network_envs.routing.WidestPathPolicy import WidestPathPolicy
+from network_envs.routing.LeastChangesPolicy import LeastChangesPolicy
+from network_envs.routing.AgentPolicy import AgentPolicy
+from network_envs.routing.DelayConstrainedPolicy import DelayConstrainedPolicy
+from network_envs.routing.AdmissionController import AdmissionController
+
+
+class test_RoutingPolicy(unittest.TestCase):
+
+
+    def setUp(self):
+        self.net: Network = Network(
+            Path.cwd().joinpath("input", "network_00.json"))
+        self.uav0: NetworkDevice = [u for u in self.net.uavs
+                                    if u.name == "uav_00"][0]
+        self.nodes: dict[str, NetworkNode] = {
+            n.name: n for n in self.net.network_nodes}
+
+    def _link(self, u: str, v: str) -> NetworkLink:
+        return self.net[self.nodes[u]][self.nodes[v]]["data"]
+
+    def _assert_valid(self, path: list[NetworkLink]):
+        """Checks that the path goes from uav_00 to the gateway in the
+        format of Network.shortest_path_to_gw.
+        """
+        self.assertEqual(path[0], self.net[self.uav0][self.nodes["ap_00"]]["data"])
+        last_hop = [self._link("switch_04", "gateway"),
+                    self._link("switch_05", "gateway")]
+        self.assertTrue(path[-2] in last_hop)
+
+    def test_min_delay(self):
+        """Test that MinDelayPolicy matches Network.shortest_path_to_gw.
+        """
+        self._link("switch_01", "switch_04").available_throughput = 500.0
+        expected = self.net.shortest_path_to_gw(self.uav0,
+                                                self.net.gateways[0])
+        path = MinDelayPolicy().route(self.net, self.uav0)
+        self.assertEqual(path, expected)
+
+    def test_min_delay_widest_tie_break(self):
+        """Test that MinDelayPolicy can break ties with the bottleneck.
+        """
+        expected = self.net.min_delay_widest_path_to_gw(self.uav0,
+                                                        self.net.gateways[0])
+        path = MinDelayPolicy(widest_tie_break=True).route(self.net,
+                                                           self.uav0)
+        self.assertEqual(path, expected)
+
+    def test_min_hop(self):
+        """Test that MinHopPolicy returns a path with the least number
+        of hops, also when the throughput forces a detour.
+        """
+        path = MinHopPolicy().route(self.net, self.uav0)
+        self.assertEqual(len(path), 8)
+        self._link("switch_01", "switch_04").available_throughput = 0.0
+        path = MinHopPolicy()(self.net, self.uav0)
+        self._assert_valid(path)
+        self.assertEqual(len(path), 10)
+        self.assertFalse(self._link("switch_01", "switch_04") in path)
+
+    def test_widest_path(self):
+        """Test that WidestPathPolicy avoids the loaded NetworkLinks."""
+        self._link("switch_01", "switch_04").available_throughput = 200.0
+        self._link("switch_04", "gateway").available_throughput = 300.0
+        path = WidestPathPolicy().route(self.net, self.uav0)
+        self._assert_valid(path)
+        self.assertFalse(self._link("switch_01", "switch_04") in path)
+        self.assertFalse(self._link("switch_04", "gateway") in path)
+        self.assertEqual(min(l.available_throughput for l in path[::2]),
+                         1000.0)
+
+    def test_least_changes(self):
+        """Test that LeastChangesPolicy avoids the NetworkLinks used by
+        other NetworkDevices.
+        """
+        cam0: NetworkDevice = [c for c in self.net.cams
+                               if c.name == "cam_00"][0]
+        self.net.assign_path_to_device(
+            cam0,
+            self.net.shortest_path_to_gw(cam0, self.net.gateways[0]))
+        path = LeastChangesPolicy().route(self.net, self.uav0)
+        self._assert_valid(path)
+        changes = [l for l in path[2:] if len(l.routed_flows) > 0]
+        self.assertEqual(len(changes), 2)
+
+    def test_delay_constrained(self):
+        """Test that DelayConstrainedPolicy rejects the requests that
+        cannot meet their delay requirement.
+        """
+        path = DelayConstrainedPolicy().route(self.net, self.uav0)
+        self._assert_valid(path)
+        for (u, v) in (("switch_04", "gateway"), ("switch_05", "gateway")):
+            self._link(u, v).available_throughput = 100.0
+        self._link("switch_01", "switch_04").available_throughput = 100.0
+        self._link("switch_01", "switch_02").available_throughput = 100.0
+        self.assertEqual(DelayConstrainedPolicy().route(self.net, self.uav0),
+                         None)
+        self.assertNotEqual(MinDelayPolicy().route(self.net, self.uav0),
+                            None)
+
+    def test_admission_controller(self):
+        """Test that AdmissionController rejects the requests without
+        capacity before routing them and reports the headroom.
+        """
+        calls = []
+
+        def policy(network, device):
+            calls.append(device)
+            return MinDelayPolicy().route(network, device)
+
+        controller = AdmissionController(policy)
+        self._assert_valid(controller.route(self.net, self.uav0))
+        self.net.set_background_load(self._link("switch_01", "switch_04"),
+                                     950.0)
+        self.net.set_background_load(self._link("switch_01", "switch_02"),
+                                     950.0)
+        self.assertEqual(controller(self.net, self.uav0), None)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(controller.early_rejections, 1)
+        self.assertEqual(controller.routing_rejections, 0)
+        aps = controller.admissible_aps(self.net, self.uav0)
+        self.assertEqual([ap.name for ap in aps],
+                         ["ap_02", "ap_03", "ap_04", "ap_05"])
+        headroom = controller.headroom(self.net, k=2)
+        self.assertCountEqual(headroom["most_loaded_links"],
+                              [("switch_01 | switch_02", 0.95),
+                               ("switch_01 | switch_04", 0.95)])
+        self.assertEqual(headroom["ap_capacity"]["ap_00"], 50.0)
+        core = [l for l in self.net.network_links
+                if self.net.link_tier(l) == NetworkLinkTier.CORE]
+        self.assertAlmostEqual(headroom["tier_utilization"]["CORE"],
+                               1900.0 / sum(l.max_throughput for l in core))
+
+    def test_infeasible(self):
+        """Test that policies return None when there is no path."""
+        self._link("switch_01", "switch_04").available_throughput = 0.0
+        self._link("switch_01", "switch_02").available_throughput = 0.0
+        for policy in (MinDelayPolicy(), MinHopPolicy(),
+                       WidestPathPolicy(), LeastChangesPolicy(),
+                       DelayConstrainedPolicy()):
+            self.assertEqual(policy.route(self.net, self.uav0), None)
+
+    def test_agent(self):
+        """Test that AgentPolicy builds the path hop by hop with the
+        actions of the agent.
+        """
+        env = NetworkEnv(Path.cwd().joinpath("input", "network_00.json"),
+                         n_actions=3)
+        uav0 = [u for u in env.network.uavs if u.name == "uav_00"][0]
+        path = AgentPolicy(env, lambda obs: 0).route(env.network, uav0)
+        self.assertEqual(path[0], env.network[uav0][env.network.attached_ap(
+            uav0)]["data"])
+        # Same format as the other policies: every NetworkLink followed by
+        # its reverse
+        reference = MinDelayPolicy().route(env.network, uav0)
+        self.assertEqual(len(path), 2 * len(env.path))
+        self.assertIs(path[1], reference[1])
+        for (u, v, l), forward, backward in zip(env.path,
+                                                path[::2],
+                                                path[1::2]):
+            self.assertIs(forward, l["data"])
+            self.assertIs(backward, env.network[v][u]["data"])
+        with self.assertRaises(ValueError):
+            AgentPolicy(env, lambda obs: 0).route(self.net, self.uav0)
+        self.assertEqual(env.path[0][0], uav0)
+
+    def test_agent_unroutable(self):
+        """Test that AgentPolicy gives up on invalid and padded actions
+        and on paths that go back to a visited NetworkNode.
+        """
+        env = NetworkEnv(Path.cwd().joinpath("input", "network_00.json"),
+                         n_actions=8)
+        uav0 = [u for u in env.network.uavs if u.name == "uav_00"][0]
+        self.assertEqual(
+            AgentPolicy(env, lambda obs: 8).route(env.network, uav0), None)
+        self.assertEqual(
+            AgentPolicy(env, lambda obs: 7).route(env.network, uav0), None)
+
+        def back(obs):
+            # Move sideways and then back to a visited NetworkNode
+            net = env.network
+            visited = {u for (u, _, _) in env.path}
+            current = env.path[-1][1]
+            sideways = [i for i, (_, v, _) in enumerate(env.next_links)
+                        if (isinstance(v, NetworkNode)
+                            and net.hops_to_gw(v) == net.hops_to_gw(current))]
+            return next((i for i, (_, v, _) in enumerate(env.next_links)
+                         if (v in visited)),
+                        sideways[0] if (len(sideways) > 0) else 0)
+
+        self.assertEqual(
+            AgentPolicy(env, back).route(env.network, uav0), None)
+        # The agent went sideways before trying to go back
+        self.assertEqual([v.name for (_, v, _) in env.path],
+                         ["ap_00", "switch_01", "switch_02"])
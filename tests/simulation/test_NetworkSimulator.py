@@ -0,0 +1,152 @@
+import unittest
+import numpy as np
+from pathlib import Path
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.enums.NetworkEventType import NetworkEventType
+from network_envs.simulation.NetworkSimulator import NetworkSimulator
+
+
+class test_NetworkSimulator(unittest.TestCase):
+
+
+    def test_run(self):
+        """Test that the simulation advances the time, keeps the metrics
+        aligned and that the resources allocated match the active
+        NetworkDevices.
+        """
+        net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net.rng = np.random.default_rng(0)
+        simulator = NetworkSimulator(net,
+                                     uav_event_rate=2.0,
+                                     cam_event_rate=1.0,
+                                     cam_mean_duration=5.0,
+                                     link_load_rate=0.5)
+        simulator.run(until=100.0)
+        self.assertEqual(simulator.now, 100.0)
+        metrics = simulator.metrics
+        self.assertEqual(len(metrics["time"]), 101)
+        for values in metrics.values():
+            self.assertEqual(len(values), len(metrics["time"]))
+        self.assertTrue(np.all(np.diff(metrics["time"]) > 0))
+        self.assertGreater(metrics["admitted"][-1], 0)
+        self.assertTrue(np.all(metrics["max_utilization"] <= 1.0))
+        for cam in net.cams:
+            routed = len(net.get_path_device(cam)) > 0
+            if (routed):
+                self.assertTrue(cam.is_active)
+
+    def test_multipath(self):
+        """Test that splitting the workflows that do not fit in a single
+        path reduces the rejections under heavy background load.
+        """
+        rejected = []
+        for max_paths in (1, 3):
+            net = Network(Path.cwd().joinpath("input", "network_00.json"))
+            net.rng = np.random.default_rng(0)
+            simulator = NetworkSimulator(net,
+                                         cam_event_rate=2.0,
+                                         cam_mean_duration=50.0,
+                                         link_load_rate=2.0,
+                                         max_link_load=0.95,
+                                         max_paths=max_paths)
+            simulator.run(until=200.0)
+            rejected.append(simulator.metrics["rejected"][-1])
+            for l in net.network_links:
+                self.assertGreaterEqual(l.available_throughput, 0.0)
+        self.assertLess(rejected[1], rejected[0])
+
+    def test_reproducible(self):
+        """Test that two simulations with the same seed are identical."""
+        results = []
+        for _ in range(2):
+            net = Network(Path.cwd().joinpath("input", "network_00.json"))
+            net.rng = np.random.default_rng(3)
+            simulator = NetworkSimulator(net, link_load_rate=1.0)
+            simulator.run(until=50.0)
+            results.append(simulator.metrics)
+        for name in results[0]:
+            np.testing.assert_array_equal(results[0][name], results[1][name])
+
+    def test_recorded_events(self):
+        """Test that recorded events are applied at their timestamps and
+        that the NetworkDevices are routed with the given policy.
+        """
+        net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        routed = []
+
+        def policy(network, device):
+            routed.append((simulator.now, device.id))
+            return network.shortest_path_to_gw(device, network.gateways[0])
+
+        simulator = NetworkSimulator(net,
+                                     routing_policy=policy,
+                                     uav_event_rate=0.0,
+                                     cam_event_rate=0.0)
+        link_id = net.network_links[0].id
+        simulator.load_events([
+            NetworkEvent(1.0, NetworkEventType.CAM_START, 206),
+            NetworkEvent(2.5, NetworkEventType.UAV_HANDOVER, 200, ap_id=9),
+            NetworkEvent(3.0, NetworkEventType.LINK_LOAD, None,
+                         link_id=link_id, load=250.0),
+            NetworkEvent(4.0, NetworkEventType.CAM_STOP, 206)])
+        simulator.run(until=10.0)
+        self.assertEqual(routed, [(1.0, 206), (2.5, 200)])
+        cam = [c for c in net.cams if c.id == 206][0]
+        self.assertFalse(cam.is_active)
+        self.assertEqual(len(net.get_path_device(cam)), 0)
+        self.assertEqual(net.network_links[0].available_throughput, 750.0)
+
+    def test_stale_cam_stop(self):
+        """Test that the stop scheduled for a streaming does not end a
+        later streaming of the same camera.
+        """
+        net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        net.rng = np.random.default_rng(0)
+        simulator = NetworkSimulator(net,
+                                     uav_event_rate=0.0,
+                                     cam_event_rate=0.0,
+                                     cam_mean_duration=5.0)
+        simulator._generate_cam_event(None)
+        cam = net.active_cams[0]
+        self.assertEqual(net.cam_session(cam), 1)
+        net.stop_cam(cam)
+        net.start_cam(cam)
+        self.assertEqual(net.cam_session(cam), 2)
+        simulator.run(until=1000.0)
+        self.assertTrue(cam in net.active_cams)
+        simulator._generate_cam_event(None)
+        other = next(c for c in net.active_cams if (c != cam))
+        simulator.run(until=2000.0)
+        self.assertFalse(other in net.active_cams)
+
+    def test_reroute_keeps_path(self):
+        """Test that the policy is asked while the current path is
+        still allocated and that the path is kept when the NetworkDevice
+        cannot be routed again.
+        """
+        net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        uav = net.uavs[0]
+        uav.is_active = True
+        path = net.shortest_path_to_gw(uav, net.gateways[0])
+        self.assertTrue(net.assign_path_to_device(uav, path))
+        seen = []
+
+        def policy(network, device):
+            seen.append(set(network.get_path_device(device)))
+            return None
+
+        simulator = NetworkSimulator(net,
+                                     routing_policy=policy,
+                                     uav_event_rate=0.0,
+                                     cam_event_rate=0.0)
+        simulator.load_events([
+            NetworkEvent(1.0, NetworkEventType.UAV_HANDOVER, uav.id,
+                         ap_id=net.attached_ap(uav).id)])
+        simulator.run(until=2.0)
+        self.assertEqual(seen, [set(path)])
+        self.assertEqual(simulator.metrics["rejected"][-1], 1)
+        self.assertEqual(set(net.get_path_device(uav)), set(path))
+        for l in path:
+            self.assertEqual(l.available_throughput,
+                             l.max_throughput - uav.throughput_req)
@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+from network_envs.utils.BatchedRandom import BatchedRandom
+
+
+class test_BatchedRandom(unittest.TestCase):
+
+
+    def test_reproducible(self):
+        """Test that the same seed leads to the same sequence across
+        batch boundaries.
+        """
+        a = BatchedRandom(np.random.default_rng(3), batch_size=7)
+        b = BatchedRandom(np.random.default_rng(3), batch_size=7)
+        for _ in range(50):
+            self.assertEqual(a.random(), b.random())
+            self.assertEqual(a.integers(5), b.integers(5))
+
+    def test_ranges(self):
+        """Test that the drawn values are within the requested ranges.
+        """
+        r = BatchedRandom(np.random.default_rng(0), batch_size=16)
+        for _ in range(200):
+            self.assertTrue(0 <= r.integers(3) < 3)
+            self.assertTrue(2.0 <= r.uniform(2.0, 4.0) < 4.0)
+        self.assertEqual(r.integers(1), 0)
+
+    def test_empty_range(self):
+        """Test that drawing from an empty range fails."""
+        r = BatchedRandom(np.random.default_rng(0))
+        with self.assertRaises(ValueError):
+            r.integers(0)
+        with self.assertRaises(ValueError):
+            r.integers(-1)
+
+    def test_seed(self):
+        """Test that reseeding keeps the generator, so it stays shared,
+        and restarts the sequence.
+        """
+        generator = np.random.default_rng(1)
+        r = BatchedRandom(generator, batch_size=8)
+        r.random()
+        r.seed(5)
+        self.assertIs(r.generator, generator)
+        expected = BatchedRandom(np.random.default_rng(5), batch_size=8)
+        for _ in range(20):
+            self.assertEqual(r.random(), expected.random())
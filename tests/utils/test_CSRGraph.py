@@ -0,0 +1,62 @@
+import math
+import unittest
+import networkx as nx
+import numpy as np
+from network_envs.utils.CSRGraph import CSRGraph
+
+
+class test_CSRGraph(unittest.TestCase):
+
+
+    def setUp(self):
+        # 0 -> 1 -> 3, 0 -> 2 -> 3, 3 -> 4 and the isolated node 5
+        self.sources = [0, 2, 0, 1, 3]
+        self.targets = [1, 3, 2, 3, 4]
+        self.graph = CSRGraph(6, self.sources, self.targets)
+
+    def test_adjacency(self):
+        """Test that the edges are grouped by source keeping their ids
+        and their order.
+        """
+        self.assertEqual(self.graph.n_nodes, 6)
+        self.assertEqual(self.graph.n_edges, 5)
+        self.assertEqual(self.graph.offsets.tolist(), [0, 2, 3, 4, 5, 5, 5])
+        self.assertEqual(self.graph.out_edges(0), [(1, 0), (2, 2)])
+        self.assertEqual(self.graph.out_edges(2), [(3, 1)])
+        self.assertEqual(self.graph.out_edges(5), [])
+        self.assertEqual(self.graph.in_edges(3), [(2, 1), (1, 3)])
+        for u in range(6):
+            for v, edge in self.graph.out_edges(u):
+                self.assertEqual((self.sources[edge], self.targets[edge]),
+                                 (u, v))
+
+    def test_bfs_distances(self):
+        """Test the hop distances in both directions."""
+        self.assertEqual(self.graph.bfs_distances([0]).tolist(),
+                         [0, 1, 1, 2, 3, math.inf])
+        self.assertEqual(self.graph.bfs_distances([4], reverse=True).tolist(),
+                         [3, 2, 2, 1, 0, math.inf])
+
+    def test_dijkstra(self):
+        """Test that the search matches NetworkX, honours the unusable
+        edges and reports unreachable targets.
+        """
+        rng = np.random.default_rng(0)
+        weights = rng.random(5).tolist()
+        reference = nx.DiGraph()
+        for edge, (u, v) in enumerate(zip(self.sources, self.targets)):
+            reference.add_edge(u, v, weight=weights[edge])
+        self.assertEqual(self.graph.dijkstra(0, 4, weights),
+                         nx.dijkstra_path(reference, 0, 4))
+        self.assertEqual(self.graph.dijkstra(0, 4,
+                                             [1.0, 1.0, 1.0, 5.0, 1.0]),
+                         [0, 2, 3, 4])
+        self.assertEqual(self.graph.dijkstra(0, 4,
+                                             [1.0] * 5,
+                                             [True, False, True, True, True]),
+                         [0, 1, 3, 4])
+        self.assertEqual(self.graph.dijkstra(0, 0, weights), [0])
+        self.assertIsNone(self.graph.dijkstra(0, 5, weights))
+        self.assertIsNone(self.graph.dijkstra(0, 4,
+                                              [1.0] * 5,
+                                              [True] * 4 + [False]))
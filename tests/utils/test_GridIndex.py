@@ -0,0 +1,59 @@
+import unittest
+import math
+import random
+from network_envs.utils.GridIndex import GridIndex
+
+
+class test_GridIndex(unittest.TestCase):
+
+
+    def test_nearest(self):
+        """Test that the nearest item matches the one found by scanning
+        all the items, also for positions outside the indexed area.
+        """
+        rng = random.Random(0)
+        positions = [(rng.uniform(0, 100), rng.uniform(0, 50))
+                     for _ in range(500)]
+        items = list(range(len(positions)))
+        grid = GridIndex(items, positions)
+        for _ in range(200):
+            query = (rng.uniform(-20, 120), rng.uniform(-20, 70))
+            expected = min(items, key=lambda i: math.dist(positions[i],
+                                                          query))
+            self.assertEqual(grid.nearest(query), expected)
+
+    def test_nearest_far(self):
+        """Test that a position far outside the indexed area finds the
+        nearest item without walking the empty rings around it.
+        """
+        rng = random.Random(1)
+        positions = [(rng.uniform(0, 100), rng.uniform(0, 50))
+                     for _ in range(500)]
+        items = list(range(len(positions)))
+        grid = GridIndex(items, positions)
+        visited = 0
+        ring_cells = grid._ring_cells
+
+        def counting_ring_cells(cx, cy, ring):
+            nonlocal visited
+            for cell in ring_cells(cx, cy, ring):
+                visited += 1
+                yield cell
+        grid._ring_cells = counting_ring_cells
+        for query in [(1e6, 1e6), (-1e6, 25), (50, -1e6)]:
+            visited = 0
+            expected = min(items, key=lambda i: math.dist(positions[i],
+                                                          query))
+            self.assertEqual(grid.nearest(query), expected)
+            self.assertLess(visited, 10 * len(positions))
+
+    def test_nearest_tie(self):
+        """Test that ties are broken in favour of the first item."""
+        grid = GridIndex(["a", "b", "c"], [(0, 0), (2, 0), (10, 10)])
+        self.assertEqual(grid.nearest((1, 0)), "a")
+        self.assertEqual(grid.nearest((9, 9)), "c")
+
+    def test_empty(self):
+        """Test that an empty list of items cannot be indexed."""
+        with self.assertRaises(ValueError):
+            GridIndex([], [])
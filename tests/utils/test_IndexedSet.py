@@ -0,0 +1,35 @@
+import unittest
+import numpy as np
+from network_envs.utils.IndexedSet import IndexedSet
+from network_envs.utils.BatchedRandom import BatchedRandom
+
+
+class test_IndexedSet(unittest.TestCase):
+
+
+    def test_add_remove(self):
+        """Test that adding and removing items keeps the set consistent.
+        """
+        s = IndexedSet(range(5))
+        self.assertEqual(len(s), 5)
+        self.assertFalse(s.add(3))
+        self.assertTrue(s.remove(1))
+        self.assertFalse(s.remove(1))
+        self.assertTrue(s.remove(4))
+        self.assertEqual(sorted(s), [0, 2, 3])
+        self.assertFalse(1 in s)
+        self.assertTrue(2 in s)
+        self.assertTrue(s.add(1))
+        self.assertEqual(sorted(s), [0, 1, 2, 3])
+        s.clear()
+        self.assertEqual(len(s), 0)
+
+    def test_sample(self):
+        """Test that every item can be drawn and only items within the
+        set are drawn.
+        """
+        s = IndexedSet(["a", "b", "c", "d"])
+        s.remove("b")
+        random = BatchedRandom(np.random.default_rng(0))
+        drawn = set(s.sample(random) for _ in range(200))
+        self.assertEqual(drawn, {"a", "c", "d"})
@@ -0,0 +1,116 @@
+import math
+import unittest
+from pathlib import Path
+import numpy as np
+from network_envs.entities.Network import Network
+from network_envs.enums.ObservationFeature import ObservationFeature
+from network_envs.utils.LinkFeatureExtractor import LinkFeatureExtractor
+
+
+class test_LinkFeatureExtractor(unittest.TestCase):
+
+
+    def setUp(self):
+        self.net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        self.gateway = self.net.gateways[0]
+        self.extractor = LinkFeatureExtractor(self.net,
+                                              tuple(ObservationFeature),
+                                              20.0)
+
+    def tearDown(self):
+        self.extractor.close()
+
+    def expected(self, device, delay_budget, u, v, link) -> list[float]:
+        """Computes the features of a candidate one by one."""
+        bottleneck = min(self.net.bottleneck_widths().get(v, 0.0),
+                         link.available_throughput,
+                         1000.0)
+        return [0.0 if (device in link.routed_flows) else 1.0,
+                link.delay,
+                link.available_throughput,
+                self.net.hops_to_gw(v),
+                bottleneck,
+                len(link.routed_flows),
+                delay_budget - link.delay]
+
+    def test_extract(self):
+        """Test that the features of the candidates match the ones
+        computed one by one, before and after an allocation, and that
+        the padding gets the worst values.
+        """
+        uav = self.net.uavs[0]
+        cam = self.net.cams[0]
+        first = list(self.net.out_edges(uav, data=True))[0]
+        for step in range(2):
+            candidates = self.net.get_next_link(first)
+            padded = candidates + [(0, 0, 0)]
+            observations = self.extractor.extract(uav, 15.0, padded)
+            self.assertEqual(observations.shape,
+                             (len(padded), len(ObservationFeature)))
+            self.assertEqual(observations.dtype, np.float32)
+            for row, (u, v, l) in zip(observations, candidates):
+                np.testing.assert_allclose(
+                    row,
+                    self.expected(uav, 15.0, u, v, l["data"]),
+                    rtol=1e-6)
+            np.testing.assert_array_equal(observations[-1],
+                                          self.extractor.padding)
+            if (step == 0):
+                path = self.net.shortest_path_to_gw(cam, self.gateway)
+                self.assertTrue(self.net.assign_path_to_device(cam, path))
+                self.net.set_background_load(path[-2], 850.0)
+        self.assertTrue(np.any(observations[:-1, 5] > 0))
+
+    def test_handover(self):
+        """Test that the features of the up NetworkLink of a UAV follow
+        its handovers.
+        """
+        uav = self.net.uavs[0]
+        ap = next(ap for ap in self.net.access_points
+                  if (ap != self.net.attached_ap(uav)))
+        uplink = list(self.net.out_edges(ap, data="data"))[0][2]
+        self.net.set_background_load(uplink, 700.0)
+        self.net.handover_uav(uav, ap)
+        candidate = (uav, ap, self.net[uav][ap])
+        observations = self.extractor.extract(uav, 15.0, [candidate])
+        np.testing.assert_allclose(
+            observations[0],
+            self.expected(uav, 15.0, uav, ap, self.net[uav][ap]["data"]),
+            rtol=1e-6)
+        self.assertEqual(observations[0, 4], 300.0)
+
+    def test_sort(self):
+        """Test that the candidates are sorted by the features in order
+        and that the padding goes last.
+        """
+        extractor = LinkFeatureExtractor(
+            self.net,
+            (ObservationFeature.ROUTED, ObservationFeature.THROUGHPUT),
+            20.0)
+        padding = extractor.padding
+        self.assertEqual(padding.tolist(), [2.0, 0.0])
+        observations = np.array([padding,
+                                 [1.0, 10.0],
+                                 [0.0, 5.0],
+                                 [1.0, 30.0]],
+                                dtype=np.float32)
+        self.assertEqual(extractor.sort(observations).tolist(),
+                         [[0.0, 5.0], [1.0, 30.0], [1.0, 10.0], [2.0, 0.0]])
+        extractor.close()
+
+    def test_bounds(self):
+        """Test the bounds of the features and that empty or repeated
+        features are rejected.
+        """
+        self.assertEqual(self.extractor.features, tuple(ObservationFeature))
+        self.assertTrue(np.all(self.extractor.low < self.extractor.high))
+        self.assertEqual(self.extractor.high[3], len(self.net.nodes))
+        self.assertTrue(math.isinf(
+            self.net.bottleneck_widths()[self.gateway]))
+        with self.assertRaises(ValueError):
+            LinkFeatureExtractor(self.net, (), 20.0)
+        with self.assertRaises(ValueError):
+            LinkFeatureExtractor(self.net,
+                                 (ObservationFeature.HOPS,
+                                  ObservationFeature.HOPS),
+                                 20.0)
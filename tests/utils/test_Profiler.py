@@ -0,0 +1,76 @@
+import unittest
+from network_envs.utils.Profiler import Profiler
+
+
+class Target(object):
+
+    def __init__(self):
+        self.calls = 0
+
+    def work(self, n: int) -> int:
+        self.calls += 1
+        return self.helper(n) + 1
+
+    def helper(self, n: int) -> int:
+        return sum(range(n))
+
+
+class test_Profiler(unittest.TestCase):
+
+
+    def test_instrument_restore(self):
+        """Test that instrumented methods are counted and timed and that
+        restoring leaves the original methods in place.
+        """
+        profiler = Profiler(max_samples=8)
+        target = Target()
+        self.assertFalse(profiler.enabled)
+        profiler.instrument(target, ["work", "helper"])
+        profiler.instrument(target, ["work"])
+        self.assertTrue(profiler.enabled)
+        for n in range(20):
+            self.assertEqual(target.work(n), sum(range(n)) + 1)
+        stats = profiler.stats()
+        self.assertEqual(stats["Target.work"]["count"], 20)
+        self.assertEqual(stats["Target.helper"]["count"], 20)
+        work = stats["Target.work"]
+        self.assertGreaterEqual(work["total"], stats["Target.helper"]["total"])
+        self.assertLessEqual(work["p50"], work["p90"])
+        self.assertLessEqual(work["p90"], work["p99"])
+        self.assertLessEqual(work["p99"], work["max"])
+        self.assertAlmostEqual(work["mean"], work["total"] / 20)
+        profiler.restore()
+        self.assertFalse(profiler.enabled)
+        self.assertNotIn("work", vars(target))
+        target.work(3)
+        self.assertEqual(profiler.stats()["Target.work"]["count"], 20)
+        self.assertEqual(target.calls, 21)
+        profiler.reset()
+        self.assertEqual(profiler.stats(), {})
+
+    def test_counters_and_timers(self):
+        """Test the counters that are not timed and the timed blocks."""
+        profiler = Profiler()
+        profiler.count("events")
+        profiler.count("events", 4)
+        with profiler.timer("block"):
+            sum(range(100))
+        stats = profiler.stats()
+        self.assertEqual(stats["events"], {"count": 5})
+        self.assertEqual(stats["block"]["count"], 1)
+        self.assertEqual(stats["block"]["p50"], stats["block"]["max"])
+
+    def test_count_timed_name(self):
+        """Test that counting a timed name does not disturb its
+        durations.
+        """
+        profiler = Profiler(max_samples=4)
+        profiler.record("call", 1.0)
+        profiler.count("call", 2)
+        profiler.record("call", 3.0)
+        stats = profiler.stats()["call"]
+        self.assertEqual(stats["count"], 4)
+        self.assertEqual(stats["total"], 4.0)
+        self.assertEqual(stats["mean"], 2.0)
+        self.assertEqual(stats["max"], 3.0)
+        self.assertEqual(stats["p50"], 2.0)
@@ -0,0 +1,51 @@
+import unittest
+import tempfile
+from pathlib import Path
+from network_envs.utils.TraceReader import TraceReader
+from network_envs.enums.NetworkEventType import NetworkEventType
+
+
+TRACE = """timestamp,event_type,device_id,x,y,ap_id
+0.0,UAV_POSITION,200,1.0,6.2,
+1.5,UAV_HANDOVER,201,,,11
+2.0,CAM_START,206,,,
+3.0,CAM_STOP,206,,,
+"""
+
+
+class test_TraceReader(unittest.TestCase):
+
+
+    def test_read(self):
+        """Test that all the events are read in order with their
+        fields, regardless of the chunk size.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_path = Path(tmp_dir).joinpath("trace.csv")
+            trace_path.write_text(TRACE)
+            for chunk_size in (1, 3, 4096):
+                events = list(TraceReader(trace_path, chunk_size=chunk_size))
+                self.assertEqual(len(events), 4)
+                self.assertEqual(events[0].event_type,
+                                 NetworkEventType.UAV_POSITION)
+                self.assertEqual(events[0].position, (1.0, 6.2))
+                self.assertEqual(events[0].ap_id, None)
+                self.assertEqual(events[1].timestamp, 1.5)
+                self.assertEqual(events[1].ap_id, 11)
+                self.assertEqual(events[1].position, None)
+                self.assertEqual(events[3].event_type,
+                                 NetworkEventType.CAM_STOP)
+                self.assertEqual(events[3].device_id, 206)
+
+    def test_unsorted(self):
+        """Test that traces whose timestamps decrease are rejected."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            trace_path = Path(tmp_dir).joinpath("trace.csv")
+            trace_path.write_text(TRACE
+                                  + "1.0,CAM_START,207,,,\n"
+                                  + "9.0,CAM_START,208,,,\n")
+            line_num: int = len(TRACE.splitlines()) + 1
+            for chunk_size in (1, 2, 4096):
+                with self.assertRaisesRegex(ValueError,
+                                            f"line {line_num}\\)"):
+                    list(TraceReader(trace_path, chunk_size=chunk_size))
@@ -0,0 +1,82 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from network_envs.entities.Network import Network
+
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") != None
+
+# Wall-clock budgets, in s, of the startup of a worker process. They are
+# generous on purpose: the point is to notice when a heavy dependency
+# creeps into the import path, not to benchmark the machine
+IMPORT_BUDGET = 1.5
+MAKE_BUDGET = 1.5
+
+STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import network_envs
+imported = time.perf_counter()
+import gymnasium as gym
+env = gym.make("network_envs/NetworkEnv-v0", configuration=sys.argv[1])
+made = time.perf_counter()
+print(json.dumps({
+    "import": imported - start,
+    "make": made - imported,
+    "modules": [m for m in sys.modules
+                if m.split(".")[0] in ("matplotlib", "PySide6")
+                or m.startswith("network_envs.visualization")]}))
+"""
+
+
+class test_NetworkDrawer(unittest.TestCase):
+
+
+    def test_startup(self):
+        """Test that importing network_envs and creating an environment
+        do not import the plotting dependencies and stay within the
+        import-time budget.
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+        configuration: Path = Path.cwd().joinpath("input", "network_00.json")
+        output = subprocess.run([sys.executable,
+                                 "-c",
+                                 STARTUP_SCRIPT,
+                                 str(configuration)],
+                                env=env,
+                                capture_output=True,
+                                text=True,
+                                check=True).stdout
+        startup: dict = json.loads(output.splitlines()[-1])
+        self.assertEqual(startup["modules"], [])
+        self.assertLess(startup["import"], IMPORT_BUDGET)
+        self.assertLess(startup["make"], MAKE_BUDGET)
+
+    @unittest.skipUnless(HAS_MATPLOTLIB, "matplotlib is not installed")
+    def test_show_path(self):
+        """Test that the Network can be drawn with and without a path.
+        """
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        uav = net.uavs[0]
+        path = net.shortest_path_to_gw(uav, net.gateways[0])
+        net.show_network_info()
+        edges = {l["data"]: (u, v, l) for (u, v, l) in net.edges(data=True)}
+        net.show_path([edges[l] for l in path])
+        self.assertGreater(len(plt.gca().collections), 0)
+        plt.close("all")
+
+    @unittest.skipIf(HAS_MATPLOTLIB, "matplotlib is installed")
+    def test_missing_matplotlib(self):
+        """Test that drawing without matplotlib explains how to install
+        the optional dependencies.
+        """
+        net = Network(Path.cwd().joinpath("input", "network_00.json"))
+        with self.assertRaisesRegex(ImportError, "requirements-viz.txt"):
+            net.show_network_info()
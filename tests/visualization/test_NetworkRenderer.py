@@ -0,0 +1,51 @@
+import importlib.util
+import unittest
+from pathlib import Path
+import numpy as np
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.envs.PathNetworkEnv import PathNetworkEnv
+
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") != None
+
+
+@unittest.skipUnless(HAS_MATPLOTLIB, "matplotlib is not installed")
+class test_NetworkRenderer(unittest.TestCase):
+
+
+    def setUp(self):
+        self.configuration: Path = Path.cwd().joinpath("input",
+                                                       "network_00.json")
+
+    def test_rgb_array(self):
+        """Test that the frames are arrays of a constant shape that
+        change when the path and the UAVs change, and that the figure
+        is built only once.
+        """
+        env = NetworkEnv(configuration=self.configuration,
+                         n_actions=5,
+                         render_mode="rgb_array")
+        env.reset(seed=0)
+        first = env.render()
+        self.assertEqual(first.ndim, 3)
+        self.assertEqual(first.shape[2], 3)
+        self.assertEqual(first.dtype, np.uint8)
+        renderer = env.get_wrapper_attr("_renderer")
+        figure = renderer._figure
+        for _ in range(5):
+            env.step(0)
+            env.reset()
+        frame = env.render()
+        self.assertEqual(frame.shape, first.shape)
+        self.assertFalse(np.array_equal(frame, first))
+        self.assertIs(env.get_wrapper_attr("_renderer")._figure, figure)
+        env.close()
+        self.assertIsNone(env.get_wrapper_attr("_renderer"))
+
+    def test_path_network_env(self):
+        """Test that the PathNetworkEnv renders its chosen path."""
+        env = PathNetworkEnv(configuration=self.configuration,
+                             render_mode="rgb_array")
+        env.reset(seed=0)
+        env.step(0)
+        self.assertEqual(env.render().ndim, 3)
+        env.close()
@@ -0,0 +1,144 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.envs.PathNetworkEnv import PathNetworkEnv
+from network_envs.wrappers.TrajectoryRecorder import TrajectoryRecorder
+
+
+class test_TrajectoryRecorder(unittest.TestCase):
+
+
+    def setUp(self):
+        self.configuration: Path = Path.cwd().joinpath("input",
+                                                       "network_00.json")
+
+    def _load(self, directory: Path) -> tuple[dict, dict[str, np.ndarray]]:
+        with open(directory.joinpath("metadata.json")) as metadata_file:
+            metadata: dict = json.load(metadata_file)
+        chunks = [np.load(directory.joinpath(c["file"]))
+                  for c in metadata["chunks"]]
+        columns = {name: np.concatenate([c[name] for c in chunks])
+                   for name in metadata["columns"]}
+        return metadata, columns
+
+    def test_record(self):
+        """Test that every step is recorded, in order, across several
+        chunks.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            env = TrajectoryRecorder(
+                NetworkEnv(configuration=self.configuration, n_actions=5),
+                directory,
+                chunk_size=8)
+            rewards, actions, devices, paths = [], [], [], []
+            obs, _ = env.reset(seed=0)
+            first_obs = obs
+            for i in range(30):
+                action = i % 2
+                obs, reward, terminated, truncated, _ = env.step(action)
+                rewards.append(reward)
+                actions.append(action)
+                devices.append(env.unwrapped.device.id)
+                paths.append([l["data"].id for (_, _, l) in env.unwrapped.path])
+                if (terminated or truncated):
+                    obs, _ = env.reset()
+            self.assertEqual(env.n_steps, 30)
+            env.close()
+            metadata, columns = self._load(directory)
+        self.assertEqual(metadata["n_steps"], 30)
+        self.assertEqual([c["n_steps"] for c in metadata["chunks"]],
+                         [8, 8, 8, 6])
+        self.assertEqual(columns["step"][0], 0)
+        np.testing.assert_allclose(columns["observation"][0],
+                                   np.reshape(first_obs, -1))
+        np.testing.assert_allclose(columns["reward"], rewards, rtol=1e-6)
+        self.assertEqual(columns["action"].tolist(), actions)
+        self.assertEqual(columns["device_id"].tolist(), devices)
+        for recorded, path in zip(columns["link_ids"], paths):
+            self.assertEqual(recorded[:len(path)].tolist(), path)
+            self.assertTrue(np.all(recorded[len(path):] == -1))
+        # The next observation of a step is the observation of the next
+        # step of the same episode
+        same_episode = columns["episode"][1:] == columns["episode"][:-1]
+        np.testing.assert_array_equal(
+            columns["next_observation"][:-1][same_episode],
+            columns["observation"][1:][same_episode])
+        self.assertEqual(columns["utilization"].shape, (30, 4))
+        self.assertTrue(np.all(columns["utilization"] >= 0.0))
+
+    def test_network_changes(self):
+        """Test that the state of the Network is stored as full
+        snapshots every few steps plus the changes in between, from
+        which the state of every step is rebuilt.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            env = TrajectoryRecorder(
+                NetworkEnv(configuration=self.configuration, n_actions=5),
+                directory,
+                chunk_size=8,
+                snapshot_interval=10)
+            network = env.unwrapped.network
+            states = []
+            env.reset(seed=1)
+            for i in range(30):
+                states.append((
+                    [l.available_throughput for l in network.network_links],
+                    [network.attached_ap(u).id for u in network.uavs]))
+                _, _, terminated, truncated, _ = env.step(i % 3)
+                if (terminated or truncated):
+                    env.reset()
+            env.close()
+            metadata, columns = self._load(directory)
+            chunks = [np.load(directory.joinpath(c["file"]))
+                      for c in metadata["chunks"]]
+            tables = {
+                table: {name: np.concatenate([c[f"{table}.{name}"]
+                                              for c in chunks])
+                        for name in table_columns}
+                for table, table_columns in metadata["tables"].items()}
+        self.assertNotIn("link_available", columns)
+        self.assertEqual(tables["snapshots"]["step"].tolist(), [0, 10, 20])
+        n_links = len(network.network_links)
+        self.assertLess(len(tables["link_changes"]["step"]), 30 * n_links)
+        link_available = None
+        uav_ap_ids = None
+        for step, (available, ap_ids) in enumerate(states):
+            if (step % 10 == 0):
+                link_available = tables["snapshots"]["link_available"][
+                    step // 10].copy()
+                uav_ap_ids = tables["snapshots"]["uav_ap_ids"][
+                    step // 10].copy()
+            changes = tables["link_changes"]["step"] == step
+            link_available[tables["link_changes"]["link"][changes]] =\
+                tables["link_changes"]["available"][changes]
+            handovers = tables["handovers"]["step"] == step
+            uav_ap_ids[tables["handovers"]["uav"][handovers]] =\
+                tables["handovers"]["ap_id"][handovers]
+            self.assertEqual(link_available.tolist(), available)
+            self.assertEqual(uav_ap_ids.tolist(), ap_ids)
+
+    def test_path_network_env(self):
+        """Test that the whole chosen path of a PathNetworkEnv is
+        recorded and that one step per episode is stored.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            env = TrajectoryRecorder(
+                PathNetworkEnv(configuration=self.configuration),
+                directory,
+                chunk_size=4,
+                compress=False)
+            for episode in range(5):
+                env.reset(seed=episode)
+                env.step(0)
+            path = [l["data"].id for (_, _, l) in env.unwrapped.path]
+            env.close()
+            _, columns = self._load(directory)
+        self.assertEqual(columns["episode"].tolist(), [0, 1, 2, 3, 4])
+        self.assertTrue(np.all(columns["terminated"]))
+        self.assertEqual(columns["link_ids"][-1][:len(path)].tolist(), path)
@@ -9,3 +9,22 @@ register(
     order_enforce=True,
     autoreset=False,
 )
+
+register(
+    id="network_envs/PathNetworkEnv-v0",
+    entry_point="network_envs.envs:PathNetworkEnv",
+    max_episode_steps=1,
+    reward_threshold=None,
+    nondeterministic=False,
+    order_enforce=True,
+    autoreset=False,
+)
+
+register(
+    id="network_envs/ReplayNetworkEnv-v0",
+    entry_point="network_envs.envs:ReplayNetworkEnv",
+    reward_threshold=None,
+    nondeterministic=False,
+    order_enforce=True,
+    autoreset=False,
+)
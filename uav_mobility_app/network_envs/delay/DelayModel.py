@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+
+class DelayModel(ABC):
+    """The interface of the models that give the delay a NetworkLink
+    introduces as a function of its load. NetworkLinks cache the delay
+    and only ask the model again when their available throughput
+    changes, so models may be expensive to evaluate.
+    """
+
+
+    @abstractmethod
+    def delay(self, load_rate: float) -> float:
+        """Returns the delay of a NetworkLink with the given load.
+
+        Args:
+            load_rate (float): The fraction of the maximum throughput of
+            the NetworkLink that is in use, in [0, 1].
+
+        Returns:
+            float: The delay expressed in ms.
+        """
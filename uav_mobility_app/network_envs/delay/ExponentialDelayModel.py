@@ -0,0 +1,27 @@
+import math
+from network_envs.delay.DelayModel import DelayModel
+
+
+class ExponentialDelayModel(DelayModel):
+    """The original queueing curve of the NetworkLinks: 1 ms (20/e^3)
+    when idle, growing exponentially up to 20 ms when full.
+    """
+
+
+    def __init__(self,
+                 max_delay: float = 20.0,
+                 steepness: float = 3.0) -> None:
+        """Creates the model.
+
+        Args:
+            max_delay (float, optional): The delay of a full NetworkLink
+            expressed in ms. Defaults to 20.0.
+            steepness (float, optional): The exponent applied to the
+            load rate. Defaults to 3.0.
+        """
+        self._max_delay: float = max_delay
+        self._steepness: float = steepness
+        self._idle_delay: float = max_delay / math.exp(steepness)
+
+    def delay(self, load_rate: float) -> float:
+        return self._idle_delay * math.exp(self._steepness * load_rate)
@@ -0,0 +1,27 @@
+from network_envs.delay.DelayModel import DelayModel
+
+
+class MM1DelayModel(DelayModel):
+    """The delay of an M/M/1 queue, which grows as 1 / (1 - load rate).
+    It diverges when the NetworkLink is full, so it is capped.
+    """
+
+
+    def __init__(self,
+                 service_delay: float = 1.0,
+                 max_delay: float = 100.0) -> None:
+        """Creates the model.
+
+        Args:
+            service_delay (float, optional): The delay of an idle
+            NetworkLink expressed in ms. Defaults to 1.0.
+            max_delay (float, optional): The highest delay expressed in
+            ms. Defaults to 100.0.
+        """
+        self._service_delay: float = service_delay
+        self._max_delay: float = max_delay
+
+    def delay(self, load_rate: float) -> float:
+        if (load_rate >= 1.0):
+            return self._max_delay
+        return min(self._service_delay / (1.0 - load_rate), self._max_delay)
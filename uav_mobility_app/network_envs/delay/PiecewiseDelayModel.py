@@ -0,0 +1,36 @@
+import numpy as np
+from network_envs.delay.DelayModel import DelayModel
+
+
+class PiecewiseDelayModel(DelayModel):
+    """Interpolates linearly a table of measured delays, e.g. a latency
+    curve obtained from a testbed.
+    """
+
+
+    def __init__(self,
+                 load_rates: list[float],
+                 delays: list[float]) -> None:
+        """Creates the model from the table.
+
+        Args:
+            load_rates (list[float]): The load rates of the table, in
+            increasing order.
+            delays (list[float]): The delay measured at each load rate
+            expressed in ms.
+
+        Raises:
+            ValueError: If the table is empty, the lengths differ or the
+            load rates are not increasing.
+        """
+        self._load_rates = np.asarray(load_rates, dtype=np.float64)
+        self._delays = np.asarray(delays, dtype=np.float64)
+        if (len(self._load_rates) == 0
+            or self._load_rates.shape != self._delays.shape):
+            raise ValueError(
+                "The table needs the same number of load rates and delays.")
+        if (np.any(np.diff(self._load_rates) <= 0)):
+            raise ValueError("The load rates must be increasing.")
+
+    def delay(self, load_rate: float) -> float:
+        return float(np.interp(load_rate, self._load_rates, self._delays))
@@ -3,10 +3,29 @@ from network_envs.utils.NetworkJSONParser import parse_json
 from network_envs.enums.NetworkNodeType import NetworkNodeType
 from network_envs.entities.NetworkNode import NetworkNode
 from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.NetworkLink import DEFAULT_DELAY_MODEL
+from network_envs.delay.DelayModel import DelayModel
 from network_envs.entities.NetworkDevice import NetworkDevice
 from network_envs.enums.NetworkDeviceType import NetworkDeviceType
 from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
-import random
+from network_envs.enums.MobilityMode import MobilityMode
+from network_envs.enums.PathCost import PathCost
+from network_envs.enums.NetworkLinkTier import NetworkLinkTier
+from network_envs.enums.AllocationEventType import AllocationEventType
+from network_envs.enums.NetworkEventType import NetworkEventType
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.utils.GridIndex import GridIndex
+from network_envs.utils.BatchedRandom import BatchedRandom
+from network_envs.utils.IndexedSet import IndexedSet
+from network_envs.enums.GraphBackendType import GraphBackendType
+from network_envs.graph.GraphBackend import GraphBackend
+from network_envs.graph.NetworkXBackend import NetworkXBackend
+from network_envs.graph.ArrayBackend import ArrayBackend
+import math
+import numpy as np
+import heapq
+from itertools import count
+from typing import Callable
 from pathlib import Path
 
 
@@ -16,13 +35,30 @@ class Network(nx.DiGraph):
     """
 
 
-    def __init__(self, configuration: Path, **attr):
+    def __init__(self,
+                 configuration: Path,
+                 mobility: MobilityMode = MobilityMode.RANDOM,
+                 cam_mean_duration: float = None,
+                 delay_model: DelayModel = None,
+                 backend: GraphBackendType = GraphBackendType.ARRAY,
+                 **attr):
         """Create the network from a dictionary of NetworkNodes,
         NetworkLinks and NetworkDevices.
 
         Args:
             configuration (Path): The file that contains the
             configuration for the enviroment.
+            mobility (MobilityMode, optional): How UAVs move when a UAV
+            event is generated. Defaults to MobilityMode.RANDOM.
+            cam_mean_duration (float, optional): The mean duration of
+            the cameras' video streamings, measured in generated events.
+            Durations are drawn from an exponential distribution. If
+            None, cameras never stop. Defaults to None.
+            delay_model (DelayModel, optional): How the delay of all the
+            NetworkLinks grows with their load. Defaults to the
+            exponential queueing curve.
+            backend (GraphBackendType, optional): The structure the
+            routing queries run on. Defaults to GraphBackendType.ARRAY.
         """
         super().__init__(None, **attr)
         network_data = parse_json(configuration)
@@ -48,12 +84,106 @@ class Network(nx.DiGraph):
                 self._cams.append(d)
         self._network_links: list[NetworkLink] =\
             [d[2] for d in network_data["network_links"]]
+        if (delay_model == None):
+            delay_model = DEFAULT_DELAY_MODEL
+        self._delay_model: DelayModel = delay_model
+        for l in self._network_links:
+            l.delay_model = delay_model
         network_links = []
         for l in network_data["network_links"]:
             network_links.append((l[0], l[1], {"data": l[2]}))
         self.add_nodes_from(network_data["network_nodes"])
         self.add_nodes_from(network_data["network_devices"])
         self.add_edges_from(network_links)
+        # Index the APs and record where each UAV is attached to so that
+        # handovers do not need to query the graph
+        self._ap_index: dict[NetworkNode, int] = {
+            ap: i for i, ap in enumerate(self._access_points)}
+        self._uav_attachments: dict[NetworkDevice,
+                                    tuple[NetworkNode,
+                                          NetworkLink,
+                                          NetworkLink]] = {}
+        for uav in self._uavs:
+            for (_, ap, l) in self.out_edges(uav, data=True):
+                self._uav_attachments[uav] = (ap,
+                                              l["data"],
+                                              self[ap][uav]["data"])
+        self._mobility: MobilityMode = mobility
+        ap_positions = [ap.position for ap in self._access_points]
+        self._ap_grid: GridIndex = GridIndex(self._access_points, ap_positions)
+        self._ap_bounds: tuple[tuple[float, float], tuple[float, float]] = (
+            (min(p[0] for p in ap_positions), min(p[1] for p in ap_positions)),
+            (max(p[0] for p in ap_positions), max(p[1] for p in ap_positions)))
+        self._trajectories: dict[NetworkDevice,
+                                 list[tuple[float, float]]] = {}
+        self._trajectory_steps: dict[NetworkDevice, int] = {}
+        self._random: BatchedRandom = BatchedRandom()
+        self._cam_mean_duration: float | None = cam_mean_duration
+        self._inactive_cams: IndexedSet = IndexedSet(
+            c for c in self._cams if not c.is_active)
+        self._active_cams: IndexedSet = IndexedSet(
+            c for c in self._cams if c.is_active)
+        # Generated events so far and heap of (stop event, cam id, cam)
+        self._clock: int = 0
+        self._cam_stops: list[tuple[float, int, NetworkDevice]] = []
+        self._cam_stop_times: dict[NetworkDevice, float] = {}
+        # Number of times every camera has started streaming
+        self._cam_sessions: dict[NetworkDevice, int] = {}
+        self._nodes_by_id: dict[int, NetworkNode] = {
+            n.id: n for n in self._network_nodes}
+        self._devices_by_id: dict[int, NetworkDevice] = {
+            d.id: d for d in self._network_devices}
+        self._links_by_id: dict[int, NetworkLink] = {
+            l.id: l for l in self._network_links}
+        self._background_loads: dict[NetworkLink, float] = {}
+        self._reverse_links: dict[NetworkLink, NetworkLink] = {
+            l: self[v][u]["data"]
+            for (u, v, l) in network_data["network_links"]
+            if (self.has_edge(v, u))}
+        # Aggregates of the throughput in use, kept up to date by
+        # listening to the NetworkLinks, so that the headroom of the
+        # Network is known without traversing it
+        self._link_tiers: dict[NetworkLink, NetworkLinkTier] = {
+            l: self._classify_link(u, v)
+            for (u, v, l) in network_data["network_links"]}
+        self._tier_capacities: dict[NetworkLinkTier, float] = {
+            tier: 0.0 for tier in NetworkLinkTier}
+        self._tier_loads: dict[NetworkLinkTier, float] = {
+            tier: 0.0 for tier in NetworkLinkTier}
+        for l, tier in self._link_tiers.items():
+            self._tier_capacities[tier] += l.max_throughput
+        self._link_loads: dict[NetworkLink, float] = {}
+        self._link_versions: dict[NetworkLink, int] = {}
+        # Heap of (-utilization, link id, version, link). Entries whose
+        # version is outdated are discarded lazily
+        self._loaded_links: list[tuple[float, int, int, NetworkLink]] = []
+        # Tree of widest paths towards the Gateways, see
+        # bottleneck_widths, and endpoints of the NetworkLinks that it
+        # may use
+        self._bottleneck_widths: dict[NetworkNode, float] | None = None
+        self._bottleneck_parents: dict[NetworkNode, NetworkLink] = {}
+        self._link_endpoints: dict[NetworkLink,
+                                   tuple[NetworkNode, NetworkNode]] = {
+            l: (u, v) for (u, v, l) in network_data["network_links"]
+            if (self._link_tiers[l] != NetworkLinkTier.ACCESS)}
+        self._update_link_stats(self._network_links)
+        self._link_subscribers: list[Callable[[NetworkLink], None]] = []
+        self._dirty_link_sets: list[set[NetworkLink]] = []
+        self._allocation_subscribers: list[
+            Callable[[AllocationEventType,
+                      NetworkDevice,
+                      list[list[NetworkLink]]], None]] = []
+        self._handover_subscribers: list[
+            Callable[[NetworkDevice, NetworkNode, NetworkNode], None]] = []
+        self._backend_type: GraphBackendType = backend
+        if (backend == GraphBackendType.NETWORKX):
+            self._backend: GraphBackend = NetworkXBackend(self)
+        else:
+            self._backend = ArrayBackend(self)
+        for l in self._network_links:
+            l.add_listener(self._on_link_change)
+        # Created on the first drawing, see _get_drawer
+        self._drawer = None
 
     @property
     def network_nodes(self) -> list[NetworkNode]:
@@ -131,6 +261,105 @@ class Network(nx.DiGraph):
         """
         return self._cams
 
+    @property
+    def backend(self) -> GraphBackendType:
+        """Returns the structure the routing queries run on.
+
+        Returns:
+            GraphBackendType: The type of the backend.
+        """
+        return self._backend_type
+
+    @property
+    def mobility(self) -> MobilityMode:
+        """Returns how UAVs move when a UAV event is generated.
+
+        Returns:
+            MobilityMode: How UAVs move when a UAV event is generated.
+        """
+        return self._mobility
+
+    @property
+    def delay_model(self) -> DelayModel:
+        """Returns how the delay of the NetworkLinks grows with their
+        load.
+
+        Returns:
+            DelayModel: The DelayModel of the NetworkLinks.
+        """
+        return self._delay_model
+
+    @delay_model.setter
+    def delay_model(self, new_delay_model: DelayModel) -> None:
+        """Sets the DelayModel of all the NetworkLinks.
+
+        Args:
+            new_delay_model (DelayModel): The new DelayModel.
+        """
+        self._delay_model = new_delay_model
+        for l in self._network_links:
+            l.delay_model = new_delay_model
+
+    @property
+    def rng(self) -> np.random.Generator:
+        """Returns the generator from which the pseudorandom events are
+        drawn.
+
+        Returns:
+            np.random.Generator: The generator of the Network.
+        """
+        return self._random.generator
+
+    @rng.setter
+    def rng(self, new_rng: np.random.Generator) -> None:
+        """Sets the generator from which the pseudorandom events are
+        drawn, e.g. the np_random of the gymnasium.Env that owns the
+        Network.
+
+        Args:
+            new_rng (np.random.Generator): The new generator.
+        """
+        self._random = BatchedRandom(new_rng)
+
+    @property
+    def random(self) -> BatchedRandom:
+        """Returns the batched sampler of the Network, which draws from
+        its generator.
+
+        Returns:
+            BatchedRandom: The batched sampler of the Network.
+        """
+        return self._random
+
+    @property
+    def active_cams(self) -> IndexedSet:
+        """Returns the NetworkDevices of type NetworkDeviceType.CAM that
+        are streaming.
+
+        Returns:
+            IndexedSet: The active cameras.
+        """
+        return self._active_cams
+
+    @property
+    def inactive_cams(self) -> IndexedSet:
+        """Returns the NetworkDevices of type NetworkDeviceType.CAM that
+        are not streaming.
+
+        Returns:
+            IndexedSet: The inactive cameras.
+        """
+        return self._inactive_cams
+
+    @property
+    def has_inactive_cams(self) -> bool:
+        """Returns whether there is any camera that can start streaming.
+
+        Returns:
+            bool: Whether there is any inactive camera.
+        """
+        return len(self._inactive_cams) > 0
+
     @property
     def network_links(self) -> list[NetworkLink]:
         """Returns the list of the NetworkLinks within the graph.
@@ -155,38 +384,504 @@ class Network(nx.DiGraph):
         Returns:
             Any: The path
         """
+        shortest_path_nodes = self._routable_dijkstra(network_device,
+                                                      gateway)
+        return self.path_links(shortest_path_nodes)
 
-        # Prune the edges that cannot provide with enough throughput
-        edges_to_remove = []
-        for (u,v,l) in self.edges(data=True):
-            l: NetworkLink = l["data"]
-            not_enough_throughput =\
-                l.available_throughput < network_device.throughput_req
-            is_edge_link = isinstance(u, NetworkDevice) \
-                           or isinstance(v, NetworkDevice)
-            if (not_enough_throughput and not is_edge_link):
-                edges_to_remove.append((u,v,{"data":l}))
-        self.remove_edges_from(edges_to_remove)
-        # TODO Check if there is a more consistent way of doing this
-        # Set the weight of edges as the NetworkLinks' delays
-        for (u,v,l) in self.edges(data=True):
-            l: NetworkLink = l["data"]
-            self[u][v]["weight"] = l.delay
-        shortest_path_nodes = nx.shortest_path(self,
-                                               network_device,
-                                               gateway,
-                                               method="dijkstra",
-                                               weight="weight")
-        self.add_edges_from(edges_to_remove)
-        shortest_path_pairs = zip(shortest_path_nodes[0:-1],
-                                   shortest_path_nodes[1:])
+    def min_weight_path_to_gw(
+            self,
+            network_device: NetworkDevice,
+            gateway: NetworkNode,
+            weight: Callable[[NetworkLink], float]) -> list[NetworkLink]:
+        """Calculates the path with enough throughput between the given
+        NetworkDevice and the given Gateway that minimizes the sum of
+        the given weight.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+            weight (Callable[[NetworkLink], float]): The non-negative
+            weight of each NetworkLink.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput.
+
+        Returns:
+            list[NetworkLink]: The path, in the same format as
+            shortest_path_to_gw.
+        """
+        return self.path_links(self._routable_dijkstra(network_device,
+                                                       gateway,
+                                                       weight))
+
+    def delay_constrained_path_to_gw(
+            self,
+            network_device: NetworkDevice,
+            gateway: NetworkNode,
+            cost: PathCost = PathCost.CHANGES,
+            max_iterations: int = 20) -> list[NetworkLink]:
+        """Calculates a path with enough throughput between the given
+        NetworkDevice and the given Gateway whose delay does not exceed
+        the NetworkDevice's delay_req and that minimizes the given cost.
+        The LARAC algorithm is used: the cost and the delay are combined
+        with a Lagrange multiplier that is adjusted until the cheapest
+        path within the delay budget is found, so each iteration is just
+        a Dijkstra's search. The result is optimal or very close to it.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+            cost (PathCost, optional): What to minimize. Defaults to
+            PathCost.CHANGES.
+            max_iterations (int, optional): The maximum number of
+            adjustments of the multiplier. Defaults to 20.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput within the delay budget. It is detected with a
+            single search for the path with the least delay.
+
+        Returns:
+            list[NetworkLink]: The path, in the same format as
+            shortest_path_to_gw.
+        """
+        delay_budget: float = network_device.delay_req
+        if (cost == PathCost.HOPS):
+            link_cost = lambda l: 1.0
+        else:
+            link_cost = lambda l: float(network_device not in l.routed_flows
+                                        and len(l.routed_flows) > 0)
+
+        def measure(path_nodes: list) -> tuple[float, float]:
+            links = [self[u][v]["data"]
+                     for u, v in zip(path_nodes[0:-1], path_nodes[1:])]
+            return (sum(link_cost(l) for l in links),
+                    sum(l.delay for l in links))
+
+        fastest_nodes = self._routable_dijkstra(network_device, gateway)
+        fastest_cost, fastest_delay = measure(fastest_nodes)
+        if (fastest_delay > delay_budget):
+            raise nx.NetworkXNoPath(
+                f"No path from {network_device.name} to {gateway.name} "
+                f"meets the delay requirement of {delay_budget} ms.")
+        cheapest_nodes = self._routable_dijkstra(network_device,
+                                                 gateway,
+                                                 link_cost)
+        cheapest_cost, cheapest_delay = measure(cheapest_nodes)
+        if (cheapest_delay <= delay_budget):
+            return self.path_links(cheapest_nodes)
+        # The cheapest path is too slow and the fastest one is feasible,
+        # search for the best trade-off between them
+        for _ in range(max_iterations):
+            multiplier: float = (fastest_cost - cheapest_cost)\
+                / (cheapest_delay - fastest_delay)
+            nodes = self._routable_dijkstra(
+                network_device,
+                gateway,
+                lambda l: link_cost(l) + multiplier * l.delay)
+            path_cost, path_delay = measure(nodes)
+            if (math.isclose(path_cost + multiplier * path_delay,
+                             cheapest_cost + multiplier * cheapest_delay)):
+                break
+            if (path_delay <= delay_budget):
+                fastest_nodes = nodes
+                fastest_cost, fastest_delay = path_cost, path_delay
+            else:
+                cheapest_nodes = nodes
+                cheapest_cost, cheapest_delay = path_cost, path_delay
+        return self.path_links(fastest_nodes)
+
+    def _routable_dijkstra(
+            self,
+            network_device: NetworkDevice,
+            gateway: NetworkNode,
+            weight: Callable[[NetworkLink], float] = None
+            ) -> list[NetworkNode | NetworkDevice]:
+        """Calculates the path that minimizes the sum of the given
+        weight using only the NetworkLinks with enough throughput for
+        the NetworkDevice, counting the throughput it currently uses as
+        available. The search runs on the backend and the graph
+        is not modified.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+            weight (Callable[[NetworkLink], float], optional): The
+            non-negative weight of each NetworkLink. Defaults to the
+            delay.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput.
+
+        Returns:
+            list[NetworkNode | NetworkDevice]: The nodes of the path.
+        """
+        return self._backend.min_weight_path(network_device, gateway, weight)
+
+    def widest_path_to_gw(self,
+                          network_device: NetworkDevice,
+                          gateway: NetworkNode) -> list[NetworkLink]:
+        """Calculates the widest path with enough throughput between the
+        given NetworkDevice and the given Gateway, i.e. the one whose
+        bottleneck (the least available throughput among its
+        NetworkLinks) is the largest. Routing through it spreads the
+        load instead of saturating the links of the shortest path.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput.
+
+        Returns:
+            list[NetworkLink]: The path, in the same format as
+            shortest_path_to_gw.
+        """
+        return self._best_path_to_gw(
+            network_device,
+            gateway,
+            (-math.inf,),
+            lambda label, l: (max(label[0], -l.available_throughput),))
+
+    def min_delay_widest_path_to_gw(self,
+                                    network_device: NetworkDevice,
+                                    gateway: NetworkNode
+                                    ) -> list[NetworkLink]:
+        """Calculates the path with the least delay between the given
+        NetworkDevice and the given Gateway and, among the ones with the
+        same delay, the widest. As long as the Network is not loaded,
+        many paths have the same delay, and the widest one is preferred.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput.
+
+        Returns:
+            list[NetworkLink]: The path, in the same format as
+            shortest_path_to_gw.
+        """
+        return self._best_path_to_gw(
+            network_device,
+            gateway,
+            (0.0, -math.inf),
+            lambda label, l: (label[0] + l.delay,
+                              max(label[1], -l.available_throughput)))
+
+    def split_flow_to_gw(
+            self,
+            network_device: NetworkDevice,
+            gateway: NetworkNode,
+            max_paths: int = 3) -> list[tuple[list[NetworkLink], float]]:
+        """Splits the NetworkDevice's workflow across up to max_paths
+        paths when no single path can carry it. The widest path is
+        taken, as much throughput as it can carry is reserved on it and
+        the process is repeated on the throughput that remains. A single
+        path is returned if the widest one is enough.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the paths start.
+            gateway (NetworkNode): The NetworkNode where the paths end.
+            max_paths (int, optional): The maximum number of paths.
+            Defaults to 3.
+
+        Raises:
+            nx.NetworkXNoPath: If the workflow does not fit in max_paths
+            paths.
+
+        Returns:
+            list[tuple[list[NetworkLink], float]]: Pairs of path, in the
+            same format as shortest_path_to_gw, and throughput to
+            allocate along it. See assign_multipath_to_device.
+        """
+        residual: dict[NetworkLink, float] = {}
+
+        def width(l: NetworkLink) -> float:
+            # Workflows are routed both ways, so a hop is as wide as the
+            # narrowest of its two directions
+            return min(residual.get(l, l.available_throughput),
+                       residual.get(self._reverse_links[l],
+                                    self._reverse_links[l]
+                                    .available_throughput))
+
+        remaining: float = network_device.throughput_req
+        split: list[tuple[list[NetworkLink], float]] = []
+        while (remaining > 0.0 and len(split) < max_paths):
+            try:
+                path: list[NetworkLink] = self._best_path_to_gw(
+                    network_device,
+                    gateway,
+                    (-math.inf,),
+                    lambda label, l: (max(label[0], -width(l)),),
+                    lambda u, v, l: width(l) > 0.0)
+            except nx.NetworkXNoPath:
+                break
+            share: float = min(remaining, min(width(l) for l in path))
+            for l in path:
+                residual[l] = residual.get(l, l.available_throughput) - share
+            split.append((path, share))
+            remaining -= share
+        if (remaining > 0.0):
+            raise nx.NetworkXNoPath(
+                f"The workflow of {network_device.name} does not fit in "
+                f"{max_paths} paths to {gateway.name}.")
+        return split
+
+    def assign_multipath_to_device(
+            self,
+            device: NetworkDevice,
+            split: list[tuple[list[NetworkLink], float]]) -> bool:
+        """Given several paths and the throughput to allocate along each
+        one, tries to allocate the resources for the NetworkDevice's
+        workflow in all the NetworkLinks. The throughput that each
+        NetworkLink needs is aggregated at once, so NetworkLinks shared
+        by several paths are checked and updated only once.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice whose workflow is
+            going to be allocated.
+            split (list[tuple[list[NetworkLink], float]]): Pairs of path
+            and throughput, e.g. the ones computed by split_flow_to_gw.
+
+        Returns:
+            bool: Whether all the paths could be allocated.
+        """
+        indices: dict[NetworkLink, int] = {}
+        for path, _ in split:
+            for l in path:
+                indices.setdefault(l, len(indices))
+        links: list[NetworkLink] = list(indices)
+        link_indices = np.fromiter(
+            (indices[l] for path, _ in split for l in path),
+            dtype=np.int64)
+        shares = np.repeat([share for _, share in split],
+                           [len(path) for path, _ in split])
+        throughputs = np.bincount(link_indices,
+                                  weights=shares,
+                                  minlength=len(links))
+        available = np.fromiter((l.available_throughput for l in links),
+                                dtype=np.float64,
+                                count=len(links))
+        paths: list[list[NetworkLink]] = [path for path, _ in split]
+        if (np.any(throughputs > available)
+            or any(device in l.routed_flows for l in links)):
+            self._notify_allocation(AllocationEventType.REJECTED,
+                                    device,
+                                    paths)
+            return False
+        for l, throughput in zip(links, throughputs.tolist()):
+            l.route_flow_share(device, throughput)
+        self._notify_allocation(AllocationEventType.ALLOCATED, device, paths)
+        return True
+
+    def _best_path_to_gw(
+            self,
+            network_device: NetworkDevice,
+            gateway: NetworkNode,
+            source_label: tuple,
+            extend: Callable[[tuple, NetworkLink], tuple],
+            routable: Callable[[NetworkNode | NetworkDevice,
+                                NetworkNode | NetworkDevice,
+                                NetworkLink], bool] = None
+            ) -> list[NetworkLink]:
+        """Modified Dijkstra's algorithm where the cost of a path is a
+        tuple compared lexicographically. Bottlenecks are stored negated
+        so that smaller labels are always better. The labels produced by
+        extend must never improve when a path is extended, otherwise the
+        result is not optimal. The search runs on the backend.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+            source_label (tuple): The label of the empty path.
+            extend (Callable[[tuple, NetworkLink], tuple]): Given the
+            label of a path and a NetworkLink, returns the label of the
+            path extended with the NetworkLink.
+            routable (Callable, optional): Given the source, the
+            destination and the NetworkLink of an edge, returns whether
+            the edge can be used. Defaults to the edges that can provide
+            with the NetworkDevice's throughput_req (see is_routable),
+            counting the throughput it currently uses as available.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput.
+
+        Returns:
+            list[NetworkLink]: The path, in the same format as
+            shortest_path_to_gw.
+        """
+        if (routable == None):
+            throughput_req: float = network_device.throughput_req
+            routable = lambda u, v, l: self.is_routable(
+                u,
+                v,
+                l,
+                throughput_req - l.allocation(network_device))
+        return self.path_links(self._backend.best_path(network_device,
+                                                       gateway,
+                                                       source_label,
+                                                       extend,
+                                                       routable))
+
+    def path_delay(self, path: list[NetworkLink]) -> float:
+        """Returns the delay of the requests along a path. When the
+        path lists both directions of every hop, as the ones returned by
+        shortest_path_to_gw do, only the first NetworkLink of each pair
+        is counted.
+
+        Args:
+            path (list[NetworkLink]): The path.
+
+        Returns:
+            float: The delay expressed in ms.
+        """
+        if (len(path) > 1 and self._reverse_links.get(path[0]) is path[1]):
+            path = path[::2]
+        return sum(l.delay for l in path)
+
+    def path_links(self,
+                   path_nodes: list[NetworkNode | NetworkDevice]
+                   ) -> list[NetworkLink]:
+        """Given the sequence of nodes of a path, returns the
+        NetworkLinks that the requests and the responses go through, in
+        the same format as shortest_path_to_gw: for each hop, the
+        NetworkLink in the direction of the path followed by the one in
+        the opposite direction.
+
+        Args:
+            path_nodes (list[NetworkNode | NetworkDevice]): The nodes of
+            the path.
+
+        Returns:
+            list[NetworkLink]: The NetworkLinks of the path.
+        """
         links = []
-        for u, v in shortest_path_pairs:
+        for u, v in zip(path_nodes[0:-1], path_nodes[1:]):
             links.append(self.get_edge_data(u, v)["data"])
             links.append(self.get_edge_data(v, u)["data"])
-
         return links
 
+    def is_routable(self,
+                    u: NetworkNode | NetworkDevice,
+                    v: NetworkNode | NetworkDevice,
+                    link: NetworkLink,
+                    throughput_req: float) -> bool:
+        """Checks whether the given edge can provide with the given
+        throughput. The links that connect NetworkDevices to the Network
+        are always considered routable.
+
+        Args:
+            u (NetworkNode | NetworkDevice): The source of the edge.
+            v (NetworkNode | NetworkDevice): The destination of the edge.
+            link (NetworkLink): The NetworkLink of the edge.
+            throughput_req (float): The throughput that the NetworkLink
+            must be able to provide.
+
+        Returns:
+            bool: Whether the edge can be part of a path.
+        """
+        if (isinstance(u, NetworkDevice) or isinstance(v, NetworkDevice)):
+            return True
+        return link.available_throughput >= throughput_req
+
+    def k_shortest_paths_to_gw(
+            self,
+            network_device: NetworkDevice,
+            gateway: NetworkNode,
+            k: int) -> list[list[ExtendedNetworkLink]]:
+        """Calculates up to k loopless paths with enough throughput
+        between the given NetworkDevice and the given Gateway, sorted by
+        increasing delay (Yen's algorithm, with its searches run on the
+        backend). The throughput that the NetworkDevice is currently
+        using is considered available, so that its current path is among
+        the candidates.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the paths start.
+            gateway (NetworkNode): The NetworkNode where the paths end.
+            k (int): The maximum number of paths to return.
+
+        Returns:
+            list[list[ExtendedNetworkLink]]: The candidate paths, each
+            one as the sequence of ExtendedNetworkLinks that lead from
+            the NetworkDevice to the gateway. Empty if there is no path.
+        """
+        throughput_req: float = network_device.throughput_req
+        extend = lambda label, l: (label[0] + l.delay,)
+
+        def spur_path(source: NetworkNode | NetworkDevice,
+                      removed_nodes: set,
+                      removed_edges: set) -> list | None:
+            # Yen's searches skip the pruned nodes and edges through
+            # routable, so they run on the backend without copying it
+            routable = lambda u, v, l: (
+                v not in removed_nodes
+                and (u, v) not in removed_edges
+                and self.is_routable(
+                    u,
+                    v,
+                    l,
+                    throughput_req - l.allocation(network_device)))
+            try:
+                return self._backend.best_path(source,
+                                               gateway,
+                                               (0.0,),
+                                               extend,
+                                               routable)
+            except nx.NetworkXNoPath:
+                return None
+
+        first_path: list | None = spur_path(network_device, set(), set())
+        if (first_path == None):
+            return []
+        paths_nodes: list[list] = [first_path]
+        seen: set[tuple] = {tuple(first_path)}
+        sequence = count()
+        # Heap of (delay, sequence number, nodes) of the candidates
+        candidates: list = []
+        while (len(paths_nodes) < k):
+            last_path: list = paths_nodes[-1]
+            for i in range(len(last_path) - 1):
+                root: list = last_path[:i + 1]
+                removed_edges: set = {
+                    (path[i], path[i + 1]) for path in paths_nodes
+                    if (path[:i + 1] == root)}
+                spur: list | None = spur_path(root[-1],
+                                              set(root[:-1]),
+                                              removed_edges)
+                if (spur == None):
+                    continue
+                candidate: list = root[:-1] + spur
+                if (tuple(candidate) not in seen):
+                    seen.add(tuple(candidate))
+                    delay: float = sum(
+                        self[u][v]["data"].delay
+                        for u, v in zip(candidate[0:-1], candidate[1:]))
+                    heapq.heappush(candidates,
+                                   (delay, next(sequence), candidate))
+            if (len(candidates) == 0):
+                break
+            paths_nodes.append(heapq.heappop(candidates)[2])
+        return [[(u, v, self[u][v])
+                 for u, v in zip(path_nodes[0:-1], path_nodes[1:])]
+                for path_nodes in paths_nodes]
+
     def assign_path_to_device(self,
                               device: NetworkDevice,
                               path: list[NetworkLink]) -> bool:
@@ -212,9 +907,13 @@ class Network(nx.DiGraph):
         #         pruned_path.append(l)
         for l in path:
             if (not l.can_route_flow(device)):
+                self._notify_allocation(AllocationEventType.REJECTED,
+                                        device,
+                                        [path])
                 return False
         for l in path:
             l.route_new_flow(device)
+        self._notify_allocation(AllocationEventType.ALLOCATED, device, [path])
         return True
 
     def get_path_device(self, device: NetworkDevice) -> list[NetworkLink]:
@@ -253,8 +952,11 @@ class Network(nx.DiGraph):
         #                    or isinstance(v, NetworkDevice)
         #     if (not is_edge_link and l in path):
         #         pruned_path.append(l)
-        for l in path:
-            l.remove_flow(device)
+        freed: list[NetworkLink] = [l for l in path if (l.remove_flow(device))]
+        if (len(freed) > 0):
+            self._notify_allocation(AllocationEventType.FREED,
+                                    device,
+                                    [freed])
 
     def get_next_link(self,
                       link: ExtendedNetworkLink) -> list[ExtendedNetworkLink]:
@@ -270,19 +972,32 @@ class Network(nx.DiGraph):
             NetworkLinks that can be selected to build the path.
         """
         dst_node: NetworkNode = link[1]
-        gw: NetworkNode = self._gateways[0]
 
-        possible_links: list[ExtendedNetworkLink] = list(self.out_edges(
-            dst_node,
-            data=True))
+        possible_links: list[ExtendedNetworkLink] =\
+            self._backend.out_edges(dst_node)
         prunned_links: list[ExtendedNetworkLink] = []
-        max_path_legth: int = nx.shortest_path_length(self, dst_node, gw)
+        max_path_legth: float = self.hops_to_gw(dst_node)
         for (u, v, l) in possible_links:
-            path_length: int = nx.shortest_path_length(self, v, gw)
+            path_length: float = self.hops_to_gw(v)
             if (path_length <= max_path_legth):
                 prunned_links.append((u, v, l))
         return prunned_links
 
+    def hops_to_gw(self, node: NetworkNode | NetworkDevice) -> float:
+        """Returns the number of hops between the given node and the
+        first Gateway.
+
+        Args:
+            node (NetworkNode | NetworkDevice): The node.
+
+        Raises:
+            nx.NetworkXNoPath: If the Gateway cannot be reached.
+
+        Returns:
+            float: The number of hops.
+        """
+        return self._backend.hops_to_gw(node, self._gateways[0])
+
     def generate_uav_event(self, seed: int = None) -> NetworkDevice:
         """Generates a pseudorandom UAV related event. These kind of
         events consist on an UAV moving from one AP to another. This
@@ -290,7 +1005,9 @@ class Network(nx.DiGraph):
         instantaneously.
 
         Args:
-            seed (int, optional): The seed to guarantee reproducibility.
+            seed (int, optional): The seed with which the generator of
+            the Network is reseeded, in place, to guarantee
+            reproducibility.
             Defaults to None.
 
         Returns:
@@ -298,136 +1015,791 @@ class Network(nx.DiGraph):
         """
 
         if (seed != None):
-            random.seed(seed)
+            self._random.seed(seed)
         # Choose the UAV to move
-        random_uav_index: int = random.randint(0, len(self._uavs) - 1)
+        random_uav_index: int = self._random.integers(len(self._uavs))
+        self._clock += 1
         random_uav: NetworkDevice = self._uavs[random_uav_index]
         random_uav.is_active = True
-        # Remove its current NetworkLinks
-        in_link = list(self.in_edges(random_uav, data = True))[0]
-        current_ap: NetworkDevice = in_link[0]
-        out_link = list(self.out_edges(random_uav, data = True))[0]
-        self.remove_edge(in_link[0], in_link[1])
-        self.remove_edge(out_link[0], out_link[1])
-        # Choose an AP to connect the UAV to
-        random_ap_index: int = random.randint(0, len(self._access_points) - 2)
-        aps = list(set(self._access_points) - set([current_ap]))
-        random_ap: NetworkNode = aps[random_ap_index]
-        # Add the new NetworkLinks
-        in_network_link: NetworkLink = in_link[2]["data"]
-        out_network_link: NetworkLink = out_link[2]["data"]
-        in_network_link.name =\
-            f"{random_uav.name} | {random_ap.name}"
-        out_network_link.name =\
-            f"{random_ap.name} | {random_uav.name}"
-        self.add_edges_from([(random_uav,
-                              random_ap,
-                              {"data": in_network_link})])
-        self.add_edges_from([(random_ap,
-                              random_uav,
-                              {"data": out_network_link})])
+        if (self._mobility == MobilityMode.TRAJECTORY):
+            self.move_uav(random_uav, self._next_waypoint(random_uav))
+            return random_uav
+        # Choose an AP other than the current one without building the
+        # list of candidates: draw among n-1 indexes and skip the current
+        current_ap_index: int =\
+            self._ap_index[self._uav_attachments[random_uav][0]]
+        random_ap_index: int =\
+            self._random.integers(len(self._access_points) - 1)
+        if (random_ap_index >= current_ap_index):
+            random_ap_index += 1
+        self.handover_uav(random_uav, self._access_points[random_ap_index])
         return random_uav
 
+    def set_uav_trajectory(self,
+                           uav: NetworkDevice,
+                           waypoints: list[tuple[float, float]]) -> None:
+        """Sets the positions that the UAV visits, in order and
+        cyclically, when UAV events are generated in
+        MobilityMode.TRAJECTORY.
+
+        Args:
+            uav (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.UAV.
+            waypoints (list[tuple[float, float]]): The positions of the
+            trajectory.
+        """
+        self._trajectories[uav] = list(waypoints)
+        self._trajectory_steps[uav] = 0
+
+    def _next_waypoint(self, uav: NetworkDevice) -> tuple[float, float]:
+        """Returns the next position of the UAV. It is taken from its
+        trajectory or, if it has none, drawn uniformly within the area
+        covered by the APs.
+
+        Args:
+            uav (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.UAV.
+
+        Returns:
+            tuple[float, float]: The next position of the UAV.
+        """
+        waypoints = self._trajectories.get(uav)
+        if (waypoints):
+            step: int = self._trajectory_steps[uav]
+            self._trajectory_steps[uav] = (step + 1) % len(waypoints)
+            return waypoints[step]
+        (min_x, min_y), (max_x, max_y) = self._ap_bounds
+        return (self._random.uniform(min_x, max_x),
+                self._random.uniform(min_y, max_y))
+
+    def nearest_ap(self, position: tuple[float, float]) -> NetworkNode:
+        """Returns the AP that is closest to the given position.
+
+        Args:
+            position (tuple[float, float]): The position.
+
+        Returns:
+            NetworkNode: The closest NetworkNode of type
+            NetworkNodeType.AP.
+        """
+        return self._ap_grid.nearest(position)
+
+    def move_uav(self,
+                 uav: NetworkDevice,
+                 position: tuple[float, float]) -> bool:
+        """Moves the UAV to the given position and connects it to the
+        nearest AP.
+
+        Args:
+            uav (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.UAV that moves.
+            position (tuple[float, float]): The new position of the UAV.
+
+        Returns:
+            bool: Whether the UAV changed its AP.
+        """
+        uav.position = position
+        ap: NetworkNode = self.nearest_ap(position)
+        if (ap is self.attached_ap(uav)):
+            return False
+        self.handover_uav(uav, ap)
+        return True
+
+    def attached_ap(self, uav: NetworkDevice) -> NetworkNode:
+        """Returns the AP to which the given UAV is connected. Cameras
+        are also accepted.
+
+        Args:
+            uav (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.UAV.
+
+        Returns:
+            NetworkNode: The NetworkNode of type NetworkNodeType.AP.
+        """
+        if (uav in self._uav_attachments):
+            return self._uav_attachments[uav][0]
+        return next(iter(self[uav]))
+
+    def handover_uav(self, uav: NetworkDevice, ap: NetworkNode) -> None:
+        """Disconnects the UAV from its current AP and connects it to
+        the given one. The NetworkLinks of the UAV are reused, so the
+        swap takes constant time.
+
+        Args:
+            uav (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.UAV that moves.
+            ap (NetworkNode): The NetworkNode of type NetworkNodeType.AP
+            to connect the UAV to.
+        """
+        current_ap, up_link, down_link = self._uav_attachments[uav]
+        if (current_ap is ap):
+            return
+        self.remove_edge(uav, current_ap)
+        self.remove_edge(current_ap, uav)
+        up_link.name = f"{uav.name} | {ap.name}"
+        down_link.name = f"{ap.name} | {uav.name}"
+        self.add_edge(uav, ap, data=up_link)
+        self.add_edge(ap, uav, data=down_link)
+        self._uav_attachments[uav] = (ap, up_link, down_link)
+        self._backend.handover(uav, current_ap, ap)
+        for callback in self._handover_subscribers:
+            callback(uav, current_ap, ap)
+
     def generate_cam_event(self, seed: int = None) -> NetworkDevice | None:
         """Generates a pseudorandom camera related event. These kind of
         events consist on a camera starting a video streaming, thus the
         need to allocate resources for the workflow arises.
 
         Args:
-            seed (int, optional): The seed to guarantee reproducibility.
+            seed (int, optional): The seed with which the generator of
+            the Network is reseeded, in place, to guarantee
+            reproducibility.
             Defaults to None.
         Returns:
-            NetworkDevice | None: _description_
+            NetworkDevice | None: The camera that started, or None if
+            all cameras were already streaming.
         """
+        if (seed != None):
+            self._random.seed(seed)
+        self._clock += 1
+        if (not self.has_inactive_cams):
+            return None
         # Choose a random inactive Camera to start streaming
-        inactive_cams: list[NetworkDevice] = list(filter(
-            lambda cam: cam.is_active == False,
-            self._cams))
-        random_cam_index: int = random.randint(0, len(inactive_cams)-1)
-        random_cam: NetworkDevice = inactive_cams[random_cam_index]
-        random_cam.is_active = True
+        random_cam: NetworkDevice = self._inactive_cams.sample(self._random)
+        duration: float | None = None
+        if (self._cam_mean_duration != None):
+            duration = -self._cam_mean_duration\
+                * math.log(1.0 - self._random.random())
+        self.start_cam(random_cam, duration)
         return random_cam
 
+    def generate_cam_stop_event(self) -> NetworkDevice | None:
+        """Generates a pseudorandom camera related event that consists
+        on a random active camera ending its video streaming.
+
+        Returns:
+            NetworkDevice | None: The camera that stopped, or None if no
+            camera was streaming.
+        """
+        self._clock += 1
+        if (len(self._active_cams) == 0):
+            return None
+        random_cam: NetworkDevice = self._active_cams.sample(self._random)
+        self.stop_cam(random_cam)
+        return random_cam
+
+    def start_cam(self, cam: NetworkDevice, duration: float = None) -> None:
+        """Sets the camera as active. Its workflow still has to be
+        routed.
+
+        Args:
+            cam (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.CAM.
+            duration (float, optional): The number of generated events
+            after which the camera stops, see expire_cams. If None, it
+            streams until it is stopped. Defaults to None.
+        """
+        cam.is_active = True
+        self._inactive_cams.remove(cam)
+        self._active_cams.add(cam)
+        self._cam_sessions[cam] = self._cam_sessions.get(cam, 0) + 1
+        if (duration != None):
+            self._cam_stop_times[cam] = self._clock + duration
+            heapq.heappush(self._cam_stops,
+                           (self._cam_stop_times[cam], cam.id, cam))
+
+    def cam_session(self, cam: NetworkDevice) -> int:
+        """Returns the number of times a camera has started streaming,
+        which identifies its current streaming, so that the events
+        scheduled for a previous one can be told apart.
+
+        Args:
+            cam (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.CAM.
+
+        Returns:
+            int: The number of streamings started so far.
+        """
+        return self._cam_sessions.get(cam, 0)
+
+    def stop_cam(self, cam: NetworkDevice) -> None:
+        """Sets the camera as inactive and releases the resources
+        allocated for its workflow.
+
+        Args:
+            cam (NetworkDevice): The NetworkDevice of type
+            NetworkDeviceType.CAM.
+        """
+        self.free_path_device(cam, self.get_path_device(cam))
+        cam.is_active = False
+        self._active_cams.remove(cam)
+        self._inactive_cams.add(cam)
+        self._cam_stop_times.pop(cam, None)
+
+    def expire_cams(self) -> list[NetworkDevice]:
+        """Stops the cameras whose streaming duration has elapsed.
+
+        Returns:
+            list[NetworkDevice]: The cameras that stopped.
+        """
+        stopped: list[NetworkDevice] = []
+        while (len(self._cam_stops) > 0
+               and self._cam_stops[0][0] <= self._clock):
+            stop_time, _, cam = heapq.heappop(self._cam_stops)
+            # Stops of cameras that were stopped (and maybe restarted) in
+            # the meantime are stale
+            if (self._cam_stop_times.get(cam) == stop_time):
+                self.stop_cam(cam)
+                stopped.append(cam)
+        return stopped
+
+    def hard_reset(self) -> None:
+        """Releases the resources allocated in all the NetworkLinks and
+        sets all the NetworkDevices as inactive.
+        """
+        freed: dict[NetworkDevice, list[NetworkLink]] = {}
+        for l in self._network_links:
+            for d in list(l.routed_flows):
+                l.remove_flow(d)
+                freed.setdefault(d, []).append(l)
+        for d, links in freed.items():
+            self._notify_allocation(AllocationEventType.FREED, d, [links])
+        for d in self._network_devices:
+            d.is_active = False
+        self._active_cams.clear()
+        self._inactive_cams = IndexedSet(self._cams)
+        self._cam_stops.clear()
+        self._cam_stop_times.clear()
+
+    def set_background_load(self, link: NetworkLink, load: float) -> bool:
+        """Reserves part of the throughput of a NetworkLink for traffic
+        that is not generated by the NetworkDevices. The new load
+        replaces the previous background load of the NetworkLink.
+
+        Args:
+            link (NetworkLink): The NetworkLink.
+            load (float): The throughput to reserve expressed in Gb/s.
+
+        Returns:
+            bool: Whether the new load fits in the NetworkLink.
+        """
+        delta: float = load - self._background_loads.get(link, 0.0)
+        new_available_throughput = link.available_throughput - delta
+        if ((new_available_throughput < 0.0)
+            or (new_available_throughput > link.max_throughput)):
+            return False
+        link.available_throughput = new_available_throughput
+        self._background_loads[link] = load
+        return True
+
+    def link_tier(self, link: NetworkLink) -> NetworkLinkTier:
+        """Returns the tier of the Network the NetworkLink belongs to.
+
+        Args:
+            link (NetworkLink): The NetworkLink.
+
+        Returns:
+            NetworkLinkTier: The tier of the NetworkLink.
+        """
+        return self._link_tiers[link]
+
+    def tier_utilization(self, tier: NetworkLinkTier) -> float:
+        """Returns the fraction of the throughput of a tier that is in
+        use, in constant time.
+
+        Args:
+            tier (NetworkLinkTier): The tier.
+
+        Returns:
+            float: The throughput in use divided by the maximum
+            throughput of all the NetworkLinks of the tier.
+        """
+        if (self._tier_capacities[tier] == 0.0):
+            return 0.0
+        return self._tier_loads[tier] / self._tier_capacities[tier]
+
+    def most_loaded_links(self,
+                          k: int = 1) -> list[tuple[NetworkLink, float]]:
+        """Returns the NetworkLinks with the highest utilization. Only
+        the top of the heap of utilizations is inspected.
+
+        Args:
+            k (int, optional): The number of NetworkLinks. Defaults to
+            1.
+
+        Returns:
+            list[tuple[NetworkLink, float]]: Up to k pairs of
+            NetworkLink and utilization, sorted by decreasing
+            utilization. Idle NetworkLinks are not included.
+        """
+        top: list[tuple[float, int, int, NetworkLink]] = []
+        while (len(self._loaded_links) > 0 and len(top) < k):
+            entry = heapq.heappop(self._loaded_links)
+            if (entry[2] == self._link_versions[entry[3]]):
+                top.append(entry)
+        for entry in top:
+            heapq.heappush(self._loaded_links, entry)
+        return [(l, -neg_utilization)
+                for (neg_utilization, _, _, l) in top]
+
+    def ap_capacity(self, ap: NetworkNode) -> float:
+        """Returns the largest throughput that a new workflow could get
+        between the AP and a Gateway, i.e. the bottleneck of the widest
+        path in both directions (see bottleneck_widths).
+
+        Args:
+            ap (NetworkNode): The NetworkNode of type NetworkNodeType.AP.
+
+        Returns:
+            float: The capacity of the AP expressed in Gb/s.
+        """
+        return self.bottleneck_widths().get(ap, 0.0)
+
+    def bottleneck_widths(self) -> dict[NetworkNode, float]:
+        """Returns, for every NetworkNode that can reach a Gateway, the
+        bottleneck of the widest path towards it. The width of an edge
+        is the least available throughput of its two directions, since
+        workflows are routed both ways. The widths are computed at once
+        with a modified Dijkstra's search that starts from the Gateways,
+        in O(E log V), only the first time. From then on they are kept
+        up to date as the NetworkLinks change, so the calls to this
+        method, ap_capacity and can_admit are a lookup. The update
+        searches again only the NetworkNodes whose width can change:
+        those that reach the Gateways through an edge of the tree of
+        widest paths that narrows below their width, or whose path
+        improves through an edge that widens. Changes of access
+        NetworkLinks and of edges out of the tree that do not widen
+        them are free.
+
+        Returns:
+            dict[NetworkNode, float]: The widths expressed in Gb/s,
+            infinite for the Gateways.
+        """
+        if (self._bottleneck_widths == None):
+            self._bottleneck_widths, self._bottleneck_parents =\
+                self._backend.bottleneck_tree(self._gateways)
+        return self._bottleneck_widths
+
+    def can_admit(self,
+                  device: NetworkDevice,
+                  ap: NetworkNode = None) -> bool:
+        """Checks, without searching for a path, whether there is room
+        for the NetworkDevice's workflow between the AP and a Gateway.
+        The throughput that the NetworkDevice is currently using is
+        considered in use.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice.
+            ap (NetworkNode, optional): The AP through which the
+            NetworkDevice would connect. Defaults to the one it is
+            connected to.
+
+        Returns:
+            bool: Whether the workflow of the NetworkDevice fits.
+        """
+        if (ap == None or ap is self.attached_ap(device)):
+            ap = self.attached_ap(device)
+            up_link: NetworkLink = self[device][ap]["data"]
+            down_link: NetworkLink = self[ap][device]["data"]
+            if (min(up_link.available_throughput,
+                    down_link.available_throughput) < device.throughput_req):
+                return False
+        return self.ap_capacity(ap) >= device.throughput_req
+
+    def _classify_link(self,
+                       u: NetworkNode | NetworkDevice,
+                       v: NetworkNode | NetworkDevice) -> NetworkLinkTier:
+        """Returns the tier of the NetworkLink between u and v.
+
+        Args:
+            u (NetworkNode | NetworkDevice): The source of the link.
+            v (NetworkNode | NetworkDevice): The destination of the
+            link.
+
+        Returns:
+            NetworkLinkTier: The tier of the NetworkLink.
+        """
+        if (isinstance(u, NetworkDevice) or isinstance(v, NetworkDevice)):
+            return NetworkLinkTier.ACCESS
+        node_types = {u.node_type, v.node_type}
+        if (NetworkNodeType.GW in node_types):
+            return NetworkLinkTier.BACKHAUL
+        if (NetworkNodeType.AP in node_types):
+            return NetworkLinkTier.EDGE
+        return NetworkLinkTier.CORE
+
+    def subscribe(self, callback: Callable[[NetworkLink], None]) -> None:
+        """Registers a function that is called with every NetworkLink
+        whose available throughput, workflows or delay change, so that
+        structures derived from the state of the NetworkLinks can be
+        updated incrementally.
+
+        Args:
+            callback (Callable[[NetworkLink], None]): The function.
+        """
+        self._link_subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[NetworkLink], None]) -> bool:
+        """Unregisters a function registered with subscribe.
+
+        Args:
+            callback (Callable[[NetworkLink], None]): The function.
+
+        Returns:
+            bool: Whether the function was registered.
+        """
+        if (callback in self._link_subscribers):
+            self._link_subscribers.remove(callback)
+            return True
+        return False
+
+    def subscribe_allocations(
+            self,
+            callback: Callable[[AllocationEventType,
+                                NetworkDevice,
+                                list[list[NetworkLink]]], None]) -> None:
+        """Registers a function that is called every time the
+        resources of a NetworkDevice's workflow are allocated, rejected
+        or freed, with the type of event, the NetworkDevice and its
+        paths (several when the workflow is split).
+
+        Args:
+            callback (Callable): The function.
+        """
+        self._allocation_subscribers.append(callback)
+
+    def unsubscribe_allocations(
+            self,
+            callback: Callable[[AllocationEventType,
+                                NetworkDevice,
+                                list[list[NetworkLink]]], None]) -> bool:
+        """Unregisters a function registered with
+        subscribe_allocations.
+
+        Args:
+            callback (Callable): The function.
+
+        Returns:
+            bool: Whether the function was registered.
+        """
+        if (callback in self._allocation_subscribers):
+            self._allocation_subscribers.remove(callback)
+            return True
+        return False
+
+    def subscribe_handovers(
+            self,
+            callback: Callable[[NetworkDevice, NetworkNode, NetworkNode],
+                               None]) -> None:
+        """Registers a function that is called every time a UAV is
+        handed over, with the UAV, the AP it leaves and the AP it is
+        connected to. The NetworkLinks of the UAV are kept, so the
+        function is the only way to know that their ends changed.
+
+        Args:
+            callback (Callable): The function.
+        """
+        self._handover_subscribers.append(callback)
+
+    def unsubscribe_handovers(
+            self,
+            callback: Callable[[NetworkDevice, NetworkNode, NetworkNode],
+                               None]) -> bool:
+        """Unregisters a function registered with subscribe_handovers.
+
+        Args:
+            callback (Callable): The function.
+
+        Returns:
+            bool: Whether the function was registered.
+        """
+        if (callback in self._handover_subscribers):
+            self._handover_subscribers.remove(callback)
+            return True
+        return False
+
+    def _notify_allocation(self,
+                           event_type: AllocationEventType,
+                           device: NetworkDevice,
+                           paths: list[list[NetworkLink]]) -> None:
+        """Calls the functions registered with subscribe_allocations.
+
+        Args:
+            event_type (AllocationEventType): What happened.
+            device (NetworkDevice): The NetworkDevice.
+            paths (list[list[NetworkLink]]): Its paths.
+        """
+        for callback in self._allocation_subscribers:
+            callback(event_type, device, paths)
+
+    def track_dirty_links(self) -> set[NetworkLink]:
+        """Creates a set to which every NetworkLink that changes is
+        added. The consumer recomputes what depends on the NetworkLinks
+        in the set when it needs to and then clears it, which is cheaper
+        than a callback per change when changes are frequent and
+        queries are not.
+
+        Returns:
+            set[NetworkLink]: The set of the NetworkLinks that changed,
+            initially empty.
+        """
+        dirty_links: set[NetworkLink] = set()
+        self._dirty_link_sets.append(dirty_links)
+        return dirty_links
+
+    def untrack_dirty_links(self, dirty_links: set[NetworkLink]) -> bool:
+        """Stops updating a set created by track_dirty_links.
+
+        Args:
+            dirty_links (set[NetworkLink]): The set.
+
+        Returns:
+            bool: Whether the set was being updated.
+        """
+        for i, tracked in enumerate(self._dirty_link_sets):
+            if (tracked is dirty_links):
+                del self._dirty_link_sets[i]
+                return True
+        return False
+
+    def _on_link_change(self, link: NetworkLink) -> None:
+        """Updates the aggregates and notifies the subscribers when a
+        NetworkLink changes.
+
+        Args:
+            link (NetworkLink): The NetworkLink that changed.
+        """
+        self._update_link_stats([link])
+        self._backend.link_changed(link)
+        for dirty_links in self._dirty_link_sets:
+            dirty_links.add(link)
+        for callback in self._link_subscribers:
+            callback(link)
+
+    def _update_link_stats(self, links: list[NetworkLink]) -> None:
+        """Updates the aggregates of the throughput in use after the
+        given NetworkLinks have changed.
+
+        Args:
+            links (list[NetworkLink]): The NetworkLinks that changed.
+        """
+        for l in links:
+            load: float = l.max_throughput - l.available_throughput
+            tier: NetworkLinkTier = self._link_tiers[l]
+            old_load: float = self._link_loads.get(l, 0.0)
+            self._tier_loads[tier] += load - old_load
+            self._link_loads[l] = load
+            version: int = self._link_versions.get(l, 0) + 1
+            self._link_versions[l] = version
+            if (load > 0.0):
+                heapq.heappush(self._loaded_links,
+                               (-load / l.max_throughput, l.id, version, l))
+            if (tier != NetworkLinkTier.ACCESS
+                and self._bottleneck_widths != None):
+                self._update_widths(l, l.max_throughput - old_load)
+        # Drop the outdated entries before the heap grows unbounded
+        if (len(self._loaded_links) > 4 * len(self._network_links)):
+            self._loaded_links = [
+                e for e in self._loaded_links
+                if (e[2] == self._link_versions[e[3]])]
+            heapq.heapify(self._loaded_links)
+
+    def _edge_width(self, u: NetworkNode, v: NetworkNode) -> float:
+        """Returns the width of the edge between two NetworkNodes: the
+        least available throughput of its two directions, or 0 if it
+        only goes one way.
+
+        Args:
+            u (NetworkNode): The source of the edge.
+            v (NetworkNode): The destination of the edge.
+
+        Returns:
+            float: The width expressed in Gb/s.
+        """
+        link: NetworkLink = self[u][v]["data"]
+        reverse: NetworkLink | None = self._reverse_links.get(link)
+        if (reverse == None):
+            return 0.0
+        return min(link.available_throughput, reverse.available_throughput)
+
+    def _update_widths(self,
+                       link: NetworkLink,
+                       old_available_throughput: float) -> None:
+        """Updates the cached bottleneck widths after the available
+        throughput of a NetworkLink has changed. Narrowing an edge only
+        affects the NetworkNodes that reach the Gateways through it in
+        the tree of widest paths, and widening an edge only affects the
+        NetworkNodes whose path improves through it.
+
+        Args:
+            link (NetworkLink): The NetworkLink that changed.
+            old_available_throughput (float): Its previous available
+            throughput.
+        """
+        u, v = self._link_endpoints[link]
+        reverse: NetworkLink | None = self._reverse_links.get(link)
+        if (reverse == None):
+            return
+        old_width: float = min(old_available_throughput,
+                               reverse.available_throughput)
+        new_width: float = self._edge_width(u, v)
+        if (new_width > old_width):
+            self._widen(u, v)
+            self._widen(v, u)
+        elif (new_width < old_width):
+            for node in (u, v):
+                parent: NetworkLink | None =\
+                    self._bottleneck_parents.get(node)
+                if ((parent is link or parent is reverse)
+                    and new_width < self._bottleneck_widths[node]):
+                    self._narrow(node)
+
+    def _widen(self, node: NetworkNode, neighbor: NetworkNode) -> None:
+        """Propagates the improvement of the widths that a wider edge
+        between a NetworkNode and its neighbor brings, if any.
+
+        Args:
+            node (NetworkNode): The NetworkNode whose path may improve.
+            neighbor (NetworkNode): The neighbor through which it would.
+        """
+        widths: dict[NetworkNode, float] = self._bottleneck_widths
+        if (neighbor not in widths):
+            return
+        sequence = count()
+        # Heap of (-width, sequence number, node, link towards parent)
+        queue: list = [(-min(widths[neighbor],
+                             self._edge_width(node, neighbor)),
+                        next(sequence),
+                        node,
+                        self[node][neighbor]["data"])]
+        while (len(queue) > 0):
+            neg_width, _, n, link = heapq.heappop(queue)
+            if (-neg_width <= widths.get(n, -math.inf)):
+                continue
+            widths[n] = -neg_width
+            self._bottleneck_parents[n] = link
+            for m, attr in self.pred[n].items():
+                if (isinstance(m, NetworkDevice)):
+                    continue
+                width: float = min(-neg_width, self._edge_width(m, n))
+                if (width > widths.get(m, -math.inf)):
+                    heapq.heappush(queue,
+                                   (-width, next(sequence), m, attr["data"]))
+
+    def _narrow(self, node: NetworkNode) -> None:
+        """Computes again the widths of a NetworkNode and of the ones
+        that reach the Gateways through it, after the edge towards its
+        parent has narrowed. The search starts from the edges that leave
+        the subtree, whose other ends keep their widths.
+
+        Args:
+            node (NetworkNode): The NetworkNode.
+        """
+        widths: dict[NetworkNode, float] = self._bottleneck_widths
+        parents: dict[NetworkNode, NetworkLink] = self._bottleneck_parents
+        subtree: set[NetworkNode] = {node}
+        for n in list(parents):
+            chain: list[NetworkNode] = []
+            ancestor = n
+            while (ancestor not in subtree and ancestor in parents):
+                chain.append(ancestor)
+                ancestor = self._link_endpoints[parents[ancestor]][1]
+            if (ancestor in subtree):
+                subtree.update(chain)
+        for n in subtree:
+            del widths[n]
+            del parents[n]
+        sequence = count()
+        # Heap of (-width, sequence number, node, link towards parent)
+        queue: list = []
+        for n in subtree:
+            for m, attr in self.succ[n].items():
+                if (m in widths):
+                    queue.append((-min(widths[m], self._edge_width(n, m)),
+                                  next(sequence),
+                                  n,
+                                  attr["data"]))
+        heapq.heapify(queue)
+        while (len(queue) > 0):
+            neg_width, _, n, link = heapq.heappop(queue)
+            if (n in widths):
+                continue
+            widths[n] = -neg_width
+            parents[n] = link
+            for m, attr in self.pred[n].items():
+                if (m in subtree and m not in widths):
+                    width: float = min(-neg_width, self._edge_width(m, n))
+                    heapq.heappush(queue,
+                                   (-width, next(sequence), m, attr["data"]))
+
+    def apply_event(self, event: NetworkEvent) -> NetworkDevice | None:
+        """Applies a recorded event to the Network. UAV events and
+        camera starts activate the NetworkDevice, whose workflow then
+        needs to be routed. Camera stops deactivate it and release the
+        resources allocated for its workflow. Link load events change
+        the background load of the NetworkLink.
+
+        Args:
+            event (NetworkEvent): The event to apply.
+
+        Returns:
+            NetworkDevice | None: The NetworkDevice involved in the
+            event, None for link load events.
+        """
+        if (event.event_type == NetworkEventType.LINK_LOAD):
+            self.set_background_load(self._links_by_id[event.link_id],
+                                     event.load)
+            return None
+        device: NetworkDevice = self._devices_by_id[event.device_id]
+        if (event.event_type == NetworkEventType.UAV_POSITION):
+            self.move_uav(device, event.position)
+            device.is_active = True
+        elif (event.event_type == NetworkEventType.UAV_HANDOVER):
+            self.handover_uav(device, self._nodes_by_id[event.ap_id])
+            device.is_active = True
+        elif (event.event_type == NetworkEventType.CAM_START):
+            self.start_cam(device)
+        elif (event.event_type == NetworkEventType.CAM_STOP):
+            self.stop_cam(device)
+        return device
+
     def show_path(self, path: list[ExtendedNetworkLink]) -> None:
         """Generates a diagram that shows the NetworkLink (edges) of the
         network that connect a given NetworkDevice with a given
-        NetworkNode of NetworkNodeType AP.
+        NetworkNode of NetworkNodeType AP. Requires the optional
+        visualization dependencies (see NetworkDrawer).
 
         Args:
             path (list[ExtendedNetworkLink]): The list of NetworkLinks
             that the device's request and responses go through to reach
             the gateway.
         """
-        edges: list[ExtendedNetworkLink] = list(self.edges(data=True))
-        colors = ["#000000" for _ in list(self.edges(data=True))]
-        for l in path:
-            for i, e in enumerate(edges):
-                if (l[2]["data"].id == e[2]["data"].id):
-                    colors[i] = "#FF0000"
-        positions = {}
-        labels = {}
-        for n in self.nodes:
-            positions[n] = [n.position[1], n.position[0]]
-            labels[n] = n.name
-        nx.draw_networkx_nodes(self,
-                               pos=positions)
-        nx.draw_networkx_labels(self,
-                                pos=positions,
-                                labels=labels)
-        edge_labels = {}
-        edge_width = []
-        for (u,v,l) in self.edges(data=True):
-            data: NetworkLink = l["data"]
-            edge_labels[(u,v)] = round(data.delay, 2)
-            edge_width.append(1 + len(data.routed_flows) * 1.2)
-        nx.draw_networkx_edges(
-            self,
-            pos=positions,
-            width=edge_width,
-            arrowsize=edge_width,
-            edge_color=colors
-        )
-        nx.draw_networkx_edge_labels(
-            self,
-            pos=positions,
-            edge_labels=edge_labels)
+        self._get_drawer().show_path(path)
 
     def show_network_info(self):
         """Show the information of the network graph. For each node show
         its name and for each link, the delay that it introduces.
+        Requires the optional visualization dependencies (see
+        NetworkDrawer).
         """
-        positions = {}
-        labels = {}
-        for n in self.nodes:
-            positions[n] = [n.position[1], n.position[0]]
-            labels[n] = n.name
-        nx.draw_networkx_nodes(self,
-                               pos=positions)
-        nx.draw_networkx_labels(self,
-                                pos=positions,
-                                labels=labels)
-        edge_labels = {}
-        edge_width = []
-        for (u,v,l) in self.edges(data=True):
-            data: NetworkLink = l["data"]
-            edge_labels[(u,v)] = round(data.delay, 2)
-            edge_width.append(1 + len(data.routed_flows) * 1.2)
-        nx.draw_networkx_edges(
-            self,
-            pos=positions,
-            width=edge_width,
-            arrowsize=edge_width,
-        )
-        nx.draw_networkx_edge_labels(
-            self,
-            pos=positions,
-            edge_labels=edge_labels)
+        self._get_drawer().show_network_info()
+
+    def _get_drawer(self):
+        """Returns the NetworkDrawer of the Network, importing the
+        visualization module on the first call.
+
+        Returns:
+            NetworkDrawer: The drawer.
+        """
+        if (self._drawer == None):
+            from network_envs.visualization.NetworkDrawer import NetworkDrawer
+            self._drawer = NetworkDrawer(self)
+        return self._drawer
 
 
 
 if __name__ == "__main__":
     from pathlib import Path
-    import matplotlib.pyplot as plt
     my_net = Network(Path("/home/santiago/Documents/Trabajo/Workspace/uav-mobility-app/input/network_00.json"))
     nodes = [ n.id for n in my_net.nodes]
     positions = { n: [n._position[1], n._position[0]] for n in my_net.nodes}
@@ -1,7 +1,8 @@
 from network_envs.enums.NetworkDeviceType import NetworkDeviceType
 
 class NetworkDevice(object):
-
+    __slots__ = ("_device_id", "_device_name", "_device_type", "_delay_req",
+                 "_throughput_req", "_position", "_is_active")
 
     def __init__(self,
                  device_id: int,
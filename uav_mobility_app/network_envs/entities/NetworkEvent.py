@@ -0,0 +1,30 @@
+from typing import NamedTuple
+from network_envs.enums.NetworkEventType import NetworkEventType
+
+
+class NetworkEvent(NamedTuple):
+    """A timestamped event that changes the Network.
+
+    Attributes:
+        timestamp (float): The moment in which the event happens
+        expressed in s.
+        event_type (NetworkEventType): The type of the event.
+        device_id (int | None): The id of the NetworkDevice involved, if
+        any.
+        position (tuple[float, float] | None): The new position of the
+        UAV in events of type NetworkEventType.UAV_POSITION.
+        ap_id (int | None): The id of the AP that the UAV attaches to in
+        events of type NetworkEventType.UAV_HANDOVER.
+        link_id (int | None): The id of the NetworkLink whose background
+        load changes in events of type NetworkEventType.LINK_LOAD.
+        load (float | None): The new background load of the NetworkLink
+        expressed in Gb/s in events of type NetworkEventType.LINK_LOAD.
+    """
+
+    timestamp: float
+    event_type: NetworkEventType
+    device_id: int | None
+    position: tuple[float, float] | None = None
+    ap_id: int | None = None
+    link_id: int | None = None
+    load: float | None = None
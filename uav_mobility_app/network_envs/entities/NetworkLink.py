@@ -1,9 +1,16 @@
 
+from typing import Callable
 from network_envs.entities.NetworkDevice import NetworkDevice
-import math
+from network_envs.delay.DelayModel import DelayModel
+from network_envs.delay.ExponentialDelayModel import ExponentialDelayModel
 
-class NetworkLink(object):
+# The DelayModel shared by the NetworkLinks that are not given one
+DEFAULT_DELAY_MODEL: DelayModel = ExponentialDelayModel()
 
+class NetworkLink(object):
+    __slots__ = ("_link_id", "_link_name", "_max_throughput",
+                 "_available_throughput", "_routed_flows", "_flow_shares",
+                 "_delay", "_delay_model", "_cached_delay", "_listeners")
 
     def __init__(self,
                  link_id: int,
@@ -11,7 +18,8 @@ class NetworkLink(object):
                  max_throughput: float = 1000.0,
                  available_throughput: float = 1000.0,
                  routed_flows: list[NetworkDevice] = [],
-                 delay: float = 1.0) -> None:
+                 delay: float = 1.0,
+                 delay_model: DelayModel = None) -> None:
         """Creates a network link that connect two NetworkNodes.
 
         Args:
@@ -26,6 +34,9 @@ class NetworkLink(object):
             Defaults to 1000 Gb/s.
             delay (int, optional): The time delay that the channel
             introduces expressed in ms. Defaults to 1 ms.
+            delay_model (DelayModel, optional): How the delay grows
+            with the load. Defaults to DEFAULT_DELAY_MODEL, the
+            exponential queueing curve.
         """
         self._link_id: int = link_id
         self._link_name: str = link_name
@@ -35,7 +46,18 @@ class NetworkLink(object):
         if (available_throughput > max_throughput):
             self._available_throughput = max_throughput
         self._routed_flows: set[NetworkDevice] = set(routed_flows)
+        # The throughput allocated to each workflow routed through only
+        # part of its throughput_req (see route_flow_share). Created on
+        # first use, since most NetworkLinks never carry split workflows
+        self._flow_shares: dict[NetworkDevice, float] | None = None
         self._delay: float = delay
+        if (delay_model == None):
+            delay_model = DEFAULT_DELAY_MODEL
+        self._delay_model: DelayModel = delay_model
+        # The delay only changes with the available throughput, so it is
+        # computed when the latter changes rather than on every read
+        self._cached_delay: float = self.delay_at(self._available_throughput)
+        self._listeners: list[Callable[[NetworkLink], None]] = []
 
     @property
     def id(self) -> int:
@@ -65,6 +87,25 @@ class NetworkLink(object):
         """
         self._link_name = new_link_name
 
+    @property
+    def link_name(self) -> str:
+        """Alias of name, matching the argument of the constructor.
+
+        Returns:
+            str: The NetworkLink's name.
+        """
+        return self._link_name
+
+    @link_name.setter
+    def link_name(self, new_link_name: str) -> None:
+        """Alias of the setter of name.
+
+        Args:
+            new_link_name (str): The new descriptive name for the
+            NetworkLink.
+        """
+        self._link_name = new_link_name
+
     @property
     def max_throughput(self) -> float:
         """Returns the maximum throughput that the NetworkLink can
@@ -101,6 +142,7 @@ class NetworkLink(object):
         if (( new_available_throughput >= 0.0)\
             and (new_available_throughput <= self._max_throughput)):
             self._available_throughput = new_available_throughput
+            self._changed()
             return True
         else:
             return False
@@ -123,16 +165,80 @@ class NetworkLink(object):
         Returns:
             float: The delay that the NetworkLink introduces.
         """
-        load = (self._max_throughput - self._available_throughput)
-        load_rate = load / self._max_throughput
-
-        return (20 / math.exp(3)) * math.exp(3 * load_rate)
+        return self._cached_delay
         # queuing_delay =\
         #     (20 / math.exp(2.9957)) * math.exp(2.9957 * occupance_rate)
         # queuing_delay = max(0, len(self._routed_flows) - 1)
 
         # return self._delay + queuing_delay
 
+    def delay_at(self, available_throughput: float) -> float:
+        """Returns the delay that the NetworkLink would introduce if the
+        given throughput were available, e.g. to evaluate allocations
+        without performing them.
+
+        Args:
+            available_throughput (float): The available throughput
+            expressed in Gb/s.
+
+        Returns:
+            float: The delay that the NetworkLink would introduce.
+        """
+        load = (self._max_throughput - available_throughput)
+        load_rate = load / self._max_throughput
+
+        return self._delay_model.delay(load_rate)
+
+    @property
+    def delay_model(self) -> DelayModel:
+        """Returns how the delay of the NetworkLink grows with the load.
+
+        Returns:
+            DelayModel: The DelayModel of the NetworkLink.
+        """
+        return self._delay_model
+
+    @delay_model.setter
+    def delay_model(self, new_delay_model: DelayModel) -> None:
+        """Sets a new DelayModel and updates the delay accordingly.
+
+        Args:
+            new_delay_model (DelayModel): The new DelayModel.
+        """
+        self._delay_model = new_delay_model
+        self._changed()
+
+    def add_listener(self, listener: Callable[["NetworkLink"], None]) -> None:
+        """Registers a function that is called with the NetworkLink
+        every time its available throughput, its workflows or its delay
+        change.
+
+        Args:
+            listener (Callable[[NetworkLink], None]): The function.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self,
+                        listener: Callable[["NetworkLink"], None]) -> bool:
+        """Unregisters a function registered with add_listener.
+
+        Args:
+            listener (Callable[[NetworkLink], None]): The function.
+
+        Returns:
+            bool: Whether the function was registered.
+        """
+        if (listener in self._listeners):
+            self._listeners.remove(listener)
+            return True
+        return False
+
+    def _changed(self) -> None:
+        """Updates the cached delay and notifies the listeners."""
+        self._cached_delay = self.delay_at(self._available_throughput)
+        for listener in self._listeners:
+            listener(self)
+
     def can_route_flow(self, device: NetworkDevice) -> bool:
         """Checks whether a NetworkDevice's worflow can be routed
         through this NetworkLink.
@@ -167,8 +273,53 @@ class NetworkLink(object):
             return False
         self._routed_flows.add(device)
         self._available_throughput -= device.throughput_req
+        self._changed()
+        return True
+
+    def route_flow_share(self,
+                         device: NetworkDevice,
+                         throughput: float) -> bool:
+        """Tries to route part of a NetworkDevice's workflow through the
+        NetworkLink, when the workflow is split across several paths.
+
+        Args:
+            device (NetworkDevice): The device whose workflow is going
+            to be routed through the NetworkLink.
+            throughput (float): The throughput to allocate expressed in
+            Gb/s.
+
+        Returns:
+            bool: Wheter if the share of the workflow is routed or not.
+        """
+        if (self._available_throughput - throughput < 0):
+            return False
+        if (device in self._routed_flows):
+            return False
+        self._routed_flows.add(device)
+        if (self._flow_shares == None):
+            self._flow_shares = {}
+        self._flow_shares[device] = throughput
+        self._available_throughput -= throughput
+        self._changed()
         return True
 
+    def allocation(self, device: NetworkDevice) -> float:
+        """Returns the throughput allocated to a NetworkDevice's
+        workflow in the NetworkLink.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice.
+
+        Returns:
+            float: The allocated throughput expressed in Gb/s. 0 if the
+            workflow is not routed through the NetworkLink.
+        """
+        if (device not in self._routed_flows):
+            return 0.0
+        if (self._flow_shares == None):
+            return device.throughput_req
+        return self._flow_shares.get(device, device.throughput_req)
+
     def remove_flow(self, device: NetworkDevice) -> bool:
         """Tries to remove a NetworkDevice's workflow from the
         NetworkLink.
@@ -182,8 +333,11 @@ class NetworkLink(object):
             or not.
         """
         if (device in self._routed_flows):
+            self._available_throughput += self.allocation(device)
             self._routed_flows.remove(device)
-            self._available_throughput += device.throughput_req
+            if (self._flow_shares != None):
+                self._flow_shares.pop(device, None)
+            self._changed()
             return True
         else:
             return False
@@ -2,7 +2,7 @@ from network_envs.enums.NetworkNodeType import NetworkNodeType
 
 
 class NetworkNode(object):
-
+    __slots__ = ("_node_id", "_node_name", "_node_type", "_position")
 
     def __init__(self,
                  node_id: int,
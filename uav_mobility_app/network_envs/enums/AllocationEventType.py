@@ -0,0 +1,12 @@
+from enum import Enum
+
+class AllocationEventType(Enum):
+    """A enumeration of what can happen when the resources of a
+    NetworkDevice's workflow are managed: the path is allocated
+    (ALLOCATED), it cannot be allocated for lack of throughput
+    (REJECTED) or it is released (FREED).
+    """
+
+    ALLOCATED = 1
+    REJECTED = 2
+    FREED = 3
\ No newline at end of file
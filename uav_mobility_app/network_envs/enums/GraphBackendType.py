@@ -0,0 +1,10 @@
+from enum import Enum
+
+class GraphBackendType(Enum):
+    """A enumeration of the structures a Network runs its graph queries
+    on: the NetworkX dict-of-dicts (NETWORKX) or integer-indexed arrays
+    (ARRAY).
+    """
+
+    NETWORKX = 1
+    ARRAY = 2
\ No newline at end of file
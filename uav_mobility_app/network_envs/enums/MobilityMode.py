@@ -0,0 +1,10 @@
+from enum import Enum
+
+class MobilityMode(Enum):
+    """A enumeration of the different ways UAVs move across the Network:
+    jumping to a random AP (RANDOM) or flying along a trajectory and
+    attaching to the nearest AP (TRAJECTORY).
+    """
+
+    RANDOM = 1
+    TRAJECTORY = 2
\ No newline at end of file
@@ -0,0 +1,15 @@
+from enum import Enum
+
+class NetworkEventType(Enum):
+    """A enumeration of the different types of events that change the
+    Network: a UAV reporting its position (UAV_POSITION), a UAV
+    attaching to an AP (UAV_HANDOVER), a camera starting (CAM_START) or
+    stopping (CAM_STOP) its video streaming and a change of the
+    background load of a NetworkLink (LINK_LOAD).
+    """
+
+    UAV_POSITION = 1
+    UAV_HANDOVER = 2
+    CAM_START = 3
+    CAM_STOP = 4
+    LINK_LOAD = 5
\ No newline at end of file
@@ -0,0 +1,13 @@
+from enum import Enum
+
+class NetworkLinkTier(Enum):
+    """A enumeration of the tiers of the Network a NetworkLink belongs
+    to: between a NetworkDevice and an AP (ACCESS), between an AP and a
+    Switch (EDGE), between two Switches (CORE) and towards a Gateway
+    (BACKHAUL).
+    """
+
+    ACCESS = 1
+    EDGE = 2
+    CORE = 3
+    BACKHAUL = 4
\ No newline at end of file
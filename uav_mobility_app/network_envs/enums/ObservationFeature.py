@@ -0,0 +1,20 @@
+from enum import Enum
+
+class ObservationFeature(Enum):
+    """A enumeration of the features that a NetworkEnv can observe for
+    every candidate NetworkLink: whether the NetworkDevice's workflow
+    is not routed through it (ROUTED), its delay (DELAY), its available
+    throughput (THROUGHPUT), the hops between its destination and the
+    Gateway (HOPS), the bottleneck of the widest continuation from its
+    destination to the Gateway (BOTTLENECK), the number of workflows
+    routed through it (FLOWS) and the delay budget that the
+    NetworkDevice would have left after taking it (DELAY_BUDGET).
+    """
+
+    ROUTED = 1
+    DELAY = 2
+    THROUGHPUT = 3
+    HOPS = 4
+    BOTTLENECK = 5
+    FLOWS = 6
+    DELAY_BUDGET = 7
\ No newline at end of file
@@ -0,0 +1,10 @@
+from enum import Enum
+
+class PathCost(Enum):
+    """A enumeration of the costs that delay-constrained routing can
+    minimize: the number of NetworkLinks where other NetworkDevices'
+    workflows would be disturbed (CHANGES) or the number of hops (HOPS).
+    """
+
+    CHANGES = 1
+    HOPS = 2
\ No newline at end of file
@@ -0,0 +1,11 @@
+from enum import Enum
+
+class ResetStrategy(Enum):
+    """A enumeration of what a NetworkEnv does periodically to undo the
+    fragmentation of the allocations: releasing all the resources
+    (HARD) or reallocating all the workflows with the GlobalOptimizer
+    (DEFRAG).
+    """
+
+    HARD = 1
+    DEFRAG = 2
\ No newline at end of file
@@ -1,5 +1,4 @@
-from typing import Any
-import random
+from typing import Any, Iterator
 import gymnasium as gym
 import numpy as np
 from pathlib import Path
@@ -11,16 +10,51 @@ from network_envs.entities.NetworkDevice import NetworkDevice
 from network_envs.entities.NetworkNode import NetworkNode
 from network_envs.entities.NetworkLink import NetworkLink
 from network_envs.enums.NetworkNodeType import NetworkNodeType
+from network_envs.enums.MobilityMode import MobilityMode
+from network_envs.enums.ResetStrategy import ResetStrategy
+from network_envs.enums.ObservationFeature import ObservationFeature
+from network_envs.delay.DelayModel import DelayModel
+from network_envs.enums.NetworkEventType import NetworkEventType
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.utils.TraceReader import TraceReader
+from network_envs.routing.GlobalOptimizer import GlobalOptimizer
+from network_envs.utils.Profiler import Profiler
+from network_envs.utils.LinkFeatureExtractor import LinkFeatureExtractor
 
 
 class NetworkEnv(gym.Env):
 
+    metadata = {"render_modes": ["human", "rgb_array"], "render_fps": 4}
+    # The methods timed while profiling, of the environment and of its
+    # Network
+    PROFILED_METHODS = ("step",
+                        "reset",
+                        "_get_obs",
+                        "_get_next_links",
+                        "_get_reward")
+    PROFILED_NETWORK_METHODS = ("get_next_link",
+                                "shortest_path_to_gw",
+                                "get_path_device",
+                                "generate_uav_event",
+                                "generate_cam_event")
+    # The features observed by default for every candidate NetworkLink
+    DEFAULT_FEATURES = (ObservationFeature.ROUTED,
+                        ObservationFeature.DELAY,
+                        ObservationFeature.THROUGHPUT)
 
     def __init__(self,
                  configuration: Path,
                  n_actions: int = 3,
                  hard_reset_period: int = 100,
-                 render_mode:str = None) -> None:
+                 render_mode:str = None,
+                 mobility: MobilityMode = MobilityMode.RANDOM,
+                 trace: Path = None,
+                 cam_mean_duration: float = None,
+                 reset_strategy: ResetStrategy = ResetStrategy.HARD,
+                 delay_model: DelayModel = None,
+                 profile: bool = False,
+                 features: tuple[ObservationFeature, ...] = DEFAULT_FEATURES
+                 ) -> None:
         """Initializaes the NetworkEnv. This method is designed to be
         callable by gym.make(...).
 
@@ -31,25 +65,80 @@ class NetworkEnv(gym.Env):
             choose at a given step. Defaults to 3.
             hard_reset_period (int): The number of episodes to carry out
             before performing a hard reset. Defaults to 100.
-            render_mode (str, optional): No use for this feature yet.
-            Defaults to None.
+            render_mode (str, optional): "rgb_array" to return the
+            frames from render() or "human" to show them in a window
+            after every reset and step (requires the optional
+            visualization dependencies). Defaults to None.
+            mobility (MobilityMode, optional): How UAVs move when a UAV
+            event is generated. Defaults to MobilityMode.RANDOM.
+            trace (Path, optional): A trace file (see TraceReader) whose
+            events are replayed, in a loop, instead of generating
+            pseudorandom ones. Defaults to None.
+            cam_mean_duration (float, optional): The mean duration of
+            the cameras' video streamings, measured in generated events.
+            If None, cameras never stop. Defaults to None.
+            reset_strategy (ResetStrategy, optional): What to do every
+            hard_reset_period episodes. With ResetStrategy.DEFRAG, the
+            workflows are reallocated by a GlobalOptimizer, and only if
+            that improves the allocation, falling back to a hard reset
+            if the reallocation fails. Defaults to ResetStrategy.HARD.
+            delay_model (DelayModel, optional): How the delay of the
+            NetworkLinks grows with their load. Defaults to the
+            exponential queueing curve.
+            profile (bool, optional): Whether to start with the hot
+            paths of the environment and its Network instrumented (see
+            set_profiling). Defaults to False.
+            features (tuple[ObservationFeature, ...], optional): The
+            features observed for every candidate NetworkLink, in the
+            order of the columns of the observations. Defaults to
+            DEFAULT_FEATURES.
+
+        Raises:
+            ValueError: If the render mode is not supported or the
+            features are empty or repeated.
         """
+        if (render_mode != None
+            and render_mode not in self.metadata["render_modes"]):
+            raise ValueError(
+                f"Unsupported render mode {render_mode}, expected one of "
+                f"{self.metadata['render_modes']}.")
+        self.render_mode: str | None = render_mode
+        # Created on the first frame, see render
+        self._renderer = None
         self._hard_reset_period = hard_reset_period
+        self._reset_strategy: ResetStrategy = reset_strategy
+        self._optimizer: GlobalOptimizer = GlobalOptimizer()
         self._hard_reset_counter = 1
-        self._network: Network = Network(configuration=configuration)
+        self._network: Network = Network(
+            configuration=configuration,
+            mobility=mobility,
+            cam_mean_duration=cam_mean_duration,
+            delay_model=delay_model)
+        self._network.rng = self.np_random
+        self._profiler: Profiler = Profiler()
         self.action_space = spaces.Discrete(n_actions,
                                             start=0)
 
-        self._obs_space = spaces.Box(low=np.array([0.0, 0.0, 0.0]),
-                                      high=np.array([1.0+1.0,
-                                                     20.0+1.0,
-                                                     1000.0]),
-                                      shape=(3,))
+        # The delay of a full NetworkLink bounds the observed delays
+        max_delay: float = max(20.0, self._network.delay_model.delay(1.0))
+        self._feature_extractor: LinkFeatureExtractor = LinkFeatureExtractor(
+            self._network,
+            features,
+            max_delay)
+        self._obs_space = spaces.Box(low=self._feature_extractor.low,
+                                     high=self._feature_extractor.high,
+                                     shape=(len(features),))
         self.observation_space =\
             spaces.Tuple((self._obs_space for _ in range(n_actions)))
         self.observation_space = flatten_space(self.observation_space)
+        self._trace: TraceReader | None = None
+        if (trace != None):
+            self._trace = TraceReader(trace)
+        self._trace_events: Iterator[NetworkEvent] | None = None
         self._dev: NetworkDevice = None
         self._path: list[ExtendedNetworkLink] = []
+        if (profile):
+            self.set_profiling(True)
 
     @property
     def network(self) -> Network:
@@ -60,6 +149,56 @@ class NetworkEnv(gym.Env):
         """
         return self._network
 
+    @property
+    def profiler(self) -> Profiler:
+        """Returns the Profiler of the environment, whose stats() are
+        the calls, cumulative time and percentiles of the profiled
+        methods.
+
+        Returns:
+            Profiler: The Profiler.
+        """
+        return self._profiler
+
+    def set_profiling(self, enabled: bool) -> None:
+        """Turns on or off the timing of PROFILED_METHODS and of
+        PROFILED_NETWORK_METHODS of the Network. While it is off, the
+        methods run without any instrumentation. The statistics are
+        kept until profiler.reset() is called.
+
+        Args:
+            enabled (bool): Whether to profile.
+        """
+        if (enabled):
+            self._profiler.instrument(self,
+                                      self.PROFILED_METHODS,
+                                      type(self).__name__)
+            self._profiler.instrument(self._network,
+                                      self.PROFILED_NETWORK_METHODS,
+                                      "Network")
+        else:
+            self._profiler.restore()
+
+    @property
+    def features(self) -> tuple[ObservationFeature, ...]:
+        """Returns the features observed for every candidate
+        NetworkLink.
+
+        Returns:
+            tuple[ObservationFeature, ...]: The features.
+        """
+        return self._feature_extractor.features
+
+    @property
+    def device(self) -> NetworkDevice | None:
+        """Returns the NetworkDevice routed in the current episode.
+
+        Returns:
+            NetworkDevice | None: The NetworkDevice, or None before the
+            first reset.
+        """
+        return self._dev
+
     @property
     def path(self) -> list[ExtendedNetworkLink]:
         """Returns the list of ExtendedNetworkLinks that lead
@@ -71,6 +210,46 @@ class NetworkEnv(gym.Env):
         """
         return self._path
 
+    @property
+    def next_links(self) -> list[ExtendedNetworkLink]:
+        """Returns the candidates to extend the current path, in the
+        order in which the actions select them, padded with tuples that
+        are not edges.
+
+        Returns:
+            list[ExtendedNetworkLink]: The candidate NetworkLinks.
+        """
+        return self._get_next_links()
+
+    def start_path(self, device: NetworkDevice) -> np.ndarray:
+        """Starts a path from the NetworkLink that connects a
+        NetworkDevice to the Network, outside of the episodes, so that
+        a trained agent can route it. Nothing is allocated.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice to route.
+
+        Returns:
+            np.ndarray: The observations.
+        """
+        self._dev = device
+        self._path = [next(iter(self._network.out_edges(device,
+                                                        data=True)))]
+        return self._get_obs()
+
+    def extend_path(self, link: ExtendedNetworkLink) -> np.ndarray:
+        """Appends one of the next_links to the path started with
+        start_path. Nothing is allocated.
+
+        Args:
+            link (ExtendedNetworkLink): The NetworkLink.
+
+        Returns:
+            np.ndarray: The observations.
+        """
+        self._path.append(link)
+        return self._get_obs()
+
     def reset(self,
               *,
               seed: int | None = None,
@@ -88,29 +267,81 @@ class NetworkEnv(gym.Env):
         Returns:
             tuple: The observations and additional info.
         """
-        if (seed != None):
-            random.seed(seed)
-        if (self._hard_reset_counter >= self._hard_reset_period):
-            self._hard_reset_counter = 1
-            for d in self._network.network_devices:
-                dev_path = self._network.get_path_device(d)
-                self._network.free_path_device(d, dev_path)
-                d.is_active = False
-        else:
-            self._hard_reset_counter += 1
-        uav_or_cam = random.randint(0, 1)
-        cameras_left = any(c.is_active == False for c in self._network.cams)
-        if (uav_or_cam == 0 and cameras_left):
-            self._dev = self._network.generate_cam_event()
-        else:
-            self._dev = self._network.generate_uav_event()
+        self._seed(seed)
+        self._dev = self._generate_event()
         self._path = []
         link= list(self._network.out_edges(self._dev, data=True))[0]
         self._path.append(link)
         obs = self._get_obs()
         info = self._get_info()
+        if (self.render_mode == "human"):
+            self.render()
         return obs, info
 
+    def _seed(self, seed: int | None) -> None:
+        """Seeds the np_random of the enviroment, which is shared with
+        the Network, so every NetworkEnv owns an independent and
+        reproducible stream of events.
+
+        Args:
+            seed (int | None): The seed. If None, the current generator
+            is kept.
+        """
+        super().reset(seed=seed)
+        if (seed != None):
+            self._network.rng = self.np_random
+
+    def _generate_event(self) -> NetworkDevice:
+        """Performs the hard reset (or the defragmentation) if enough
+        episodes have been carried out and generates the event (UAV or
+        camera) that the episode is going to deal with. If the plan of
+        the defragmentation cannot be fully allocated, the hard reset is
+        performed instead, so no workflow is left half migrated.
+
+        Returns:
+            NetworkDevice: The NetworkDevice whose workflow has to be
+            routed.
+        """
+        if (self._hard_reset_counter >= self._hard_reset_period):
+            self._hard_reset_counter = 1
+            if (self._reset_strategy == ResetStrategy.DEFRAG):
+                plan = self._optimizer.optimize(self._network)
+                if (plan.is_improvement
+                    and not plan.apply(self._network)):
+                    self._network.hard_reset()
+            else:
+                self._network.hard_reset()
+        else:
+            self._hard_reset_counter += 1
+        self._network.expire_cams()
+        if (self._trace != None):
+            return self._next_trace_event()
+        uav_or_cam = self._network.random.integers(2)
+        if (uav_or_cam == 0 and self._network.has_inactive_cams):
+            return self._network.generate_cam_event()
+        return self._network.generate_uav_event()
+
+    def _next_trace_event(self) -> NetworkDevice:
+        """Applies the events of the trace up to the next one that
+        requires routing a NetworkDevice's workflow. When the trace is
+        exhausted, it starts over.
+
+        Returns:
+            NetworkDevice: The NetworkDevice whose workflow has to be
+            routed.
+        """
+        for _ in range(2):
+            if (self._trace_events == None):
+                self._trace_events = iter(self._trace)
+            for event in self._trace_events:
+                device = self._network.apply_event(event)
+                if (device != None
+                    and event.event_type != NetworkEventType.CAM_STOP):
+                    return device
+            self._trace_events = None
+        raise ValueError(
+            f"Trace {self._trace.file_path} has no events to route.")
+
     def step(self, action: Any) -> tuple:
         """Performs and action in the current state and transitions into
         a new state.
@@ -147,8 +378,34 @@ class NetworkEnv(gym.Env):
             reward = -1
         obs = self._get_obs()
         info = self._get_info()
+        if (self.render_mode == "human"):
+            self.render()
         return obs, reward, terminated, False, info
 
+    def render(self) -> np.ndarray | None:
+        """Renders the Network with the current path highlighted. The
+        figure is built on the first call and only updated afterwards.
+
+        Returns:
+            np.ndarray | None: In the "rgb_array" mode, the frame as an
+            array of shape (height, width, 3). None otherwise.
+        """
+        if (self.render_mode == None):
+            return None
+        if (self._renderer == None):
+            from network_envs.visualization.NetworkRenderer import\
+                NetworkRenderer
+            self._renderer = NetworkRenderer(self._network,
+                                             self.render_mode,
+                                             self.metadata["render_fps"])
+        return self._renderer.render([l["data"] for (_, _, l) in self._path])
+
+    def close(self) -> None:
+        """Releases the figure of the renderer, if any."""
+        if (self._renderer != None):
+            self._renderer.close()
+            self._renderer = None
+
     def _get_info(self) -> dict:
         """Get detailed information about the environment's current
         state.
@@ -161,38 +418,22 @@ class NetworkEnv(gym.Env):
 
     def _get_obs(self):
         """Get the information that is observable by the agents about
-        the environment's current state.
+        the environment's current state: the features of every possible
+        next NetworkLink, sorted from the best to the worst.
 
         Returns:
-            dict: The information that is observable by the agents about
-        the environment's current state.
+            np.ndarray: The (n_actions, features) array of
+            observations.
         """
         # Get all the possible links
         next_links = self._get_next_links()
-        observations = []
-        for (_, _, l) in next_links:
-            if (isinstance(l, dict)):
-                link: NetworkLink = l["data"]
-                c = 1.0
-                if (self._dev in link.routed_flows):
-                    c = 0.0
-                l = link.delay
-                t = link.available_throughput
-            else:
-                c = self._obs_space.high[0]
-                l = self._obs_space.high[1]
-                t = self._obs_space.low[2]
-            observations.append([c,l,t])
-        remaining_links = len(observations) < self.action_space.n
-        if (remaining_links > 0):
-            for _ in range(remaining_links):
-                observations.append([self._obs_space.low[0],
-                                     self._obs_space.low[1],
-                                     self._obs_space.low[2]])
-        observations.sort(key=lambda obs: (obs[0],
-                                           obs[1],
-                                           self._obs_space.high[2] - obs[2]))
-        observations: np.ndarray = np.array(observations, dtype=np.float32)
+        delay_budget: float = self._dev.delay_req - sum(
+            l["data"].delay for (_, _, l) in self._path)
+        observations: np.ndarray = self._feature_extractor.extract(
+            self._dev,
+            delay_budget,
+            next_links)
+        observations = self._feature_extractor.sort(observations)
         return observations[:self.action_space.n][:]
 
     def _get_reward(self):
@@ -0,0 +1,235 @@
+from typing import Any
+import numpy as np
+from pathlib import Path
+from gymnasium import spaces
+from gymnasium.spaces.utils import flatten_space
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.entities.Network import ExtendedNetworkLink
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.enums.MobilityMode import MobilityMode
+from network_envs.enums.ResetStrategy import ResetStrategy
+from network_envs.delay.DelayModel import DelayModel
+
+
+class PathNetworkEnv(NetworkEnv):
+    """Alternative to NetworkEnv where the whole path is chosen in a
+    single step. On reset, the top-k paths to the gateway are
+    precomputed and the action selects one of them, so every episode
+    lasts one step.
+    """
+
+    PROFILED_METHODS = NetworkEnv.PROFILED_METHODS\
+        + ("_get_path_features",)
+    PROFILED_NETWORK_METHODS = NetworkEnv.PROFILED_NETWORK_METHODS\
+        + ("k_shortest_paths_to_gw",)
+
+    def __init__(self,
+                 configuration: Path,
+                 n_actions: int = 3,
+                 hard_reset_period: int = 100,
+                 render_mode: str = None,
+                 mobility: MobilityMode = MobilityMode.RANDOM,
+                 trace: Path = None,
+                 cam_mean_duration: float = None,
+                 reset_strategy: ResetStrategy = ResetStrategy.HARD,
+                 delay_model: DelayModel = None,
+                 profile: bool = False) -> None:
+        """Initializaes the PathNetworkEnv. This method is designed to
+        be callable by gym.make(...).
+
+        Args:
+            configuration (Path): The file that contains the
+            configuration for the enviroment.
+            n_actions (int): The number of candidate paths that the
+            agent can choose from. Defaults to 3.
+            hard_reset_period (int): The number of episodes to carry out
+            before performing a hard reset. Defaults to 100.
+            render_mode (str, optional): "rgb_array" to return the
+            frames from render() or "human" to show them in a window
+            after every reset and step (requires the optional
+            visualization dependencies). Defaults to None.
+            mobility (MobilityMode, optional): How UAVs move when a UAV
+            event is generated. Defaults to MobilityMode.RANDOM.
+            trace (Path, optional): A trace file (see TraceReader) whose
+            events are replayed, in a loop, instead of generating
+            pseudorandom ones. Defaults to None.
+            cam_mean_duration (float, optional): The mean duration of
+            the cameras' video streamings, measured in generated events.
+            If None, cameras never stop. Defaults to None.
+            reset_strategy (ResetStrategy, optional): What to do every
+            hard_reset_period episodes. Defaults to ResetStrategy.HARD.
+            delay_model (DelayModel, optional): How the delay of the
+            NetworkLinks grows with their load. Defaults to the
+            exponential queueing curve.
+            profile (bool, optional): Whether to start with the hot
+            paths of the environment and its Network instrumented (see
+            set_profiling). Defaults to False.
+        """
+        super().__init__(configuration=configuration,
+                         n_actions=n_actions,
+                         hard_reset_period=hard_reset_period,
+                         render_mode=render_mode,
+                         mobility=mobility,
+                         trace=trace,
+                         cam_mean_duration=cam_mean_duration,
+                         reset_strategy=reset_strategy,
+                         delay_model=delay_model,
+                         profile=profile)
+        # A simple path cannot be longer than the number of nodes
+        max_length: float = float(len(self._network.nodes))
+        max_throughput: float = max(
+            l.max_throughput for l in self._network.network_links)
+        max_delay: float = max(20.0, self._network.delay_model.delay(1.0))
+        self._obs_space = spaces.Box(
+            low=np.array([0.0, 0.0, 0.0]),
+            high=np.array([max_delay * max_length,
+                           max_throughput,
+                           max_length]),
+            shape=(3,))
+        self.observation_space =\
+            spaces.Tuple((self._obs_space for _ in range(n_actions)))
+        self.observation_space = flatten_space(self.observation_space)
+        self._candidates: list[list[ExtendedNetworkLink]] = []
+        self._features: np.ndarray = np.zeros((0, 3), dtype=np.float32)
+
+    @property
+    def candidates(self) -> list[list[ExtendedNetworkLink]]:
+        """Returns the candidate paths that the agent can choose from.
+
+        Returns:
+            list[list[ExtendedNetworkLink]]: The candidate paths, sorted
+            by increasing delay.
+        """
+        return self._candidates
+
+    def reset(self,
+              *,
+              seed: int | None = None,
+              options: dict | None = None) -> tuple:
+        """Resets the enviroment. The candidate paths of the chosen
+        device are computed while its current path, if any, is still
+        allocated, so that the NetworkLinks it already uses are not
+        counted as changes. The current path is only released in step,
+        when a new one is chosen.
+
+        Args:
+            seed (int | None, optional): The seed to provide
+            reproducibility. Defaults to None.
+            options (dict[str, Any] | None, optional): No use for
+            options yet. Defaults to None.
+
+        Returns:
+            tuple: The observations and additional info.
+        """
+        self._seed(seed)
+        self._dev = self._generate_event()
+        self._candidates = self._network.k_shortest_paths_to_gw(
+            self._dev,
+            self._network.gateways[0],
+            self.action_space.n)
+        self._features = self._get_path_features(self._candidates)
+        self._path = []
+        obs = self._get_obs()
+        info = self._get_info()
+        if (self.render_mode == "human"):
+            self.render()
+        return obs, info
+
+    def step(self, action: Any) -> tuple:
+        """Replaces the current path of the device by the chosen
+        candidate path, which ends the episode. Choosing a padded
+        candidate is penalized and the current path is kept.
+
+        Args:
+            action (Any): The index of the candidate path.
+
+        Returns:
+            tuple: The observations and additional info.
+        """
+        reward = -1
+        if (action < len(self._candidates)):
+            self._path = self._candidates[action]
+            reward = self._get_reward(action)
+            path: list[NetworkLink] = [l["data"] for (_, _, l) in self._path]
+            self._network.free_path_device(
+                self._dev,
+                self._network.get_path_device(self._dev))
+            self._network.assign_path_to_device(self._dev, path)
+        obs = self._get_obs()
+        info = self._get_info()
+        if (self.render_mode == "human"):
+            self.render()
+        return obs, reward, True, False, info
+
+    def _get_path_features(
+            self,
+            paths: list[list[ExtendedNetworkLink]]) -> np.ndarray:
+        """Computes, for all paths at once, the total delay, the
+        bottleneck throughput and the number of NetworkLinks where other
+        NetworkDevices' workflows would be disturbed. The throughput
+        that the device already uses is considered available.
+
+        Args:
+            paths (list[list[ExtendedNetworkLink]]): The paths.
+
+        Returns:
+            np.ndarray: A (len(paths), 3) array with the features.
+        """
+        if (len(paths) == 0):
+            return np.zeros((0, 3), dtype=np.float32)
+        links: list[NetworkLink] = [l["data"] for p in paths
+                                    for (_, _, l) in p]
+        delays = np.fromiter((l.delay for l in links),
+                             dtype=np.float64,
+                             count=len(links))
+        throughputs = np.fromiter((l.available_throughput
+                                   + l.allocation(self._dev)
+                                   for l in links),
+                                  dtype=np.float64,
+                                  count=len(links))
+        changes = np.fromiter(
+            (self._dev not in l.routed_flows and len(l.routed_flows) > 0
+             for l in links),
+            dtype=np.float64,
+            count=len(links))
+        lengths = np.fromiter((len(p) for p in paths),
+                              dtype=np.int64,
+                              count=len(paths))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        features = np.stack([np.add.reduceat(delays, offsets),
+                             np.minimum.reduceat(throughputs, offsets),
+                             np.add.reduceat(changes, offsets)],
+                            axis=1)
+        return features.astype(np.float32)
+
+    def _get_obs(self) -> np.ndarray:
+        """Get the features of the candidate paths, padded with the
+        worst possible values if there are less than n_actions paths.
+
+        Returns:
+            np.ndarray: The (n_actions, 3) array of observations.
+        """
+        padding = np.array([self._obs_space.high[0],
+                            self._obs_space.low[1],
+                            self._obs_space.high[2]],
+                           dtype=np.float32)
+        observations = np.tile(padding, (self.action_space.n, 1))
+        observations[:len(self._features)] = self._features
+        return observations
+
+    def _get_reward(self, action: int) -> float:
+        """Get the reward of choosing the given candidate path. It is
+        calculated as in NetworkEnv, from the number of changes and the
+        delay of the path, both scaled.
+
+        Args:
+            action (int): The index of the chosen candidate path.
+
+        Returns:
+            float: The reward.
+        """
+        delay, _, changes = self._features[action]
+        delay = (self._dev.delay_req - delay) / self._dev.delay_req
+        changes = (1 - changes / len(self._candidates[action]))
+        reward = changes * 0.9 + delay * 0.1
+        return float(reward)
@@ -0,0 +1,254 @@
+from typing import Any
+import gymnasium as gym
+import numpy as np
+from pathlib import Path
+from gymnasium import spaces
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.utils.TrajectoryDataset import TrajectoryDataset
+
+
+class ReplayNetworkEnv(gym.Env):
+    """Serves a dataset recorded by TrajectoryRecorder through the same
+    reset/step API as the environment that produced it, so policies can
+    be evaluated offline at the speed at which the dataset is read. The
+    episodes and their transitions are the recorded ones: step returns
+    the recorded next observation and reward whatever the action is,
+    and reports whether the action agrees with the recorded one. If a
+    configuration is given, a Network is kept in the state recorded for
+    the current step (available throughput of the NetworkLinks and AP
+    of the UAVs) by replaying the recorded changes since the previous
+    step, or since the closest full snapshot when the replay jumps to
+    another episode. The dataset is memory-mapped, so any number of
+    workers can share it.
+    """
+
+
+    def __init__(self,
+                 dataset: Path,
+                 configuration: Path = None,
+                 shuffle: bool = False) -> None:
+        """Initializes the ReplayNetworkEnv. This method is designed to
+        be callable by gym.make(...).
+
+        Args:
+            dataset (Path): The directory of the recorded dataset.
+            configuration (Path, optional): The configuration the
+            dataset was recorded with. If given, the recorded states of
+            the Network are reconstructed. Defaults to None.
+            shuffle (bool, optional): Whether reset draws the episodes
+            at random instead of in recording order. Defaults to False.
+
+        Raises:
+            ValueError: If a configuration is given but the dataset has
+            no snapshots of the Network.
+        """
+        self._dataset: TrajectoryDataset = TrajectoryDataset(dataset)
+        metadata: dict[str, Any] = self._dataset.metadata
+        self.action_space = spaces.Discrete(metadata["n_actions"], start=0)
+        self.observation_space = spaces.Box(
+            low=np.array(metadata["observation_space"]["low"],
+                         dtype=np.float32),
+            high=np.array(metadata["observation_space"]["high"],
+                          dtype=np.float32))
+        self._shuffle: bool = shuffle
+        self._next_episode: int = 0
+        self._steps: range = range(0)
+        self._row: int = 0
+        self._network: Network | None = None
+        if (configuration != None):
+            if ("network" not in metadata):
+                raise ValueError(
+                    f"Dataset {self._dataset.directory} was recorded "
+                    f"without snapshots of the Network.")
+            self._network = Network(configuration=configuration)
+            links_by_id: dict[int, NetworkLink] = {
+                l.id: l for l in self._network.network_links}
+            uavs_by_id: dict[int, NetworkDevice] = {
+                u.id: u for u in self._network.uavs}
+            self._links: list[NetworkLink] = [
+                links_by_id[i] for i in metadata["network"]["link_ids"]]
+            self._uavs: list[NetworkDevice] = [
+                uavs_by_id[i] for i in metadata["network"]["uav_ids"]]
+            self._aps_by_id: dict[int, NetworkNode] = {
+                ap.id: ap for ap in self._network.access_points}
+            self._devices_by_id: dict[int, NetworkDevice] = {
+                d.id: d for d in self._network.network_devices}
+            self._link_available: np.ndarray = np.array(
+                [l.available_throughput for l in self._links],
+                dtype=np.float64)
+            self._uav_ap_ids: np.ndarray = np.array(
+                [self._network.attached_ap(u).id for u in self._uavs],
+                dtype=np.int32)
+            self._snapshots: dict[str, np.ndarray] =\
+                self._dataset.table("snapshots")
+            self._link_changes: dict[str, np.ndarray] =\
+                self._dataset.table("link_changes")
+            self._handovers: dict[str, np.ndarray] =\
+                self._dataset.table("handovers")
+            # The step whose state the Network is in, none yet
+            self._restored_row: int = -1
+
+    @property
+    def dataset(self) -> TrajectoryDataset:
+        """Returns the replayed dataset.
+
+        Returns:
+            TrajectoryDataset: The replayed dataset.
+        """
+        return self._dataset
+
+    @property
+    def network(self) -> Network | None:
+        """Returns the Network in the recorded state of the current
+        step.
+
+        Returns:
+            Network | None: The Network, or None if no configuration
+            was given.
+        """
+        return self._network
+
+    @property
+    def device(self) -> NetworkDevice | None:
+        """Returns the NetworkDevice routed in the current episode.
+
+        Returns:
+            NetworkDevice | None: The NetworkDevice, or None if no
+            configuration was given or the episode has ended.
+        """
+        if (self._network == None or self._row not in self._steps):
+            return None
+        return self._devices_by_id.get(
+            int(self._dataset["device_id"][self._row]))
+
+    def reset(self,
+              *,
+              seed: int | None = None,
+              options: dict | None = None) -> tuple:
+        """Moves to the next recorded episode.
+
+        Args:
+            seed (int | None, optional): The seed of the random choice
+            of episodes. Defaults to None.
+            options (dict | None, optional): {"episode": index} replays
+            the given episode. Defaults to None.
+
+        Returns:
+            tuple: The recorded first observation and additional info.
+        """
+        super().reset(seed=seed)
+        if (options != None and "episode" in options):
+            episode: int = options["episode"]
+        elif (self._shuffle):
+            episode = int(self.np_random.integers(self._dataset.n_episodes))
+        else:
+            episode = self._next_episode
+        self._next_episode = (episode + 1) % self._dataset.n_episodes
+        self._steps = self._dataset.episode(episode)
+        self._row = self._steps.start
+        self._restore()
+        obs = np.array(self._dataset["observation"][self._row])
+        return obs, {"episode": episode}
+
+    def step(self, action: Any) -> tuple:
+        """Replays the current recorded step. The episode ends when the
+        recorded one does.
+
+        Args:
+            action (Any): The action of the evaluated policy.
+
+        Raises:
+            RuntimeError: If the episode has already ended.
+
+        Returns:
+            tuple: The recorded observation and reward, and info with
+            the recorded action and whether it matches the given one.
+        """
+        if (self._row not in self._steps):
+            raise RuntimeError("The episode has ended, call reset.")
+        row: int = self._row
+        logged_action: int = int(self._dataset["action"][row])
+        obs = np.array(self._dataset["next_observation"][row])
+        reward = float(self._dataset["reward"][row])
+        terminated = bool(self._dataset["terminated"][row])
+        # A recording that stops mid-episode is seen as a truncation
+        truncated = bool(self._dataset["truncated"][row])\
+            or (not terminated and row + 1 == self._steps.stop)
+        self._row += 1
+        if (self._row in self._steps):
+            self._restore()
+        info = {"logged_action": logged_action,
+                "action_matches": int(action) == logged_action}
+        return obs, reward, terminated, truncated, info
+
+    def _restore(self) -> None:
+        """Puts the Network, if any, in the recorded state of the
+        current step. If the Network is in the state of an earlier step
+        that is not before the last full snapshot, the changes recorded
+        since that step are replayed; otherwise the snapshot is restored
+        and the changes since it are replayed. Only the NetworkLinks and
+        the UAVs whose state differs are updated.
+        """
+        if (self._network == None):
+            return
+        row: int = self._row
+        snapshot: int = int(np.searchsorted(self._snapshots["step"],
+                                            row,
+                                            side="right")) - 1
+        start: int = self._restored_row
+        if (not (int(self._snapshots["step"][snapshot]) <= start <= row)):
+            start = int(self._snapshots["step"][snapshot])
+            self._apply(self._snapshots["link_available"][snapshot],
+                        self._snapshots["uav_ap_ids"][snapshot])
+        link_changes: slice = self._events(self._link_changes, start, row)
+        for i, available in zip(self._link_changes["link"][link_changes],
+                                self._link_changes["available"][link_changes]):
+            self._links[i].available_throughput = float(available)
+            self._link_available[i] = available
+        handovers: slice = self._events(self._handovers, start, row)
+        for i, ap_id in zip(self._handovers["uav"][handovers],
+                            self._handovers["ap_id"][handovers]):
+            self._network.handover_uav(self._uavs[i],
+                                       self._aps_by_id[int(ap_id)])
+            self._uav_ap_ids[i] = ap_id
+        self._restored_row = row
+
+    def _apply(self,
+               link_available: np.ndarray,
+               uav_ap_ids: np.ndarray) -> None:
+        """Puts the Network in the state of a full snapshot.
+
+        Args:
+            link_available (np.ndarray): The available throughput of
+            every NetworkLink.
+            uav_ap_ids (np.ndarray): The id of the AP of every UAV.
+        """
+        for i in np.flatnonzero(link_available != self._link_available):
+            self._links[i].available_throughput = float(link_available[i])
+        self._link_available[:] = link_available
+        for i in np.flatnonzero(uav_ap_ids != self._uav_ap_ids):
+            self._network.handover_uav(self._uavs[i],
+                                       self._aps_by_id[int(uav_ap_ids[i])])
+        self._uav_ap_ids[:] = uav_ap_ids
+
+    def _events(self,
+                table: dict[str, np.ndarray],
+                start: int,
+                stop: int) -> slice:
+        """Finds the events of a table recorded after a step and up to
+        another one.
+
+        Args:
+            table (dict[str, np.ndarray]): The table of events.
+            start (int): The step after which the events start.
+            stop (int): The last step of the events.
+
+        Returns:
+            slice: The rows of the events.
+        """
+        steps: np.ndarray = table["step"]
+        return slice(int(np.searchsorted(steps, start, side="right")),
+                     int(np.searchsorted(steps, stop, side="right")))
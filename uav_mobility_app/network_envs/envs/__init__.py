@@ -1 +1,3 @@
 from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.envs.PathNetworkEnv import PathNetworkEnv
+from network_envs.envs.ReplayNetworkEnv import ReplayNetworkEnv
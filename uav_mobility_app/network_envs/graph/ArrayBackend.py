@@ -0,0 +1,259 @@
+import heapq
+import math
+from itertools import count
+from typing import Callable
+import networkx as nx
+import numpy as np
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
+from network_envs.graph.GraphBackend import GraphBackend
+from network_envs.utils.CSRGraph import CSRGraph
+
+
+class ArrayBackend(GraphBackend):
+    """Runs the graph queries on an integer-indexed copy of the
+    infrastructure (the edges between NetworkNodes, which never change)
+    stored as a CSRGraph, with the available throughput and the delay of
+    its NetworkLinks kept in arrays. NetworkDevices are not part of it:
+    their only hop is the NetworkLink to their AP, which is tracked
+    apart and updated on handovers.
+    """
+
+
+    def __init__(self, network: nx.DiGraph) -> None:
+        super().__init__(network)
+        self._nodes: list[NetworkNode] = list(network.network_nodes)
+        self._index: dict[NetworkNode, int] = {
+            n: i for i, n in enumerate(self._nodes)}
+        self._links: list[NetworkLink] = []
+        self._attrs: list[dict[str, NetworkLink]] = []
+        sources: list[int] = []
+        targets: list[int] = []
+        # Edges between NetworkNodes and NetworkDevices, per endpoint
+        self._device_out: dict[NetworkNode | NetworkDevice,
+                               dict[NetworkNode | NetworkDevice,
+                                    ExtendedNetworkLink]] = {}
+        self._device_in: dict[NetworkNode | NetworkDevice,
+                              dict[NetworkNode | NetworkDevice,
+                                   ExtendedNetworkLink]] = {}
+        for u, v, attr in network.edges(data=True):
+            if (isinstance(u, NetworkNode) and isinstance(v, NetworkNode)):
+                sources.append(self._index[u])
+                targets.append(self._index[v])
+                self._links.append(attr["data"])
+                self._attrs.append(attr)
+            else:
+                self._add_device_edge(u, v, attr)
+        self._core: CSRGraph = CSRGraph(len(self._nodes), sources, targets)
+        self._positions: dict[NetworkLink, int] = {
+            l: i for i, l in enumerate(self._links)}
+        edge_ids: dict[tuple[int, int], int] = {
+            (u, v): i for i, (u, v) in enumerate(zip(sources, targets))}
+        self._reverse_edges: list[int] = [
+            edge_ids.get((v, u), -1) for (u, v) in zip(sources, targets)]
+        self._available: np.ndarray = np.array(
+            [l.available_throughput for l in self._links],
+            dtype=np.float64)
+        self._delays: np.ndarray = np.array(
+            [l.delay for l in self._links],
+            dtype=np.float64)
+        # Hops of every NetworkNode to each Gateway, computed on demand
+        self._gw_hops: dict[NetworkNode, np.ndarray] = {}
+
+    @property
+    def graph(self) -> CSRGraph:
+        """Returns the integer-indexed copy of the infrastructure. Node
+        i is network_nodes[i] and edge j carries the j-th NetworkLink
+        of the infrastructure.
+
+        Returns:
+            CSRGraph: The integer-indexed graph.
+        """
+        return self._core
+
+    def out_edges(self,
+                  node: NetworkNode | NetworkDevice
+                  ) -> list[ExtendedNetworkLink]:
+        edges: list[ExtendedNetworkLink] = []
+        if (isinstance(node, NetworkNode)):
+            edges = [(node, self._nodes[v], self._attrs[edge])
+                     for v, edge in self._core.out_edges(self._index[node])]
+        edges.extend(self._device_out.get(node, {}).values())
+        return edges
+
+    def in_edges(self,
+                 node: NetworkNode | NetworkDevice
+                 ) -> list[ExtendedNetworkLink]:
+        edges: list[ExtendedNetworkLink] = []
+        if (isinstance(node, NetworkNode)):
+            edges = [(self._nodes[u], node, self._attrs[edge])
+                     for u, edge in self._core.in_edges(self._index[node])]
+        edges.extend(self._device_in.get(node, {}).values())
+        return edges
+
+    def hops_to_gw(self,
+                   node: NetworkNode | NetworkDevice,
+                   gateway: NetworkNode) -> float:
+        if (gateway not in self._gw_hops):
+            self._gw_hops[gateway] = self._core.bfs_distances(
+                [self._index[gateway]],
+                reverse=True)
+        if (isinstance(node, NetworkDevice)):
+            ap: NetworkNode = self._network.attached_ap(node)
+            hops = 1 + self._gw_hops[gateway][self._index[ap]]
+        else:
+            hops = self._gw_hops[gateway][self._index[node]]
+        if (hops == math.inf):
+            raise nx.NetworkXNoPath(
+                f"No path from {node.name} to {gateway.name}.")
+        return float(hops)
+
+    def min_weight_path(self,
+                        network_device: NetworkDevice,
+                        gateway: NetworkNode,
+                        weight: Callable[[NetworkLink], float] = None
+                        ) -> list[NetworkNode | NetworkDevice]:
+        ap: NetworkNode = self._network.attached_ap(network_device)
+        first_link: NetworkLink = self._network[network_device][ap]["data"]
+        if (weight == None):
+            weights: list[float] = self._delays.tolist()
+            initial_distance: float = first_link.delay
+        else:
+            weights = [weight(l) for l in self._links]
+            initial_distance = weight(first_link)
+        available: np.ndarray = self._available
+        if (network_device in first_link.routed_flows):
+            # The throughput of the current path of the NetworkDevice
+            # can be reused
+            available = available.copy()
+            for l in self._network.get_path_device(network_device):
+                position: int | None = self._positions.get(l)
+                if (position != None):
+                    available[position] += l.allocation(network_device)
+        usable: list[bool] = (available
+                              >= network_device.throughput_req).tolist()
+        path = self._core.dijkstra(self._index[ap],
+                                   self._index[gateway],
+                                   weights,
+                                   usable,
+                                   initial_distance)
+        if (path == None):
+            raise self._no_path(network_device, gateway)
+        return [network_device] + [self._nodes[i] for i in path]
+
+    def best_path(self,
+                  network_device: NetworkNode | NetworkDevice,
+                  gateway: NetworkNode,
+                  source_label: tuple,
+                  extend: Callable[[tuple, NetworkLink], tuple],
+                  routable: Callable[[NetworkNode | NetworkDevice,
+                                      NetworkNode | NetworkDevice,
+                                      NetworkLink], bool]
+                  ) -> list[NetworkNode | NetworkDevice]:
+        if (isinstance(network_device, NetworkDevice)):
+            ap: NetworkNode = self._network.attached_ap(network_device)
+            first_link: NetworkLink =\
+                self._network[network_device][ap]["data"]
+            if (not routable(network_device, ap, first_link)):
+                raise self._no_path(network_device, gateway)
+            source: int = self._index[ap]
+            first_label: tuple = extend(source_label, first_link)
+            prefix: list[NetworkDevice] = [network_device]
+        else:
+            source = self._index[network_device]
+            first_label = source_label
+            prefix = []
+        target: int = self._index[gateway]
+        nodes: list[NetworkNode] = self._nodes
+        links: list[NetworkLink] = self._links
+        sequence = count()
+        labels: dict[int, tuple] = {source: first_label}
+        parents: dict[int, int] = {source: -1}
+        # Heap of (label, sequence number, node). The sequence number
+        # avoids comparing labels with nodes when two labels are equal
+        queue: list = [(first_label, next(sequence), source)]
+        visited: set[int] = set()
+        while (len(queue) > 0):
+            label, _, u = heapq.heappop(queue)
+            if (u in visited):
+                continue
+            visited.add(u)
+            if (u == target):
+                path: list[int] = [u]
+                while (parents[path[-1]] != -1):
+                    path.append(parents[path[-1]])
+                return prefix + [nodes[i] for i in path[::-1]]
+            for v, edge in self._core.out_edges(u):
+                l: NetworkLink = links[edge]
+                if (v in visited or not routable(nodes[u], nodes[v], l)):
+                    continue
+                new_label: tuple = extend(label, l)
+                if (v not in labels or new_label < labels[v]):
+                    labels[v] = new_label
+                    parents[v] = u
+                    heapq.heappush(queue, (new_label, next(sequence), v))
+        raise self._no_path(network_device, gateway)
+
+    def bottleneck_tree(self,
+                        gateways: list[NetworkNode]
+                        ) -> tuple[dict[NetworkNode, float],
+                                   dict[NetworkNode, NetworkLink]]:
+        available: list[float] = self._available.tolist()
+        sequence = count()
+        widths: dict[int, float] = {}
+        parents: dict[int, int] = {}
+        # Heap of (-width, sequence number, node, edge towards parent)
+        queue: list = [(-math.inf, next(sequence), self._index[gw], -1)
+                       for gw in gateways]
+        while (len(queue) > 0):
+            neg_width, _, v, parent_edge = heapq.heappop(queue)
+            if (v in widths):
+                continue
+            widths[v] = -neg_width
+            if (parent_edge >= 0):
+                parents[v] = parent_edge
+            for u, edge in self._core.in_edges(v):
+                if (u in widths):
+                    continue
+                reverse_edge: int = self._reverse_edges[edge]
+                width = min(-neg_width,
+                            available[edge],
+                            available[reverse_edge] if reverse_edge >= 0
+                            else 0.0)
+                heapq.heappush(queue, (-width, next(sequence), u, edge))
+        return ({self._nodes[i]: width for i, width in widths.items()},
+                {self._nodes[i]: self._links[edge]
+                 for i, edge in parents.items()})
+
+    def link_changed(self, link: NetworkLink) -> None:
+        position: int | None = self._positions.get(link)
+        if (position != None):
+            self._available[position] = link.available_throughput
+            self._delays[position] = link.delay
+
+    def handover(self,
+                 uav: NetworkDevice,
+                 old_ap: NetworkNode,
+                 new_ap: NetworkNode) -> None:
+        del self._device_out[uav][old_ap]
+        del self._device_in[old_ap][uav]
+        del self._device_out[old_ap][uav]
+        del self._device_in[uav][old_ap]
+        self._add_device_edge(uav, new_ap, self._network[uav][new_ap])
+        self._add_device_edge(new_ap, uav, self._network[new_ap][uav])
+
+    def _add_device_edge(self,
+                         u: NetworkNode | NetworkDevice,
+                         v: NetworkNode | NetworkDevice,
+                         attr: dict[str, NetworkLink]) -> None:
+        """Records an edge that has a NetworkDevice as an endpoint.
+
+        Args:
+            u (NetworkNode | NetworkDevice): The source of the edge.
+            v (NetworkNode | NetworkDevice): The destination of the edge.
+            attr (dict[str, NetworkLink]): The data of the edge.
+        """
+        self._device_out.setdefault(u, {})[v] = (u, v, attr)
+        self._device_in.setdefault(v, {})[u] = (u, v, attr)
@@ -0,0 +1,202 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+import networkx as nx
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
+
+
+class GraphBackend(ABC):
+    """The interface of the structures a Network runs its graph queries
+    on. The Network is still the NetworkX graph that holds the
+    NetworkNodes, the NetworkDevices and the NetworkLinks; a backend
+    answers the queries that are in the hot path of routing and tells
+    how to keep itself up to date through link_changed and handover.
+    """
+
+
+    def __init__(self, network: nx.DiGraph) -> None:
+        """Creates the backend of the given Network.
+
+        Args:
+            network (nx.DiGraph): The Network, already populated.
+        """
+        self._network: nx.DiGraph = network
+
+    @abstractmethod
+    def out_edges(self,
+                  node: NetworkNode | NetworkDevice
+                  ) -> list[ExtendedNetworkLink]:
+        """Returns the edges that leave the given node.
+
+        Args:
+            node (NetworkNode | NetworkDevice): The node.
+
+        Returns:
+            list[ExtendedNetworkLink]: The edges.
+        """
+
+    @abstractmethod
+    def in_edges(self,
+                 node: NetworkNode | NetworkDevice
+                 ) -> list[ExtendedNetworkLink]:
+        """Returns the edges that reach the given node.
+
+        Args:
+            node (NetworkNode | NetworkDevice): The node.
+
+        Returns:
+            list[ExtendedNetworkLink]: The edges.
+        """
+
+    @abstractmethod
+    def hops_to_gw(self,
+                   node: NetworkNode | NetworkDevice,
+                   gateway: NetworkNode) -> float:
+        """Returns the number of hops between the given node and the
+        given Gateway.
+
+        Args:
+            node (NetworkNode | NetworkDevice): The node.
+            gateway (NetworkNode): The Gateway.
+
+        Raises:
+            nx.NetworkXNoPath: If the Gateway cannot be reached.
+
+        Returns:
+            float: The number of hops.
+        """
+
+    @abstractmethod
+    def min_weight_path(self,
+                        network_device: NetworkDevice,
+                        gateway: NetworkNode,
+                        weight: Callable[[NetworkLink], float] = None
+                        ) -> list[NetworkNode | NetworkDevice]:
+        """Calculates the path that minimizes the sum of the given
+        weight using only the NetworkLinks with enough throughput for
+        the NetworkDevice (see Network.is_routable). The throughput that
+        the NetworkDevice is currently using is considered available.
+
+        Args:
+            network_device (NetworkDevice): The NetworkDevice from where
+            the path starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+            weight (Callable[[NetworkLink], float], optional): The
+            non-negative weight of each NetworkLink. Defaults to the
+            delay.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no path with enough
+            throughput.
+
+        Returns:
+            list[NetworkNode | NetworkDevice]: The nodes of the path.
+        """
+
+    @abstractmethod
+    def best_path(self,
+                  network_device: NetworkNode | NetworkDevice,
+                  gateway: NetworkNode,
+                  source_label: tuple,
+                  extend: Callable[[tuple, NetworkLink], tuple],
+                  routable: Callable[[NetworkNode | NetworkDevice,
+                                      NetworkNode | NetworkDevice,
+                                      NetworkLink], bool]
+                  ) -> list[NetworkNode | NetworkDevice]:
+        """Modified Dijkstra's algorithm where the cost of a path is a
+        tuple compared lexicographically (see Network._best_path_to_gw).
+
+        Args:
+            network_device (NetworkNode | NetworkDevice): The
+            NetworkDevice, or the NetworkNode, from where the path
+            starts.
+            gateway (NetworkNode): The NetworkNode where the path ends.
+            source_label (tuple): The label of the empty path.
+            extend (Callable[[tuple, NetworkLink], tuple]): Given the
+            label of a path and a NetworkLink, returns the label of the
+            path extended with the NetworkLink.
+            routable (Callable): Given the source, the destination and
+            the NetworkLink of an edge, returns whether the edge can be
+            used.
+
+        Raises:
+            nx.NetworkXNoPath: If there is no usable path.
+
+        Returns:
+            list[NetworkNode | NetworkDevice]: The nodes of the path.
+        """
+
+    def bottleneck_widths(self,
+                          gateways: list[NetworkNode]
+                          ) -> dict[NetworkNode, float]:
+        """Computes, for every NetworkNode, the largest available
+        throughput of a path towards any of the given Gateways (see
+        bottleneck_tree).
+
+        Args:
+            gateways (list[NetworkNode]): The Gateways.
+
+        Returns:
+            dict[NetworkNode, float]: The width of each reachable
+            NetworkNode.
+        """
+        return self.bottleneck_tree(gateways)[0]
+
+    @abstractmethod
+    def bottleneck_tree(self,
+                        gateways: list[NetworkNode]
+                        ) -> tuple[dict[NetworkNode, float],
+                                   dict[NetworkNode, NetworkLink]]:
+        """Computes, for every NetworkNode, the largest available
+        throughput of a path towards any of the given Gateways and the
+        first NetworkLink of such a path, which together form a tree of
+        widest paths. The width of an edge is the least available
+        throughput of its two directions, since workflows are routed
+        both ways, and 0 when it only goes one way.
+
+        Args:
+            gateways (list[NetworkNode]): The Gateways.
+
+        Returns:
+            tuple[dict[NetworkNode, float],
+            dict[NetworkNode, NetworkLink]]: The width of each reachable
+            NetworkNode and the NetworkLink that leaves it towards its
+            parent in the tree (none for the Gateways).
+        """
+
+    def link_changed(self, link: NetworkLink) -> None:
+        """Called by the Network after a NetworkLink has changed.
+
+        Args:
+            link (NetworkLink): The NetworkLink that changed.
+        """
+
+    def handover(self,
+                 uav: NetworkDevice,
+                 old_ap: NetworkNode,
+                 new_ap: NetworkNode) -> None:
+        """Called by the Network after a UAV has moved between APs.
+
+        Args:
+            uav (NetworkDevice): The UAV.
+            old_ap (NetworkNode): The AP the UAV was attached to.
+            new_ap (NetworkNode): The AP the UAV is attached to.
+        """
+
+    def _no_path(self,
+                 source: NetworkNode | NetworkDevice,
+                 gateway: NetworkNode) -> nx.NetworkXNoPath:
+        """Builds the exception raised when there is no usable path.
+
+        Args:
+            source (NetworkNode | NetworkDevice): Where the path starts.
+            gateway (NetworkNode): Where the path ends.
+
+        Returns:
+            nx.NetworkXNoPath: The exception.
+        """
+        return nx.NetworkXNoPath(
+            f"No path with enough throughput from {source.name} "
+            f"to {gateway.name}.")
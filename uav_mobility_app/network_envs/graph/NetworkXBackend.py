@@ -0,0 +1,126 @@
+import heapq
+import math
+from itertools import count
+from typing import Callable
+import networkx as nx
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
+from network_envs.graph.GraphBackend import GraphBackend
+
+
+class NetworkXBackend(GraphBackend):
+    """Runs the graph queries directly on the NetworkX dict-of-dicts of
+    the Network. Nothing has to be kept in sync, so this backend is the
+    reference for the faster ones.
+    """
+
+
+    def out_edges(self,
+                  node: NetworkNode | NetworkDevice
+                  ) -> list[ExtendedNetworkLink]:
+        return list(self._network.out_edges(node, data=True))
+
+    def in_edges(self,
+                 node: NetworkNode | NetworkDevice
+                 ) -> list[ExtendedNetworkLink]:
+        return list(self._network.in_edges(node, data=True))
+
+    def hops_to_gw(self,
+                   node: NetworkNode | NetworkDevice,
+                   gateway: NetworkNode) -> float:
+        return float(nx.shortest_path_length(self._network, node, gateway))
+
+    def min_weight_path(self,
+                        network_device: NetworkDevice,
+                        gateway: NetworkNode,
+                        weight: Callable[[NetworkLink], float] = None
+                        ) -> list[NetworkNode | NetworkDevice]:
+        if (weight == None):
+            weight = lambda l: l.delay
+        throughput_req: float = network_device.throughput_req
+
+        def edge_weight(u, v, l) -> float | None:
+            # Returning None hides the edges that cannot provide with
+            # enough throughput
+            link: NetworkLink = l["data"]
+            if (not self._network.is_routable(
+                    u,
+                    v,
+                    link,
+                    throughput_req - link.allocation(network_device))):
+                return None
+            return weight(l["data"])
+
+        return nx.shortest_path(self._network,
+                                network_device,
+                                gateway,
+                                method="dijkstra",
+                                weight=edge_weight)
+
+    def best_path(self,
+                  network_device: NetworkNode | NetworkDevice,
+                  gateway: NetworkNode,
+                  source_label: tuple,
+                  extend: Callable[[tuple, NetworkLink], tuple],
+                  routable: Callable[[NetworkNode | NetworkDevice,
+                                      NetworkNode | NetworkDevice,
+                                      NetworkLink], bool]
+                  ) -> list[NetworkNode | NetworkDevice]:
+        sequence = count()
+        labels: dict = {network_device: source_label}
+        parents: dict = {network_device: None}
+        # Heap of (label, sequence number, node). The sequence number
+        # avoids comparing nodes when two labels are equal
+        queue: list = [(source_label, next(sequence), network_device)]
+        visited: set = set()
+        while (len(queue) > 0):
+            label, _, u = heapq.heappop(queue)
+            if (u in visited):
+                continue
+            visited.add(u)
+            if (u is gateway):
+                path_nodes = [u]
+                while (parents[path_nodes[-1]] != None):
+                    path_nodes.append(parents[path_nodes[-1]])
+                return path_nodes[::-1]
+            for v, attr in self._network[u].items():
+                l: NetworkLink = attr["data"]
+                if (v in visited or not routable(u, v, l)):
+                    continue
+                new_label: tuple = extend(label, l)
+                if (v not in labels or new_label < labels[v]):
+                    labels[v] = new_label
+                    parents[v] = u
+                    heapq.heappush(queue, (new_label, next(sequence), v))
+        raise self._no_path(network_device, gateway)
+
+    def bottleneck_tree(self,
+                        gateways: list[NetworkNode]
+                        ) -> tuple[dict[NetworkNode, float],
+                                   dict[NetworkNode, NetworkLink]]:
+        sequence = count()
+        widths: dict[NetworkNode, float] = {}
+        parents: dict[NetworkNode, NetworkLink] = {}
+        # Heap of (-width, sequence number, node, link towards parent)
+        queue: list = [(-math.inf, next(sequence), gw, None)
+                       for gw in gateways]
+        while (len(queue) > 0):
+            neg_width, _, v, link = heapq.heappop(queue)
+            if (v in widths):
+                continue
+            widths[v] = -neg_width
+            if (link != None):
+                parents[v] = link
+            for u, attr in self._network.pred[v].items():
+                if (u in widths or isinstance(u, NetworkDevice)):
+                    continue
+                reverse: dict | None = self._network[v].get(u)
+                width = min(-neg_width,
+                            attr["data"].available_throughput,
+                            reverse["data"].available_throughput
+                            if (reverse != None) else 0.0)
+                heapq.heappush(queue,
+                               (-width, next(sequence), u, attr["data"]))
+        return widths, parents
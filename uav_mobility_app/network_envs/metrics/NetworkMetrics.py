@@ -0,0 +1,282 @@
+import numpy as np
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.enums.AllocationEventType import AllocationEventType
+from network_envs.enums.NetworkDeviceType import NetworkDeviceType
+from network_envs.enums.NetworkLinkTier import NetworkLinkTier
+
+
+class NetworkMetrics(object):
+    """Keeps running aggregates of the state of a Network: a histogram
+    of the utilization of the NetworkLinks per tier, the number of
+    allocations, frees and reroutes per NetworkDevice, the number of
+    NetworkLinks where an allocation disturbs other workflows, the
+    allocations that violate the delay requirement and the admission
+    rejections. The aggregates are updated incrementally from the
+    notifications of the Network, so reading them never scans it.
+    """
+
+
+    def __init__(self, network: Network, n_bins: int = 10) -> None:
+        """Creates the aggregates and subscribes to the Network.
+
+        Args:
+            network (Network): The observed Network.
+            n_bins (int, optional): The number of bins of the
+            utilization histograms, evenly spaced in [0, 1]. Defaults to
+            10.
+        """
+        self._network: Network = network
+        self._n_bins: int = n_bins
+        self._tiers: list[NetworkLinkTier] = list(NetworkLinkTier)
+        self._tier_positions: dict[NetworkLinkTier, int] = {
+            tier: i for i, tier in enumerate(self._tiers)}
+        self._histogram: np.ndarray = np.zeros((len(self._tiers), n_bins),
+                                               dtype=np.int64)
+        # Bin in which every NetworkLink is currently counted, and the
+        # utilization added to the sum of its tier
+        self._link_bins: dict[NetworkLink, tuple[int, int]] = {}
+        self._utilization_sums: np.ndarray = np.zeros(len(self._tiers),
+                                                      dtype=np.float64)
+        self._link_utilizations: dict[NetworkLink, float] = {}
+        for l in network.network_links:
+            self._update_link(l)
+        self._allocations: int = 0
+        self._frees: int = 0
+        self._displacements: int = 0
+        self._delay_violations: int = 0
+        self._rejections: dict[NetworkDeviceType, int] = {
+            device_type: 0 for device_type in NetworkDeviceType}
+        self._reroutes: dict[NetworkDevice, int] = {}
+        self._device_links: dict[NetworkDevice, frozenset[NetworkLink]] = {}
+        network.subscribe(self._update_link)
+        network.subscribe_allocations(self._on_allocation)
+
+    @property
+    def network(self) -> Network:
+        """Returns the observed Network.
+
+        Returns:
+            Network: The observed Network.
+        """
+        return self._network
+
+    @property
+    def utilization_histogram(self) -> np.ndarray:
+        """Returns the number of NetworkLinks of every tier whose
+        utilization falls in every bin. Rows follow the order of
+        NetworkLinkTier.
+
+        Returns:
+            np.ndarray: The (tiers, bins) histogram.
+        """
+        return self._histogram.copy()
+
+    @property
+    def allocations(self) -> int:
+        """Returns the number of workflows allocated so far.
+
+        Returns:
+            int: The number of allocations.
+        """
+        return self._allocations
+
+    @property
+    def frees(self) -> int:
+        """Returns the number of workflows freed so far.
+
+        Returns:
+            int: The number of frees.
+        """
+        return self._frees
+
+    @property
+    def reroutes(self) -> dict[NetworkDevice, int]:
+        """Returns the number of times every NetworkDevice has been
+        allocated a set of NetworkLinks different from its previous one.
+
+        Returns:
+            dict[NetworkDevice, int]: The reroutes per NetworkDevice.
+        """
+        return dict(self._reroutes)
+
+    @property
+    def displacements(self) -> int:
+        """Returns the number of NetworkLinks where an allocation shared
+        the throughput with other NetworkDevices' workflows.
+
+        Returns:
+            int: The number of displacements.
+        """
+        return self._displacements
+
+    @property
+    def delay_violations(self) -> int:
+        """Returns the number of allocations whose delay exceeded the
+        delay requirement of the NetworkDevice.
+
+        Returns:
+            int: The number of delay violations.
+        """
+        return self._delay_violations
+
+    @property
+    def rejections(self) -> dict[NetworkDeviceType, int]:
+        """Returns the number of allocations rejected for lack of
+        throughput per type of NetworkDevice.
+
+        Returns:
+            dict[NetworkDeviceType, int]: The rejections per type.
+        """
+        return dict(self._rejections)
+
+    def _bin(self, utilization: float) -> int:
+        """Returns the bin of a utilization.
+
+        Args:
+            utilization (float): The utilization of a NetworkLink.
+
+        Returns:
+            int: The bin.
+        """
+        return min(max(int(utilization * self._n_bins), 0), self._n_bins - 1)
+
+    def _update_link(self, link: NetworkLink) -> None:
+        """Moves a NetworkLink that changed to the bin of its current
+        utilization and updates the sum of the utilizations of its tier.
+
+        Args:
+            link (NetworkLink): The NetworkLink that changed.
+        """
+        tier: int = self._tier_positions[self._network.link_tier(link)]
+        utilization: float = (link.max_throughput
+                              - link.available_throughput)\
+            / link.max_throughput
+        self._utilization_sums[tier] += (
+            utilization - self._link_utilizations.get(link, 0.0))
+        self._link_utilizations[link] = utilization
+        position: tuple[int, int] = (tier, self._bin(utilization))
+        previous: tuple[int, int] | None = self._link_bins.get(link)
+        if (previous == position):
+            return
+        if (previous != None):
+            self._histogram[previous] -= 1
+        self._histogram[position] += 1
+        self._link_bins[link] = position
+
+    def _on_allocation(self,
+                       event_type: AllocationEventType,
+                       device: NetworkDevice,
+                       paths: list[list[NetworkLink]]) -> None:
+        """Updates the counters after an allocation event.
+
+        Args:
+            event_type (AllocationEventType): What happened.
+            device (NetworkDevice): The NetworkDevice.
+            paths (list[list[NetworkLink]]): Its paths.
+        """
+        if (event_type == AllocationEventType.REJECTED):
+            self._rejections[device.device_type] += 1
+            return
+        if (event_type == AllocationEventType.FREED):
+            self._frees += 1
+            return
+        self._allocations += 1
+        links: frozenset[NetworkLink] = frozenset(
+            l for path in paths for l in path)
+        previous: frozenset[NetworkLink] | None =\
+            self._device_links.get(device)
+        if (previous != None and previous != links):
+            self._reroutes[device] = self._reroutes.get(device, 0) + 1
+        self._device_links[device] = links
+        self._displacements += sum(len(l.routed_flows) > 1 for l in links)
+        delay: float = max(self._network.path_delay(path) for path in paths)
+        if (delay > device.delay_req):
+            self._delay_violations += 1
+
+    def snapshot(self) -> dict:
+        """Returns the current value of the aggregates.
+
+        Returns:
+            dict: The aggregates, indexed by name. Per-tier values are
+            indexed by the name of the NetworkLinkTier and per-device
+            values by the name of the NetworkDevice.
+        """
+        return {
+            "utilization_histogram": {
+                tier.name: self._histogram[i].tolist()
+                for i, tier in enumerate(self._tiers)},
+            "tier_utilization": {
+                tier.name: self._network.tier_utilization(tier)
+                for tier in self._tiers},
+            "allocations": self._allocations,
+            "frees": self._frees,
+            "reroutes": {d.name: n for d, n in self._reroutes.items()},
+            "displacements": self._displacements,
+            "delay_violations": self._delay_violations,
+            "rejections": {device_type.name: n
+                           for device_type, n in self._rejections.items()}}
+
+    def to_text(self, prefix: str = "network") -> str:
+        """Returns the aggregates in the Prometheus text exposition
+        format, so that a local scraper can read them.
+
+        Args:
+            prefix (str, optional): The prefix of the names of the
+            metrics. Defaults to "network".
+
+        Returns:
+            str: The aggregates, one sample per line.
+        """
+        lines: list[str] = []
+
+        def metric(name: str, metric_type: str, description: str) -> str:
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            return f"{prefix}_{name}"
+
+        name = metric("link_utilization", "histogram",
+                      "Utilization of the links per tier.")
+        for i, tier in enumerate(self._tiers):
+            cumulative = np.cumsum(self._histogram[i])
+            for b in range(self._n_bins):
+                upper = "+Inf" if (b == self._n_bins - 1)\
+                    else f"{(b + 1) / self._n_bins:g}"
+                lines.append(f'{name}_bucket{{tier="{tier.name}",'
+                             f'le="{upper}"}} {cumulative[b]}')
+            lines.append(f'{name}_sum{{tier="{tier.name}"}} '
+                         f'{self._utilization_sums[i]:g}')
+            lines.append(f'{name}_count{{tier="{tier.name}"}} '
+                         f'{cumulative[-1]}')
+        name = metric("tier_utilization", "gauge",
+                      "Fraction of the throughput of every tier in use.")
+        for tier in self._tiers:
+            lines.append(f'{name}{{tier="{tier.name}"}} '
+                         f'{self._network.tier_utilization(tier):g}')
+        for counter, value, description in (
+                ("allocations_total", self._allocations,
+                 "Workflows allocated."),
+                ("frees_total", self._frees, "Workflows freed."),
+                ("displacements_total", self._displacements,
+                 "Links shared with other workflows by an allocation."),
+                ("delay_violations_total", self._delay_violations,
+                 "Allocations that exceed the delay requirement.")):
+            lines.append(f"{metric(counter, 'counter', description)} "
+                         f"{value}")
+        name = metric("rejections_total", "counter",
+                      "Allocations rejected for lack of throughput.")
+        for device_type, n in self._rejections.items():
+            lines.append(f'{name}{{device_type="{device_type.name}"}} {n}')
+        name = metric("reroutes_total", "counter",
+                      "Allocations that changed the links of a device.")
+        for device, n in self._reroutes.items():
+            lines.append(f'{name}{{device="{device.name}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def close(self) -> None:
+        """Unsubscribes from the Network. The aggregates are kept but
+        no longer updated.
+        """
+        self._network.unsubscribe(self._update_link)
+        self._network.unsubscribe_allocations(self._on_allocation)
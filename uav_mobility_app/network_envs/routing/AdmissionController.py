@@ -0,0 +1,101 @@
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.enums.NetworkLinkTier import NetworkLinkTier
+from network_envs.routing.RoutingPolicy import RoutingCallable
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+from network_envs.routing.MinDelayPolicy import MinDelayPolicy
+
+
+class AdmissionController(RoutingPolicy):
+    """Wraps a routing policy and rejects the requests that cannot be
+    admitted before querying it, using the capacities of the APs that
+    the Network keeps cached. It also reports the headroom of the
+    Network from the aggregates that the Network maintains, so neither
+    check triggers a routing query.
+    """
+
+
+    def __init__(self, policy: RoutingCallable = None) -> None:
+        """Creates the controller.
+
+        Args:
+            policy (RoutingCallable, optional): The policy that routes
+            the admitted requests. Defaults to MinDelayPolicy().
+        """
+        if (policy == None):
+            policy = MinDelayPolicy()
+        self._policy: RoutingCallable = policy
+        self._early_rejections: int = 0
+        self._routing_rejections: int = 0
+
+    @property
+    def early_rejections(self) -> int:
+        """Returns the number of requests rejected without routing.
+
+        Returns:
+            int: The number of requests rejected without routing.
+        """
+        return self._early_rejections
+
+    @property
+    def routing_rejections(self) -> int:
+        """Returns the number of requests that passed the admission
+        check but for which the policy did not find a path.
+
+        Returns:
+            int: The number of requests rejected by the policy.
+        """
+        return self._routing_rejections
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        if (not network.can_admit(device)):
+            self._early_rejections += 1
+            return None
+        path = self._policy(network, device)
+        if (path == None):
+            self._routing_rejections += 1
+        return path
+
+    def admissible_aps(self,
+                       network: Network,
+                       device: NetworkDevice) -> list:
+        """Returns the APs through which the NetworkDevice could be
+        admitted, e.g. to choose where a UAV should hand over to.
+
+        Args:
+            network (Network): The Network.
+            device (NetworkDevice): The NetworkDevice.
+
+        Returns:
+            list[NetworkNode]: The APs, sorted by decreasing capacity.
+        """
+        aps = [ap for ap in network.access_points
+               if network.can_admit(device, ap)]
+        return sorted(aps, key=network.ap_capacity, reverse=True)
+
+    def headroom(self, network: Network, k: int = 5) -> dict:
+        """Reports the headroom of the Network.
+
+        Args:
+            network (Network): The Network.
+            k (int, optional): The number of most loaded NetworkLinks to
+            report. Defaults to 5.
+
+        Returns:
+            dict: The utilization of each tier indexed by the tier's
+            name, the k most loaded NetworkLinks as pairs of name and
+            utilization, and the capacity of each AP indexed by name.
+        """
+        return {
+            "tier_utilization": {
+                tier.name: network.tier_utilization(tier)
+                for tier in NetworkLinkTier},
+            "most_loaded_links": [
+                (l.name, utilization)
+                for l, utilization in network.most_loaded_links(k)],
+            "ap_capacity": {
+                ap.name: network.ap_capacity(ap)
+                for ap in network.access_points}}
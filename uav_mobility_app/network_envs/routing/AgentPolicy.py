@@ -0,0 +1,62 @@
+from typing import Callable
+import numpy as np
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.enums.NetworkNodeType import NetworkNodeType
+from network_envs.envs.NetworkEnv import NetworkEnv
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+
+
+class AgentPolicy(RoutingPolicy):
+    """Routes with a trained agent. The path is built hop by hop as in
+    NetworkEnv, feeding the agent with the observations of the given
+    NetworkEnv, which must wrap the Network that is being routed. The
+    NetworkDevice is left unrouted if the agent picks an invalid or
+    padded action or goes back to a NetworkNode of the path.
+    """
+
+
+    def __init__(self,
+                 env: NetworkEnv,
+                 predict: Callable[[np.ndarray], int],
+                 max_steps: int = 10) -> None:
+        """Creates the policy.
+
+        Args:
+            env (NetworkEnv): The enviroment whose observations the
+            agent was trained on.
+            predict (Callable[[np.ndarray], int]): The function that,
+            given an observation, returns the action of the agent.
+            max_steps (int, optional): The maximum number of steps to
+            reach the gateway, as the max_episode_steps of the
+            enviroment. Defaults to 10.
+        """
+        self._env: NetworkEnv = env
+        self._predict: Callable[[np.ndarray], int] = predict
+        self._max_steps: int = max_steps
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        if (network is not self._env.network):
+            raise ValueError("The Network must be the one of the NetworkEnv.")
+        obs: np.ndarray = self._env.start_path(device)
+        visited: set = {device, self._env.path[-1][1]}
+        for _ in range(self._max_steps):
+            action: int = int(self._predict(obs))
+            if (not self._env.action_space.contains(action)):
+                return None
+            next_link = self._env.next_links[action]
+            dst_node = next_link[1]
+            # Padding or a loop means the agent cannot reach the gateway
+            if (not isinstance(dst_node, NetworkNode)
+                or dst_node in visited):
+                return None
+            visited.add(dst_node)
+            obs = self._env.extend_path(next_link)
+            if (dst_node.node_type == NetworkNodeType.GW):
+                return network.path_links(
+                    [device] + [v for (_, v, _) in self._env.path])
+        return None
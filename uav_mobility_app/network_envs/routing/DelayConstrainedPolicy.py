@@ -0,0 +1,34 @@
+import networkx as nx
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.enums.PathCost import PathCost
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+
+
+class DelayConstrainedPolicy(RoutingPolicy):
+    """Routes through the path that minimizes the given cost among the
+    ones that meet the delay requirement of the NetworkDevice, as
+    Network.delay_constrained_path_to_gw does. Requests that cannot
+    meet their delay requirement are rejected.
+    """
+
+
+    def __init__(self, cost: PathCost = PathCost.CHANGES) -> None:
+        """Creates the policy.
+
+        Args:
+            cost (PathCost, optional): What to minimize. Defaults to
+            PathCost.CHANGES.
+        """
+        self._cost: PathCost = cost
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        try:
+            return network.delay_constrained_path_to_gw(device,
+                                                        network.gateways[0],
+                                                        self._cost)
+        except nx.NetworkXNoPath:
+            return None
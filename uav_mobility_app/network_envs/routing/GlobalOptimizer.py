@@ -0,0 +1,178 @@
+import networkx as nx
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.routing.Migration import Migration
+from network_envs.routing.MigrationPlan import MigrationPlan
+
+
+class GlobalOptimizer(object):
+    """Recomputes the allocation of all the workflows at once to undo
+    the fragmentation that routing one NetworkDevice at a time builds
+    up. Workflows are routed one after another with successive shortest
+    paths over the throughput that would remain available, weighting
+    each NetworkLink with the delay it would have once the workflow is
+    added. Then every workflow is ripped up and rerouted, which never
+    makes its cost worse, until nothing changes. Leaving the current
+    path is penalized, so the plan keeps the number of changes low. The
+    Network is not modified until the plan is applied.
+    """
+
+
+    def __init__(self,
+                 change_penalty: float = 1.0,
+                 iterations: int = 3) -> None:
+        """Creates the optimizer.
+
+        Args:
+            change_penalty (float, optional): The cost, in ms of delay,
+            of routing a workflow through a NetworkLink that its current
+            path does not use. Defaults to 1.0.
+            iterations (int, optional): The maximum number of passes
+            over all the workflows. Defaults to 3.
+        """
+        self._change_penalty: float = change_penalty
+        self._iterations: int = iterations
+
+    def optimize(self, network: Network) -> MigrationPlan:
+        """Computes the new allocation of the workflows of the routed
+        and the active NetworkDevices.
+
+        Args:
+            network (Network): The Network.
+
+        Returns:
+            MigrationPlan: The workflows whose path changes.
+        """
+        endpoints = {l: (u, v) for (u, v, l) in network.edges(data="data")}
+        old_paths: dict[NetworkDevice, list[NetworkLink]] = {}
+        for l in network.network_links:
+            for d in l.routed_flows:
+                old_paths.setdefault(d, []).append(l)
+        # Routed workflows go first, then the active NetworkDevices that
+        # could not be routed
+        devices: list[NetworkDevice] = [
+            d for d in network.network_devices if d in old_paths]
+        devices += [d for d in network.network_devices
+                    if d.is_active and d not in old_paths]
+        # Throughput that remains available once every workflow is
+        # released, i.e. only the background load is kept
+        available: dict[NetworkLink, float] = {
+            l: l.available_throughput
+               + sum(l.allocation(d) for d in l.routed_flows)
+            for l in network.network_links}
+        new_paths: dict[NetworkDevice, list[NetworkLink] | None] = {}
+        for _ in range(self._iterations):
+            changed = False
+            for d in devices:
+                path = new_paths.get(d)
+                if (path != None):
+                    for l in path:
+                        available[l] += d.throughput_req
+                new_path = self._route(network,
+                                       d,
+                                       available,
+                                       set(old_paths.get(d, [])))
+                if (new_path != None):
+                    for l in new_path:
+                        available[l] -= d.throughput_req
+                changed |= (new_path != path)
+                new_paths[d] = new_path
+            if (not changed):
+                break
+        migrations: list[Migration] = []
+        for d in devices:
+            old_path = old_paths.get(d, [])
+            new_path = new_paths[d]
+            if ((new_path == None and len(old_path) == 0)
+                or (new_path != None and set(new_path) == set(old_path))):
+                continue
+            migrations.append(Migration(d, old_path, new_path))
+        delay_before = sum(
+            l.delay for d, path in old_paths.items()
+            for l in self._forward_links(d, path, endpoints))
+        delay_after = sum(
+            l.delay_at(available[l]) for d in old_paths
+            if new_paths[d] != None for l in new_paths[d][::2])
+        return MigrationPlan(
+            migrations,
+            delay_before,
+            delay_after,
+            max(1 - l.available_throughput / l.max_throughput
+                for l in network.network_links),
+            max(1 - available[l] / l.max_throughput
+                for l in network.network_links))
+
+    def _route(self,
+               network: Network,
+               device: NetworkDevice,
+               available: dict[NetworkLink, float],
+               current_links: set[NetworkLink]) -> list[NetworkLink] | None:
+        """Computes the cheapest path for the NetworkDevice over the
+        given available throughput.
+
+        Args:
+            network (Network): The Network.
+            device (NetworkDevice): The NetworkDevice to route.
+            available (dict[NetworkLink, float]): The throughput that
+            each NetworkLink has available.
+            current_links (set[NetworkLink]): The NetworkLinks of the
+            current path of the NetworkDevice.
+
+        Returns:
+            list[NetworkLink] | None: The path, in the same format as
+            Network.shortest_path_to_gw, or None if there is none.
+        """
+        throughput_req: float = device.throughput_req
+
+        def weight(u, v, attr) -> float | None:
+            l: NetworkLink = attr["data"]
+            # Workflows are routed both ways
+            if (min(available[l], available[network[v][u]["data"]])
+                < throughput_req):
+                return None
+            cost = l.delay_at(available[l] - throughput_req)
+            if (l not in current_links):
+                cost += self._change_penalty
+            return cost
+
+        try:
+            path_nodes = nx.dijkstra_path(network,
+                                          device,
+                                          network.gateways[0],
+                                          weight=weight)
+        except nx.NetworkXNoPath:
+            return None
+        return network.path_links(path_nodes)
+
+    def _forward_links(self,
+                       device: NetworkDevice,
+                       path: list[NetworkLink],
+                       endpoints: dict) -> list[NetworkLink]:
+        """Returns the NetworkLinks of a path in the direction from the
+        NetworkDevice to the gateway, whatever the format of the path.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice.
+            path (list[NetworkLink]): The NetworkLinks of the path.
+            endpoints (dict): The source and destination of each
+            NetworkLink.
+
+        Returns:
+            list[NetworkLink]: The NetworkLinks towards the gateway.
+        """
+        next_links = {endpoints[l][0]: [] for l in path}
+        for l in path:
+            next_links[endpoints[l][0]].append(l)
+        forward: list[NetworkLink] = []
+        visited = {device}
+        node = device
+        while (node in next_links):
+            hops = [l for l in next_links[node]
+                    if endpoints[l][1] not in visited]
+            if (len(hops) == 0):
+                break
+            forward.append(hops[0])
+            node = endpoints[hops[0]][1]
+            visited.add(node)
+        return forward
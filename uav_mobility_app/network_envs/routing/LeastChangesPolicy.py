@@ -0,0 +1,34 @@
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+
+
+class LeastChangesPolicy(RoutingPolicy):
+    """Routes through the path that disturbs the least number of other
+    NetworkDevices' workflows, i.e. that goes through the least number
+    of NetworkLinks that are used by others and not by the NetworkDevice
+    itself, which favours keeping its current path. Ties are broken by
+    delay.
+    """
+
+
+    def __init__(self, delay_weight: float = 1e-3) -> None:
+        """Creates the policy.
+
+        Args:
+            delay_weight (float, optional): The weight of the delay with
+            respect to a change. It must be small enough for the delay
+            to only break ties. Defaults to 1e-3.
+        """
+        self._delay_weight: float = delay_weight
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        def weight(l: NetworkLink) -> float:
+            changed: bool = (device not in l.routed_flows
+                             and len(l.routed_flows) > 0)
+            return float(changed) + self._delay_weight * l.delay
+
+        return self._dijkstra(network, device, weight)
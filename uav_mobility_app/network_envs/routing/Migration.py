@@ -0,0 +1,19 @@
+from typing import NamedTuple
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+
+
+class Migration(NamedTuple):
+    """The move of a NetworkDevice's workflow from one path to another.
+
+    Attributes:
+        device (NetworkDevice): The NetworkDevice whose workflow moves.
+        old_path (list[NetworkLink]): The NetworkLinks the workflow is
+        routed through. Empty if it is not routed.
+        new_path (list[NetworkLink] | None): The NetworkLinks the
+        workflow is moved to, or None if it could not be routed.
+    """
+
+    device: NetworkDevice
+    old_path: list[NetworkLink]
+    new_path: list[NetworkLink] | None
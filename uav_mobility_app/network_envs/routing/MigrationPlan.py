@@ -0,0 +1,124 @@
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.routing.Migration import Migration
+
+
+class MigrationPlan(object):
+    """The changes that take the Network from its current allocation to
+    the one computed by the GlobalOptimizer, together with the value of
+    the objective before and after applying them.
+    """
+
+
+    def __init__(self,
+                 migrations: list[Migration],
+                 delay_before: float,
+                 delay_after: float,
+                 max_utilization_before: float,
+                 max_utilization_after: float) -> None:
+        """Creates the plan.
+
+        Args:
+            migrations (list[Migration]): The workflows that move.
+            delay_before (float): The total delay of the workflows with
+            the current allocation.
+            delay_after (float): The total delay of the workflows once
+            the plan is applied.
+            max_utilization_before (float): The highest utilization of
+            a NetworkLink with the current allocation.
+            max_utilization_after (float): The highest utilization of a
+            NetworkLink once the plan is applied.
+        """
+        self._migrations: list[Migration] = migrations
+        self._delay_before: float = delay_before
+        self._delay_after: float = delay_after
+        self._max_utilization_before: float = max_utilization_before
+        self._max_utilization_after: float = max_utilization_after
+
+    @property
+    def migrations(self) -> list[Migration]:
+        """Returns the workflows that move.
+
+        Returns:
+            list[Migration]: The workflows that move.
+        """
+        return self._migrations
+
+    @property
+    def unrouted(self) -> list[NetworkDevice]:
+        """Returns the NetworkDevices that are left without a path.
+
+        Returns:
+            list[NetworkDevice]: The NetworkDevices without a path.
+        """
+        return [m.device for m in self._migrations if m.new_path == None]
+
+    @property
+    def delay_before(self) -> float:
+        """Returns the total delay with the current allocation.
+
+        Returns:
+            float: The total delay expressed in ms.
+        """
+        return self._delay_before
+
+    @property
+    def delay_after(self) -> float:
+        """Returns the total delay once the plan is applied.
+
+        Returns:
+            float: The total delay expressed in ms.
+        """
+        return self._delay_after
+
+    @property
+    def max_utilization_before(self) -> float:
+        """Returns the highest utilization with the current allocation.
+
+        Returns:
+            float: The highest utilization of a NetworkLink.
+        """
+        return self._max_utilization_before
+
+    @property
+    def max_utilization_after(self) -> float:
+        """Returns the highest utilization once the plan is applied.
+
+        Returns:
+            float: The highest utilization of a NetworkLink.
+        """
+        return self._max_utilization_after
+
+    @property
+    def is_improvement(self) -> bool:
+        """Checks whether applying the plan is worth it: it reduces the
+        total delay and no routed workflow loses its path.
+
+        Returns:
+            bool: Whether the plan should be applied.
+        """
+        lost = any(len(m.old_path) > 0 and m.new_path == None
+                   for m in self._migrations)
+        return (len(self._migrations) > 0
+                and not lost
+                and self._delay_after < self._delay_before)
+
+    def apply(self, network: Network) -> bool:
+        """Applies the plan: the old paths of all the migrating
+        workflows are released first and then the new ones allocated.
+
+        Args:
+            network (Network): The Network the plan was computed for,
+            which must not have changed since.
+
+        Returns:
+            bool: Whether all the new paths could be allocated.
+        """
+        for m in self._migrations:
+            network.free_path_device(m.device, m.old_path)
+        allocated = True
+        for m in self._migrations:
+            if (m.new_path != None):
+                allocated &= network.assign_path_to_device(m.device,
+                                                           m.new_path)
+        return allocated
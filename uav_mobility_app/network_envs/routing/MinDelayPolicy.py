@@ -0,0 +1,35 @@
+import networkx as nx
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+
+
+class MinDelayPolicy(RoutingPolicy):
+    """Routes through the path with the least delay among the ones
+    with enough throughput, as Network.shortest_path_to_gw does.
+    Optionally, ties are broken in favour of the widest path.
+    """
+
+
+    def __init__(self, widest_tie_break: bool = False) -> None:
+        """Creates the policy.
+
+        Args:
+            widest_tie_break (bool, optional): Whether to choose, among
+            the paths with the least delay, the one with the largest
+            bottleneck (see Network.min_delay_widest_path_to_gw).
+            Defaults to False.
+        """
+        self._widest_tie_break: bool = widest_tie_break
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        if (not self._widest_tie_break):
+            return self._dijkstra(network, device, lambda l: l.delay)
+        try:
+            return network.min_delay_widest_path_to_gw(device,
+                                                       network.gateways[0])
+        except nx.NetworkXNoPath:
+            return None
@@ -0,0 +1,16 @@
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+
+
+class MinHopPolicy(RoutingPolicy):
+    """Routes through the path with the least number of NetworkLinks
+    among the ones with enough throughput.
+    """
+
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        return self._dijkstra(network, device, lambda l: 1.0)
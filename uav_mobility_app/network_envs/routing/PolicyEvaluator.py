@@ -0,0 +1,122 @@
+import time
+from typing import Iterable
+import numpy as np
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.enums.NetworkEventType import NetworkEventType
+from network_envs.routing.RoutingPolicy import RoutingCallable
+
+
+def generate_events(network: Network,
+                    n_events: int,
+                    seed: int = None,
+                    start_probability: float = 0.4,
+                    stop_probability: float = 0.3) -> list[NetworkEvent]:
+    """Generates a pseudorandom stream of UAV handovers and camera
+    starts and stops that can be replayed to evaluate several policies
+    on the same events. The Network is only used to know its
+    NetworkDevices and APs, it is not modified.
+
+    Args:
+        network (Network): The Network the events are meant for.
+        n_events (int): The number of events.
+        seed (int, optional): The seed to guarantee reproducibility.
+        Defaults to None.
+        start_probability (float, optional): The probability of an
+        event being the start of an inactive camera. Defaults to 0.4.
+        stop_probability (float, optional): The probability of an event
+        being the stop of a streaming camera. Defaults to 0.3.
+
+    Returns:
+        list[NetworkEvent]: The events, one per second. When there is
+        no camera to start or stop, a UAV handover is generated instead.
+    """
+    rng = np.random.default_rng(seed)
+    ap_ids = [ap.id for ap in network.access_points]
+    inactive_cams = [c.id for c in network.cams if not c.is_active]
+    active_cams = [c.id for c in network.cams if c.is_active]
+    events: list[NetworkEvent] = []
+    for t in range(n_events):
+        draw = rng.random()
+        if (draw < start_probability and len(inactive_cams) > 0):
+            cam_id = inactive_cams.pop(rng.integers(len(inactive_cams)))
+            active_cams.append(cam_id)
+            events.append(NetworkEvent(float(t),
+                                       NetworkEventType.CAM_START,
+                                       cam_id))
+        elif (draw < start_probability + stop_probability
+              and len(active_cams) > 0):
+            cam_id = active_cams.pop(rng.integers(len(active_cams)))
+            inactive_cams.append(cam_id)
+            events.append(NetworkEvent(float(t),
+                                       NetworkEventType.CAM_STOP,
+                                       cam_id))
+        else:
+            uav_id = network.uavs[rng.integers(len(network.uavs))].id
+            events.append(NetworkEvent(float(t),
+                                       NetworkEventType.UAV_HANDOVER,
+                                       uav_id,
+                                       ap_id=ap_ids[rng.integers(
+                                           len(ap_ids))]))
+    return events
+
+
+def evaluate_policy(network: Network,
+                    policy: RoutingCallable,
+                    events: Iterable[NetworkEvent]) -> dict[str, float]:
+    """Replays the events on the Network and routes every NetworkDevice
+    that needs a path with the given policy. The policy is asked while
+    the current path of the NetworkDevice is still allocated, so it can
+    keep it, and the path is only replaced once the new one is known.
+    Policies evaluated on fresh Networks with the same events are
+    directly comparable.
+
+    Args:
+        network (Network): The Network, which is modified.
+        policy (RoutingCallable): The routing policy, e.g. a
+        RoutingPolicy.
+        events (Iterable[NetworkEvent]): The events to replay.
+
+    Returns:
+        dict[str, float]: The number of routing requests, admitted and
+        rejected ones, the mean delay and number of changes (the
+        NetworkLinks already used by other workflows) of the admitted
+        paths, the number of paths that violate the delay
+        requirement of their NetworkDevice and the requests per second
+        of wall-clock time.
+    """
+    requests: int = 0
+    admitted: int = 0
+    total_delay: float = 0.0
+    total_changes: int = 0
+    violations: int = 0
+    start: float = time.perf_counter()
+    for event in events:
+        device: NetworkDevice | None = network.apply_event(event)
+        if (device == None or not device.is_active):
+            continue
+        requests += 1
+        path: list[NetworkLink] | None = policy(network, device)
+        if (path == None):
+            continue
+        changes: int = sum(1 for l in set(path)
+                           if len(l.routed_flows) > 0
+                           and device not in l.routed_flows)
+        network.free_path_device(device, network.get_path_device(device))
+        delay: float = network.path_delay(path)
+        if (network.assign_path_to_device(device, path)):
+            admitted += 1
+            total_delay += delay
+            total_changes += changes
+            violations += delay > device.delay_req
+    elapsed: float = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "admitted": admitted,
+        "rejected": requests - admitted,
+        "mean_delay": total_delay / max(admitted, 1),
+        "mean_changes": total_changes / max(admitted, 1),
+        "delay_violations": violations,
+        "requests_per_second": requests / max(elapsed, 1e-9)}
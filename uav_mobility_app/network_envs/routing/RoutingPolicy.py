@@ -0,0 +1,71 @@
+from abc import ABC, abstractmethod
+from typing import Callable
+import networkx as nx
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+
+
+"""A routing policy receives the Network and the NetworkDevice whose
+workflow has to be routed and returns the path as a list of NetworkLinks
+(as Network.shortest_path_to_gw does) or None if it cannot be routed.
+RoutingPolicy instances, as well as plain functions, fit this alias.
+"""
+RoutingCallable = Callable[[Network, NetworkDevice],
+                           list[NetworkLink] | None]
+
+
+class RoutingPolicy(ABC):
+    """The interface of the routing policies. Given the state of the
+    Network and a NetworkDevice, a policy returns the path through which
+    the NetworkDevice's workflow should be routed to the gateway. Paths
+    are returned in the format of Network.shortest_path_to_gw. Policies
+    are callable, so they can be plugged into the NetworkSimulator.
+    """
+
+
+    @abstractmethod
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        """Computes the path for the NetworkDevice's workflow. The
+        Network is not modified.
+
+        Args:
+            network (Network): The Network.
+            device (NetworkDevice): The NetworkDevice to route.
+
+        Returns:
+            list[NetworkLink] | None: The path, or None if the
+            NetworkDevice cannot be routed.
+        """
+
+    def __call__(self,
+                 network: Network,
+                 device: NetworkDevice) -> list[NetworkLink] | None:
+        return self.route(network, device)
+
+    def _dijkstra(self,
+                  network: Network,
+                  device: NetworkDevice,
+                  weight: Callable[[NetworkLink], float]
+                  ) -> list[NetworkLink] | None:
+        """Computes the path to the first gateway that minimizes the sum
+        of the given weight, using only the NetworkLinks with enough
+        throughput for the NetworkDevice.
+
+        Args:
+            network (Network): The Network.
+            device (NetworkDevice): The NetworkDevice to route.
+            weight (Callable[[NetworkLink], float]): The non-negative
+            weight of each NetworkLink.
+
+        Returns:
+            list[NetworkLink] | None: The path, or None if there is none.
+        """
+        try:
+            return network.min_weight_path_to_gw(device,
+                                                 network.gateways[0],
+                                                 weight)
+        except nx.NetworkXNoPath:
+            return None
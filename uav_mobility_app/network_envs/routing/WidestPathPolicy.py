@@ -0,0 +1,21 @@
+import networkx as nx
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.routing.RoutingPolicy import RoutingPolicy
+
+
+class WidestPathPolicy(RoutingPolicy):
+    """Routes through the path whose bottleneck, i.e. the least
+    available throughput among its NetworkLinks, is the largest, as
+    Network.widest_path_to_gw does.
+    """
+
+
+    def route(self,
+              network: Network,
+              device: NetworkDevice) -> list[NetworkLink] | None:
+        try:
+            return network.widest_path_to_gw(device, network.gateways[0])
+        except nx.NetworkXNoPath:
+            return None
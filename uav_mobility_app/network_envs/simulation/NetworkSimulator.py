@@ -0,0 +1,345 @@
+import heapq
+import math
+from itertools import count
+from typing import Any, Callable, Iterable, Iterator
+import networkx as nx
+import numpy as np
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.routing.RoutingPolicy import RoutingCallable
+from network_envs.routing.MinDelayPolicy import MinDelayPolicy
+
+
+class NetworkSimulator(object):
+    """A discrete-event simulator that drives a Network over simulated
+    time. Events are kept in a heap ordered by timestamp. UAV handovers,
+    camera starts and link load changes arrive as Poisson processes (or
+    from a recorded stream of NetworkEvents), camera stops are scheduled
+    when cameras start, and every time a NetworkDevice needs a path, the
+    routing policy is queried. Metrics are sampled periodically.
+    """
+
+
+    def __init__(self,
+                 network: Network,
+                 routing_policy: RoutingCallable = None,
+                 uav_event_rate: float = 1.0,
+                 cam_event_rate: float = 1.0,
+                 cam_mean_duration: float = 60.0,
+                 link_load_rate: float = 0.0,
+                 max_link_load: float = 0.1,
+                 metrics_period: float = 1.0,
+                 max_paths: int = 1) -> None:
+        """Creates the simulator. Rates are expressed in events per
+        second and may be 0 to disable the pseudorandom generation of
+        that type of events.
+
+        Args:
+            network (Network): The Network to simulate.
+            routing_policy (RoutingCallable, optional): The policy that
+            computes the paths. Defaults to MinDelayPolicy().
+            uav_event_rate (float, optional): The rate of UAV handovers.
+            Defaults to 1.0.
+            cam_event_rate (float, optional): The rate of camera starts.
+            Defaults to 1.0.
+            cam_mean_duration (float, optional): The mean duration of
+            the video streamings expressed in s. Defaults to 60.0.
+            link_load_rate (float, optional): The rate of background
+            load changes. Defaults to 0.0.
+            max_link_load (float, optional): The maximum background
+            load of a NetworkLink as a fraction of its maximum
+            throughput. Defaults to 0.1.
+            metrics_period (float, optional): The time between two
+            samples of the metrics expressed in s. Defaults to 1.0.
+            max_paths (int, optional): If greater than 1, the workflows
+            that the routing policy cannot route are split across up to
+            max_paths paths (see Network.split_flow_to_gw). Defaults to
+            1.
+        """
+        self._network: Network = network
+        if (routing_policy == None):
+            routing_policy = MinDelayPolicy()
+        self._routing_policy: RoutingCallable = routing_policy
+        self._uav_event_rate: float = uav_event_rate
+        self._cam_event_rate: float = cam_event_rate
+        self._cam_mean_duration: float = cam_mean_duration
+        self._link_load_rate: float = link_load_rate
+        self._max_link_load: float = max_link_load
+        self._metrics_period: float = metrics_period
+        self._max_paths: int = max_paths
+        self._now: float = 0.0
+        # Heap of (timestamp, sequence number, handler, argument). The
+        # sequence number keeps the order of simultaneous events stable
+        self._queue: list[tuple[float, int, Callable, Any]] = []
+        self._sequence = count()
+        self._events: Iterator[NetworkEvent] | None = None
+        self._infrastructure_links: list[NetworkLink] = [
+            l for (u, v, l) in network.edges(data="data")
+            if not (isinstance(u, NetworkDevice)
+                    or isinstance(v, NetworkDevice))]
+        # Utilization of the infrastructure NetworkLinks, only updated
+        # for the NetworkLinks that changed since the last sample
+        self._link_positions: dict[NetworkLink, int] = {
+            l: i for i, l in enumerate(self._infrastructure_links)}
+        self._utilizations: np.ndarray = np.zeros(
+            len(self._infrastructure_links),
+            dtype=np.float64)
+        self._dirty_links: set[NetworkLink] = network.track_dirty_links()
+        self._dirty_links.update(self._infrastructure_links)
+        self._processed_events: int = 0
+        self._admitted: int = 0
+        self._rejected: int = 0
+        self._metrics: dict[str, list[float]] = {
+            "time": [],
+            "active_devices": [],
+            "mean_utilization": [],
+            "max_utilization": [],
+            "admitted": [],
+            "rejected": []}
+        self._schedule_arrival(self._generate_uav_event,
+                               self._uav_event_rate)
+        self._schedule_arrival(self._generate_cam_event,
+                               self._cam_event_rate)
+        self._schedule_arrival(self._generate_link_load_event,
+                               self._link_load_rate)
+        self._schedule(0.0, self._sample_metrics, None)
+
+    @property
+    def network(self) -> Network:
+        """Returns the simulated Network.
+
+        Returns:
+            Network: The simulated Network.
+        """
+        return self._network
+
+    @property
+    def now(self) -> float:
+        """Returns the current simulated time expressed in s.
+
+        Returns:
+            float: The current simulated time.
+        """
+        return self._now
+
+    @property
+    def processed_events(self) -> int:
+        """Returns the number of events processed so far, including the
+        sampling of the metrics.
+
+        Returns:
+            int: The number of events processed so far.
+        """
+        return self._processed_events
+
+    @property
+    def metrics(self) -> dict[str, np.ndarray]:
+        """Returns the time series of the metrics sampled so far: the
+        number of active NetworkDevices, the mean and maximum
+        utilization of the NetworkLinks that do not connect
+        NetworkDevices and the accumulated number of admitted and
+        rejected routing requests.
+
+        Returns:
+            dict[str, np.ndarray]: The time series, one per metric,
+            indexed by the name of the metric. All of them are aligned
+            with the "time" series.
+        """
+        return {name: np.array(values)
+                for name, values in self._metrics.items()}
+
+    def load_events(self, events: Iterable[NetworkEvent]) -> None:
+        """Feeds a stream of recorded events, e.g. a TraceReader, into
+        the simulation. The stream is consumed lazily, one event ahead.
+
+        Args:
+            events (Iterable[NetworkEvent]): The events, sorted by
+            timestamp.
+        """
+        self._events = iter(events)
+        self._schedule_next_recorded_event()
+
+    def run(self, until: float) -> None:
+        """Processes all the events up to the given simulated time.
+
+        Args:
+            until (float): The simulated time at which the simulation
+            stops expressed in s.
+        """
+        while (len(self._queue) > 0 and self._queue[0][0] <= until):
+            self.step()
+        self._now = max(self._now, until)
+
+    def step(self) -> bool:
+        """Processes the next event.
+
+        Returns:
+            bool: Whether there was an event to process.
+        """
+        if (len(self._queue) == 0):
+            return False
+        timestamp, _, handler, argument = heapq.heappop(self._queue)
+        self._now = timestamp
+        handler(argument)
+        self._processed_events += 1
+        return True
+
+    def _schedule(self,
+                  timestamp: float,
+                  handler: Callable,
+                  argument: Any) -> None:
+        """Adds an event to the queue.
+
+        Args:
+            timestamp (float): The moment in which the event happens.
+            handler (Callable): The function that processes the event.
+            argument (Any): The argument passed to the handler.
+        """
+        heapq.heappush(self._queue,
+                       (timestamp, next(self._sequence), handler, argument))
+
+    def _exponential(self, mean: float) -> float:
+        """Draws a value from an exponential distribution using the
+        random stream of the Network.
+
+        Args:
+            mean (float): The mean of the distribution.
+
+        Returns:
+            float: The drawn value.
+        """
+        return -mean * math.log(1.0 - self._network.random.random())
+
+    def _schedule_arrival(self, handler: Callable, rate: float) -> None:
+        """Schedules the next arrival of a Poisson process.
+
+        Args:
+            handler (Callable): The function that processes the arrival.
+            rate (float): The rate of the process. If not positive,
+            nothing is scheduled.
+        """
+        if (rate > 0.0):
+            self._schedule(self._now + self._exponential(1.0 / rate),
+                           handler,
+                           None)
+
+    def _route(self, device: NetworkDevice) -> bool:
+        """Asks the routing policy for a path while the current one of
+        the NetworkDevice is still allocated, so that the policy can
+        keep it, and then replaces the current path with the chosen
+        one. If it cannot be allocated, neither in a single path nor
+        split, the current path is restored.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice to route.
+
+        Returns:
+            bool: Whether the NetworkDevice could be routed.
+        """
+        path = self._routing_policy(self._network, device)
+        old_path: list[NetworkLink] = self._network.get_path_device(device)
+        # The throughput of every NetworkLink, as the old path may have
+        # been split
+        old_split: list[tuple[list[NetworkLink], float]] = [
+            ([l], l.allocation(device)) for l in old_path]
+        self._network.free_path_device(device, old_path)
+        if (path != None and self._network.assign_path_to_device(device,
+                                                                 path)):
+            self._admitted += 1
+            return True
+        if (self._max_paths > 1):
+            try:
+                split = self._network.split_flow_to_gw(
+                    device,
+                    self._network.gateways[0],
+                    self._max_paths)
+            except nx.NetworkXNoPath:
+                split = None
+            if (split != None
+                and self._network.assign_multipath_to_device(device, split)):
+                self._admitted += 1
+                return True
+        if (len(old_split) > 0):
+            self._network.assign_multipath_to_device(device, old_split)
+        self._rejected += 1
+        return False
+
+    def _generate_uav_event(self, _: Any) -> None:
+        """Moves a random UAV and reroutes it."""
+        self._route(self._network.generate_uav_event())
+        self._schedule_arrival(self._generate_uav_event,
+                               self._uav_event_rate)
+
+    def _generate_cam_event(self, _: Any) -> None:
+        """Starts a random camera, routes it and schedules its stop."""
+        cam = self._network.generate_cam_event()
+        if (cam != None):
+            self._route(cam)
+            self._schedule(self._now
+                           + self._exponential(self._cam_mean_duration),
+                           self._stop_cam,
+                           (cam, self._network.cam_session(cam)))
+        self._schedule_arrival(self._generate_cam_event,
+                               self._cam_event_rate)
+
+    def _stop_cam(self, stop: tuple[NetworkDevice, int]) -> None:
+        """Stops a camera if it is still in the streaming for which the
+        stop was scheduled. Stops of streamings that already ended, even
+        if the camera was restarted since then, are stale.
+        """
+        cam, session = stop
+        if (cam in self._network.active_cams
+            and self._network.cam_session(cam) == session):
+            self._network.stop_cam(cam)
+
+    def _generate_link_load_event(self, _: Any) -> None:
+        """Changes the background load of a random NetworkLink."""
+        link = self._infrastructure_links[self._network.random.integers(
+            len(self._infrastructure_links))]
+        load = link.max_throughput * self._max_link_load\
+            * self._network.random.random()
+        self._network.set_background_load(link, load)
+        self._schedule_arrival(self._generate_link_load_event,
+                               self._link_load_rate)
+
+    def _schedule_next_recorded_event(self) -> None:
+        """Schedules the next event of the recorded stream, if any."""
+        event: NetworkEvent | None = next(self._events, None)
+        if (event != None):
+            self._schedule(max(event.timestamp, self._now),
+                           self._apply_recorded_event,
+                           event)
+
+    def _apply_recorded_event(self, event: NetworkEvent) -> None:
+        """Applies a recorded event and routes the NetworkDevice if its
+        workflow needs a new path.
+        """
+        device = self._network.apply_event(event)
+        if (device != None and device.is_active):
+            self._route(device)
+        self._schedule_next_recorded_event()
+
+    def _sample_metrics(self, _: Any) -> None:
+        """Appends the current value of the metrics to the time series.
+        """
+        for l in self._dirty_links:
+            position: int | None = self._link_positions.get(l)
+            if (position != None):
+                self._utilizations[position] =\
+                    (l.max_throughput - l.available_throughput)\
+                    / l.max_throughput
+        self._dirty_links.clear()
+        utilizations = self._utilizations
+        n_active = len(self._network.active_cams) + sum(
+            u.is_active for u in self._network.uavs)
+        self._metrics["time"].append(self._now)
+        self._metrics["active_devices"].append(n_active)
+        self._metrics["mean_utilization"].append(utilizations.mean())
+        self._metrics["max_utilization"].append(utilizations.max())
+        self._metrics["admitted"].append(self._admitted)
+        self._metrics["rejected"].append(self._rejected)
+        self._schedule(self._now + self._metrics_period,
+                       self._sample_metrics,
+                       None)
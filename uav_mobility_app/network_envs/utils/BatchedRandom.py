@@ -0,0 +1,91 @@
+import numpy as np
+
+
+class BatchedRandom(object):
+    """Draws pseudorandom numbers from a numpy.random.Generator in
+    batches, so the cost of calling into NumPy is paid once per batch
+    rather than once per number. Two instances built from generators
+    with the same seed produce the same sequence.
+    """
+
+
+    def __init__(self,
+                 generator: np.random.Generator = None,
+                 batch_size: int = 1024) -> None:
+        """Creates the batched sampler.
+
+        Args:
+            generator (np.random.Generator, optional): The generator to
+            draw from. Defaults to a new unseeded generator.
+            batch_size (int, optional): The number of values drawn at
+            once. Defaults to 1024.
+        """
+        if (generator == None):
+            generator = np.random.default_rng()
+        self._generator: np.random.Generator = generator
+        self._batch_size: int = batch_size
+        self._batch: list[float] = []
+        self._next: int = 0
+
+    @property
+    def generator(self) -> np.random.Generator:
+        """Returns the underlying generator.
+
+        Returns:
+            np.random.Generator: The underlying generator.
+        """
+        return self._generator
+
+    def seed(self, seed: int) -> None:
+        """Reseeds the underlying generator in place, so that whoever
+        shares it keeps drawing from it, and discards the values drawn
+        in advance.
+
+        Args:
+            seed (int): The seed.
+        """
+        bit_generator = self._generator.bit_generator
+        bit_generator.state = type(bit_generator)(seed).state
+        self._batch = []
+        self._next = 0
+
+    def random(self) -> float:
+        """Returns a float drawn uniformly from [0, 1).
+
+        Returns:
+            float: The drawn value.
+        """
+        if (self._next >= len(self._batch)):
+            self._batch = self._generator.random(self._batch_size).tolist()
+            self._next = 0
+        value: float = self._batch[self._next]
+        self._next += 1
+        return value
+
+    def integers(self, high: int) -> int:
+        """Returns an int drawn uniformly from [0, high).
+
+        Args:
+            high (int): The exclusive upper bound.
+
+        Raises:
+            ValueError: If high is not positive.
+
+        Returns:
+            int: The drawn value.
+        """
+        if (high <= 0):
+            raise ValueError(f"Expected a positive upper bound, got {high}.")
+        return min(int(self.random() * high), high - 1)
+
+    def uniform(self, low: float, high: float) -> float:
+        """Returns a float drawn uniformly from [low, high).
+
+        Args:
+            low (float): The lower bound.
+            high (float): The upper bound.
+
+        Returns:
+            float: The drawn value.
+        """
+        return low + (high - low) * self.random()
@@ -0,0 +1,232 @@
+import heapq
+import math
+from itertools import count
+from typing import Iterable
+import numpy as np
+
+
+class CSRGraph(object):
+    """A static directed graph whose nodes and edges are dense integer
+    ids, stored in compressed sparse row (CSR) arrays: the out-edges of
+    node u are the positions offsets[u] to offsets[u + 1] of the targets
+    and edge_ids arrays. The reverse graph is stored the same way. Edge
+    attributes are kept by the owner in arrays indexed by edge id, so
+    the searches only touch arrays.
+    """
+
+
+    def __init__(self,
+                 n_nodes: int,
+                 sources: Iterable[int],
+                 targets: Iterable[int]) -> None:
+        """Builds the graph. The edge ids are the positions of the edges
+        in the given sequences, and the out-edges of each node keep the
+        order in which they are given.
+
+        Args:
+            n_nodes (int): The number of nodes.
+            sources (Iterable[int]): The source of each edge.
+            targets (Iterable[int]): The target of each edge.
+        """
+        sources = np.asarray(list(sources), dtype=np.int64)
+        targets = np.asarray(list(targets), dtype=np.int64)
+        self._n_nodes: int = n_nodes
+        self._n_edges: int = len(sources)
+        self._offsets, self._targets, self._edge_ids =\
+            self._compress(n_nodes, sources, targets)
+        self._reverse_offsets, self._reverse_targets, self._reverse_edge_ids =\
+            self._compress(n_nodes, targets, sources)
+        # Python lists are faster than NumPy arrays to index one
+        # element at a time, which is what the searches do
+        self._offsets_list: list[int] = self._offsets.tolist()
+        self._targets_list: list[int] = self._targets.tolist()
+        self._edge_ids_list: list[int] = self._edge_ids.tolist()
+        self._reverse_offsets_list: list[int] = self._reverse_offsets.tolist()
+        self._reverse_targets_list: list[int] = self._reverse_targets.tolist()
+        self._reverse_edge_ids_list: list[int] =\
+            self._reverse_edge_ids.tolist()
+
+    @property
+    def n_nodes(self) -> int:
+        """Returns the number of nodes.
+
+        Returns:
+            int: The number of nodes.
+        """
+        return self._n_nodes
+
+    @property
+    def n_edges(self) -> int:
+        """Returns the number of edges.
+
+        Returns:
+            int: The number of edges.
+        """
+        return self._n_edges
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Returns where the out-edges of each node start, plus the
+        total number of edges at the end.
+
+        Returns:
+            np.ndarray: The n_nodes + 1 offsets.
+        """
+        return self._offsets
+
+    @property
+    def targets(self) -> np.ndarray:
+        """Returns the target of the out-edges, grouped by source.
+
+        Returns:
+            np.ndarray: The targets.
+        """
+        return self._targets
+
+    @property
+    def edge_ids(self) -> np.ndarray:
+        """Returns the id of the out-edges, grouped by source.
+
+        Returns:
+            np.ndarray: The edge ids.
+        """
+        return self._edge_ids
+
+    def out_edges(self, u: int) -> list[tuple[int, int]]:
+        """Returns the out-edges of a node.
+
+        Args:
+            u (int): The node.
+
+        Returns:
+            list[tuple[int, int]]: Pairs of target and edge id.
+        """
+        start, end = self._offsets_list[u], self._offsets_list[u + 1]
+        return list(zip(self._targets_list[start:end],
+                        self._edge_ids_list[start:end]))
+
+    def in_edges(self, v: int) -> list[tuple[int, int]]:
+        """Returns the in-edges of a node.
+
+        Args:
+            v (int): The node.
+
+        Returns:
+            list[tuple[int, int]]: Pairs of source and edge id.
+        """
+        start = self._reverse_offsets_list[v]
+        end = self._reverse_offsets_list[v + 1]
+        return list(zip(self._reverse_targets_list[start:end],
+                        self._reverse_edge_ids_list[start:end]))
+
+    def bfs_distances(self,
+                      sources: Iterable[int],
+                      reverse: bool = False) -> np.ndarray:
+        """Computes the number of hops from the sources to every node,
+        or from every node to the sources if reverse is True.
+
+        Args:
+            sources (Iterable[int]): The nodes where the search starts.
+            reverse (bool, optional): Whether to follow the edges
+            backwards. Defaults to False.
+
+        Returns:
+            np.ndarray: The distance of each node, inf if unreachable.
+        """
+        offsets = self._reverse_offsets_list if reverse\
+            else self._offsets_list
+        targets = self._reverse_targets_list if reverse\
+            else self._targets_list
+        distances: list[float] = [math.inf] * self._n_nodes
+        frontier: list[int] = list(sources)
+        for s in frontier:
+            distances[s] = 0
+        hops = 0
+        while (len(frontier) > 0):
+            hops += 1
+            next_frontier: list[int] = []
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if (distances[v] == math.inf):
+                        distances[v] = hops
+                        next_frontier.append(v)
+            frontier = next_frontier
+        return np.array(distances, dtype=np.float64)
+
+    def dijkstra(self,
+                 source: int,
+                 target: int,
+                 weights: list[float],
+                 usable: list[bool] = None,
+                 initial_distance: float = 0.0) -> list[int] | None:
+        """Computes the path with the least total weight between two
+        nodes.
+
+        Args:
+            source (int): The node where the path starts.
+            target (int): The node where the path ends.
+            weights (list[float]): The non-negative weight of each edge,
+            indexed by edge id.
+            usable (list[bool], optional): Whether each edge, indexed by
+            edge id, can be used. Defaults to all of them.
+            initial_distance (float, optional): The distance the path
+            already has at the source, e.g. to account for a previous
+            hop that is not part of the graph. Defaults to 0.0.
+
+        Returns:
+            list[int] | None: The nodes of the path, or None if there is
+            none.
+        """
+        offsets = self._offsets_list
+        targets = self._targets_list
+        edge_ids = self._edge_ids_list
+        sequence = count()
+        distances: dict[int, float] = {}
+        seen: dict[int, float] = {source: initial_distance}
+        parents: dict[int, int] = {source: -1}
+        # Heap of (distance, sequence number, node)
+        queue = [(initial_distance, next(sequence), source)]
+        while (len(queue) > 0):
+            distance, _, u = heapq.heappop(queue)
+            if (u in distances):
+                continue
+            distances[u] = distance
+            if (u == target):
+                path: list[int] = [u]
+                while (parents[path[-1]] != -1):
+                    path.append(parents[path[-1]])
+                return path[::-1]
+            for position in range(offsets[u], offsets[u + 1]):
+                edge = edge_ids[position]
+                if (usable != None and not usable[edge]):
+                    continue
+                v = targets[position]
+                new_distance = distance + weights[edge]
+                if (v not in distances
+                    and (v not in seen or new_distance < seen[v])):
+                    seen[v] = new_distance
+                    parents[v] = u
+                    heapq.heappush(queue, (new_distance, next(sequence), v))
+        return None
+
+    def _compress(self,
+                  n_nodes: int,
+                  sources: np.ndarray,
+                  targets: np.ndarray) -> tuple[np.ndarray,
+                                                np.ndarray,
+                                                np.ndarray]:
+        """Groups the edges by source.
+
+        Args:
+            n_nodes (int): The number of nodes.
+            sources (np.ndarray): The source of each edge.
+            targets (np.ndarray): The target of each edge.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: The offsets, the
+            targets and the edge ids.
+        """
+        order = np.argsort(sources, kind="stable")
+        offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=n_nodes), out=offsets[1:])
+        return offsets, targets[order], order.astype(np.int64)
@@ -0,0 +1,133 @@
+import math
+from typing import Any
+
+
+class GridIndex(object):
+    """A spatial index that buckets items into the cells of a uniform
+    grid according to their positions, so the nearest item to a point
+    is found by inspecting only the surrounding cells.
+    """
+
+
+    def __init__(self,
+                 items: list[Any],
+                 positions: list[tuple[float, float]],
+                 cell_size: float = None) -> None:
+        """Buckets the items into the grid.
+
+        Args:
+            items (list[Any]): The items to index.
+            positions (list[tuple[float, float]]): The position of each
+            item.
+            cell_size (float, optional): The side of the grid cells. By
+            default, it is chosen so that there is about one item per
+            cell.
+        """
+        if (len(items) != len(positions)):
+            raise ValueError("There must be one position per item.")
+        if (len(items) == 0):
+            raise ValueError("Cannot index an empty list of items.")
+        self._items: list[Any] = list(items)
+        self._positions: list[tuple[float, float]] =\
+            [(float(p[0]), float(p[1])) for p in positions]
+        min_x = min(p[0] for p in self._positions)
+        max_x = max(p[0] for p in self._positions)
+        min_y = min(p[1] for p in self._positions)
+        max_y = max(p[1] for p in self._positions)
+        if (cell_size == None):
+            area = max(max_x - min_x, 1.0) * max(max_y - min_y, 1.0)
+            cell_size = math.sqrt(area / len(self._items))
+        self._cell_size: float = cell_size
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        for i, p in enumerate(self._positions):
+            self._cells.setdefault(self._cell_of(p), []).append(i)
+        self._min_cell: tuple[int, int] = self._cell_of((min_x, min_y))
+        self._max_cell: tuple[int, int] = self._cell_of((max_x, max_y))
+
+    @property
+    def cell_size(self) -> float:
+        """Returns the side of the grid cells.
+
+        Returns:
+            float: The side of the grid cells.
+        """
+        return self._cell_size
+
+    def _cell_of(self, position: tuple[float, float]) -> tuple[int, int]:
+        """Returns the grid cell that contains the given position.
+
+        Args:
+            position (tuple[float, float]): The position.
+
+        Returns:
+            tuple[int, int]: The coordinates of the cell.
+        """
+        return (math.floor(position[0] / self._cell_size),
+                math.floor(position[1] / self._cell_size))
+
+    def nearest(self, position: tuple[float, float]) -> Any:
+        """Returns the item that is closest to the given position. The
+        rings of cells around the position are inspected in order until
+        no unexplored cell can contain a closer item. Ties are broken in
+        favour of the item that was indexed first.
+
+        Args:
+            position (tuple[float, float]): The position.
+
+        Returns:
+            Any: The closest item.
+        """
+        cx, cy = self._cell_of(position)
+        min_x, min_y = self._min_cell
+        max_x, max_y = self._max_cell
+        # Rings before this one are empty for sure: they do not reach the
+        # cells where there are items
+        min_ring = max(min_x - cx, cx - max_x, min_y - cy, cy - max_y, 0)
+        # Rings beyond this one are empty for sure
+        max_ring = max(abs(cx - min_x),
+                       abs(cx - max_x),
+                       abs(cy - min_y),
+                       abs(cy - max_y))
+        best_index: int = -1
+        best_dist: float = math.inf
+        for ring in range(min_ring, max_ring + 1):
+            # Any item in this ring or the next ones is at least this far
+            if (best_dist < (ring - 1) * self._cell_size):
+                break
+            for cell in self._ring_cells(cx, cy, ring):
+                for i in self._cells.get(cell, ()):
+                    p = self._positions[i]
+                    dist = math.hypot(p[0] - position[0],
+                                      p[1] - position[1])
+                    if (dist < best_dist
+                        or (dist == best_dist and i < best_index)):
+                        best_index = i
+                        best_dist = dist
+        return self._items[best_index]
+
+    def _ring_cells(self, cx: int, cy: int, ring: int):
+        """Yields the cells whose Chebyshev distance to the given cell
+        is exactly ring, skipping the ones outside the cells where there
+        are items, so a position far from the items costs as much as a
+        close one.
+
+        Args:
+            cx (int): The first coordinate of the central cell.
+            cy (int): The second coordinate of the central cell.
+            ring (int): The distance to the central cell.
+        """
+        min_x, min_y = self._min_cell
+        max_x, max_y = self._max_cell
+        if (ring == 0):
+            yield (cx, cy)
+            return
+        xs = range(max(cx - ring, min_x), min(cx + ring, max_x) + 1)
+        for y in (cy - ring, cy + ring):
+            if (min_y <= y <= max_y):
+                for x in xs:
+                    yield (x, y)
+        ys = range(max(cy - ring + 1, min_y), min(cy + ring - 1, max_y) + 1)
+        for x in (cx - ring, cx + ring):
+            if (min_x <= x <= max_x):
+                for y in ys:
+                    yield (x, y)
@@ -0,0 +1,84 @@
+from typing import Any, Iterable, Iterator
+from network_envs.utils.BatchedRandom import BatchedRandom
+
+
+class IndexedSet(object):
+    """A set that also keeps its items in a dense list, so that adding,
+    removing, checking membership and drawing a random item all take
+    constant time. Removing an item moves the last one into its slot,
+    hence the order of the items is not preserved.
+    """
+
+
+    def __init__(self, items: Iterable[Any] = ()) -> None:
+        """Creates the set with the given items.
+
+        Args:
+            items (Iterable[Any], optional): The initial items.
+            Defaults to ().
+        """
+        self._items: list[Any] = []
+        self._positions: dict[Any, int] = {}
+        for item in items:
+            self.add(item)
+
+    def add(self, item: Any) -> bool:
+        """Adds an item to the set.
+
+        Args:
+            item (Any): The item to add.
+
+        Returns:
+            bool: Whether the item was not in the set yet.
+        """
+        if (item in self._positions):
+            return False
+        self._positions[item] = len(self._items)
+        self._items.append(item)
+        return True
+
+    def remove(self, item: Any) -> bool:
+        """Removes an item from the set.
+
+        Args:
+            item (Any): The item to remove.
+
+        Returns:
+            bool: Whether the item was in the set.
+        """
+        position: int | None = self._positions.pop(item, None)
+        if (position == None):
+            return False
+        last: Any = self._items.pop()
+        if (position < len(self._items)):
+            self._items[position] = last
+            self._positions[last] = position
+        return True
+
+    def clear(self) -> None:
+        """Removes all the items from the set."""
+        self._items.clear()
+        self._positions.clear()
+
+    def sample(self, random: BatchedRandom) -> Any:
+        """Draws an item uniformly at random.
+
+        Args:
+            random (BatchedRandom): The source of randomness.
+
+        Returns:
+            Any: The drawn item.
+        """
+        return self._items[random.integers(len(self._items))]
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._positions
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(list(self._items))
+
+    def __getitem__(self, index: int) -> Any:
+        return self._items[index]
@@ -0,0 +1,293 @@
+import math
+from typing import Iterable
+import networkx as nx
+import numpy as np
+from network_envs.entities.Network import Network
+from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.enums.ObservationFeature import ObservationFeature
+
+
+class LinkFeatureExtractor(object):
+    """Computes the ObservationFeatures of the candidate NetworkLinks of
+    a Network. The features that only depend on the NetworkLinks are
+    kept in a matrix with a row per NetworkLink, updated incrementally
+    as the NetworkLinks change, so the observations of all the
+    candidates are gathered in a single vectorized pass over their
+    positions and only the features that depend on the NetworkDevice
+    are filled in afterwards. Candidates that are not NetworkLinks
+    (padding) get the worst value of every feature.
+    """
+
+
+    def __init__(self,
+                 network: Network,
+                 features: Iterable[ObservationFeature],
+                 max_delay: float) -> None:
+        """Creates the matrix and subscribes to the Network.
+
+        Args:
+            network (Network): The Network.
+            features (Iterable[ObservationFeature]): The features, in
+            the order of the columns of the observations.
+            max_delay (float): The largest delay of a NetworkLink.
+
+        Raises:
+            ValueError: If no feature or a repeated one is given.
+        """
+        self._feature_list: tuple[ObservationFeature, ...] = tuple(features)
+        if (len(self._feature_list) == 0
+            or len(set(self._feature_list)) < len(self._feature_list)):
+            raise ValueError(
+                f"Expected distinct observation features, got "
+                f"{self._feature_list}.")
+        self._network: Network = network
+        self._columns: dict[ObservationFeature, int] = {
+            f: i for i, f in enumerate(self._feature_list)}
+        # Bounds of every feature and whether its worst value is the
+        # upper one
+        links: list[NetworkLink] = network.network_links
+        n_nodes: float = float(len(network.nodes))
+        max_throughput: float = max(l.max_throughput for l in links)
+        max_delay_req: float = max(d.delay_req
+                                   for d in network.network_devices)
+        bounds: dict[ObservationFeature, tuple[float, float, bool]] = {
+            ObservationFeature.ROUTED: (0.0, 1.0 + 1.0, True),
+            ObservationFeature.DELAY: (0.0, max_delay + 1.0, True),
+            ObservationFeature.THROUGHPUT: (0.0, max_throughput, False),
+            ObservationFeature.HOPS: (0.0, n_nodes, True),
+            ObservationFeature.BOTTLENECK: (0.0, max_throughput, False),
+            ObservationFeature.FLOWS: (
+                0.0,
+                float(len(network.network_devices)),
+                True),
+            ObservationFeature.DELAY_BUDGET: (-max_delay * n_nodes,
+                                              max_delay_req,
+                                              False)}
+        self._low: np.ndarray = np.array(
+            [bounds[f][0] for f in self._feature_list], dtype=np.float32)
+        self._high: np.ndarray = np.array(
+            [bounds[f][1] for f in self._feature_list], dtype=np.float32)
+        worst_is_high: np.ndarray = np.array(
+            [bounds[f][2] for f in self._feature_list], dtype=np.bool_)
+        self._padding: np.ndarray = np.where(worst_is_high,
+                                             self._high,
+                                             self._low)
+        # Sorting by sign * value puts the best candidates and then the
+        # padding first
+        self._sort_sign: np.ndarray = np.where(worst_is_high,
+                                               1.0,
+                                               -1.0).astype(np.float32)
+        self._link_positions: dict[NetworkLink, int] = {
+            l: i for i, l in enumerate(links)}
+        # The row after the last NetworkLink holds the padding
+        self._padding_position: int = len(links)
+        self._link_features: np.ndarray = np.tile(self._padding,
+                                                  (len(links) + 1, 1))
+        self._delays: np.ndarray = np.full(len(links) + 1,
+                                           math.inf,
+                                           dtype=np.float64)
+        # The destination of every NetworkLink, which changes for the
+        # up NetworkLink of a UAV when it is handed over. The
+        # NetworkLinks towards NetworkDevices never lead to the Gateway
+        self._targets: np.ndarray = np.zeros(len(links), dtype=np.intp)
+        nodes = network.network_nodes
+        node_positions: dict = {n: i for i, n in enumerate(nodes)}
+        hops: dict = {}
+        for (_, v, l) in network.edges(data="data"):
+            self._targets[self._link_positions[l]] = node_positions.get(
+                v,
+                len(nodes))
+            if (v not in hops):
+                hops[v] = (self._hops_to_gw(v) if (v in node_positions)
+                           else math.inf)
+            if (ObservationFeature.HOPS in self._columns):
+                self._link_features[self._link_positions[l],
+                                    self._columns[
+                                        ObservationFeature.HOPS]] = min(
+                    hops[v],
+                    bounds[ObservationFeature.HOPS][1])
+        self._nodes: list = nodes
+        self._node_positions: dict = node_positions
+        self._bottlenecks_stale: bool = True
+        for l in links:
+            self._update_link(l)
+        network.subscribe(self._update_link)
+        network.subscribe_handovers(self._on_handover)
+
+    @property
+    def features(self) -> tuple[ObservationFeature, ...]:
+        """Returns the features, in the order of the columns.
+
+        Returns:
+            tuple[ObservationFeature, ...]: The features.
+        """
+        return self._feature_list
+
+    @property
+    def low(self) -> np.ndarray:
+        """Returns the lower bound of every feature.
+
+        Returns:
+            np.ndarray: The lower bounds.
+        """
+        return self._low.copy()
+
+    @property
+    def high(self) -> np.ndarray:
+        """Returns the upper bound of every feature.
+
+        Returns:
+            np.ndarray: The upper bounds.
+        """
+        return self._high.copy()
+
+    @property
+    def padding(self) -> np.ndarray:
+        """Returns the worst value of every feature, which is the one
+        observed for the candidates that are not NetworkLinks.
+
+        Returns:
+            np.ndarray: The worst values.
+        """
+        return self._padding.copy()
+
+    def _hops_to_gw(self, node: NetworkNode) -> float:
+        """Returns the hops between a NetworkNode and the Gateway, or
+        infinity if it cannot be reached.
+
+        Args:
+            node (NetworkNode): The NetworkNode.
+
+        Returns:
+            float: The number of hops.
+        """
+        try:
+            return self._network.hops_to_gw(node)
+        except nx.NetworkXNoPath:
+            return math.inf
+
+    def _update_link(self, link: NetworkLink) -> None:
+        """Updates the row of a NetworkLink that changed.
+
+        Args:
+            link (NetworkLink): The NetworkLink that changed.
+        """
+        position: int = self._link_positions[link]
+        delay: float = link.delay
+        self._delays[position] = delay
+        row: np.ndarray = self._link_features[position]
+        for feature, value in (
+                (ObservationFeature.DELAY, delay),
+                (ObservationFeature.THROUGHPUT, link.available_throughput),
+                (ObservationFeature.FLOWS, len(link.routed_flows))):
+            column: int | None = self._columns.get(feature)
+            if (column != None):
+                row[column] = min(value, self._high[column])
+        self._bottlenecks_stale = True
+
+    def _on_handover(self,
+                     uav: NetworkDevice,
+                     old_ap: NetworkNode,
+                     new_ap: NetworkNode) -> None:
+        """Points the up NetworkLink of a UAV that was handed over to
+        its new AP.
+
+        Args:
+            uav (NetworkDevice): The UAV.
+            old_ap (NetworkNode): The AP it left.
+            new_ap (NetworkNode): The AP it is connected to.
+        """
+        up_link: NetworkLink = self._network[uav][new_ap]["data"]
+        position: int = self._link_positions[up_link]
+        self._targets[position] = self._node_positions[new_ap]
+        column: int | None = self._columns.get(ObservationFeature.HOPS)
+        if (column != None):
+            self._link_features[position, column] = min(
+                self._hops_to_gw(new_ap),
+                self._high[column])
+        self._bottlenecks_stale = True
+
+    def _refresh_bottlenecks(self) -> None:
+        """Recomputes the column of the bottlenecks: the least of the
+        available throughput of every NetworkLink and the bottleneck of
+        the widest path from its destination to the Gateway.
+        """
+        widths: dict = self._network.bottleneck_widths()
+        bottlenecks = np.array([widths.get(n, 0.0) for n in self._nodes]
+                               + [0.0])
+        column: int = self._columns[ObservationFeature.BOTTLENECK]
+        available = np.array([l.available_throughput
+                              for l in self._link_positions])
+        self._link_features[:-1, column] = np.minimum(
+            np.minimum(bottlenecks[self._targets], available),
+            self._high[column])
+        self._bottlenecks_stale = False
+
+    def extract(self,
+                device: NetworkDevice,
+                delay_budget: float,
+                candidates: list[ExtendedNetworkLink]) -> np.ndarray:
+        """Returns the features of the candidate NetworkLinks.
+
+        Args:
+            device (NetworkDevice): The NetworkDevice being routed.
+            delay_budget (float): The delay that the NetworkDevice can
+            still afford before taking any of the candidates.
+            candidates (list[ExtendedNetworkLink]): The candidates, as
+            returned by Network.get_next_link, possibly padded with
+            tuples that are not edges.
+
+        Returns:
+            np.ndarray: The (candidates, features) array.
+        """
+        routed_column: int | None = self._columns.get(
+            ObservationFeature.ROUTED)
+        positions: list[int] = []
+        routed: list[float] = []
+        for (_, _, l) in candidates:
+            if (isinstance(l, dict)):
+                link: NetworkLink = l["data"]
+                positions.append(self._link_positions[link])
+                routed.append(0.0 if (device in link.routed_flows) else 1.0)
+            else:
+                positions.append(self._padding_position)
+                if (routed_column != None):
+                    routed.append(float(self._padding[routed_column]))
+        if (self._bottlenecks_stale
+            and ObservationFeature.BOTTLENECK in self._columns):
+            self._refresh_bottlenecks()
+        observations: np.ndarray = self._link_features.take(positions,
+                                                            axis=0)
+        if (routed_column != None):
+            observations[:, routed_column] = routed
+        column: int | None = self._columns.get(
+            ObservationFeature.DELAY_BUDGET)
+        if (column != None):
+            # The infinite delay of the padding gives the lower bound
+            observations[:, column] = np.clip(
+                delay_budget - self._delays.take(positions),
+                self._low[column],
+                self._high[column])
+        return observations
+
+    def sort(self, observations: np.ndarray) -> np.ndarray:
+        """Sorts the observations from the best to the worst candidate,
+        comparing the features in order. The padding goes last.
+
+        Args:
+            observations (np.ndarray): The (candidates, features) array.
+
+        Returns:
+            np.ndarray: The sorted observations.
+        """
+        keys: np.ndarray = observations * self._sort_sign
+        # np.lexsort uses the last key as the primary one
+        return observations.take(np.lexsort(keys.T[::-1]), axis=0)
+
+    def close(self) -> None:
+        """Unsubscribes from the Network."""
+        self._network.unsubscribe(self._update_link)
+        self._network.unsubscribe_handovers(self._on_handover)
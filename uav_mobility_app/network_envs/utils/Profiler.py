@@ -0,0 +1,166 @@
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator
+import numpy as np
+
+
+class Profiler(object):
+    """Counts the calls to the instrumented methods and times them. The
+    methods are instrumented by shadowing them with timed wrappers in
+    the instances, so while profiling is off they run untouched, without
+    any overhead. For each name, the number of calls, the cumulative
+    time and the percentiles of the last max_samples durations are
+    kept. Times are inclusive: a method that calls another instrumented
+    method also accounts for its time.
+    """
+
+
+    def __init__(self, max_samples: int = 4096) -> None:
+        """Creates the profiler.
+
+        Args:
+            max_samples (int, optional): The number of durations per
+            name kept for the percentiles. Defaults to 4096.
+        """
+        self._max_samples: int = max_samples
+        self._counts: dict[str, int] = {}
+        # Number of timed calls, which also positions the next duration
+        # in the ring of samples
+        self._timed_counts: dict[str, int] = {}
+        self._totals: dict[str, float] = {}
+        self._samples: dict[str, np.ndarray] = {}
+        self._instrumented: list[tuple[Any, str]] = []
+
+    @property
+    def enabled(self) -> bool:
+        """Returns whether any method is instrumented.
+
+        Returns:
+            bool: Whether any method is instrumented.
+        """
+        return len(self._instrumented) > 0
+
+    def instrument(self,
+                   target: Any,
+                   method_names: Iterable[str],
+                   prefix: str = None) -> None:
+        """Times the given methods of an object until restore is called.
+        Methods that are already instrumented are left as they are.
+
+        Args:
+            target (Any): The object whose methods are timed.
+            method_names (Iterable[str]): The names of the methods.
+            prefix (str, optional): The prefix of the names under which
+            the methods are reported. Defaults to the name of the class
+            of the object.
+        """
+        if (prefix == None):
+            prefix = type(target).__name__
+        for method_name in method_names:
+            if ((target, method_name) in self._instrumented):
+                continue
+            method: Callable = getattr(target, method_name)
+            setattr(target,
+                    method_name,
+                    self._timed(f"{prefix}.{method_name}", method))
+            self._instrumented.append((target, method_name))
+
+    def restore(self) -> None:
+        """Removes the instrumentation. The statistics are kept."""
+        for target, method_name in self._instrumented:
+            delattr(target, method_name)
+        self._instrumented = []
+
+    def count(self, name: str, n: int = 1) -> None:
+        """Increments a counter that is not timed.
+
+        Args:
+            name (str): The name of the counter.
+            n (int, optional): The increment. Defaults to 1.
+        """
+        self._counts[name] = self._counts.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Times a block of code.
+
+        Args:
+            name (str): The name under which the block is reported.
+        """
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Accounts for a call.
+
+        Args:
+            name (str): The name of the call.
+            elapsed (float): Its duration expressed in s.
+        """
+        self._counts[name] = self._counts.get(name, 0) + 1
+        n: int = self._timed_counts.get(name, 0)
+        self._timed_counts[name] = n + 1
+        self._totals[name] = self._totals.get(name, 0.0) + elapsed
+        if (name not in self._samples):
+            self._samples[name] = np.empty(self._max_samples,
+                                           dtype=np.float64)
+        self._samples[name][n % self._max_samples] = elapsed
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Returns the statistics collected so far.
+
+        Returns:
+            dict[str, dict[str, float]]: For each name, "count" and, for
+            the timed ones, "total", "mean", "p50", "p90", "p99" and
+            "max", expressed in s. The percentiles and the maximum refer
+            to the last max_samples calls.
+        """
+        stats: dict[str, dict[str, float]] = {}
+        for name, n in self._counts.items():
+            stats[name] = {"count": n}
+            if (name not in self._totals):
+                continue
+            timed: int = self._timed_counts[name]
+            samples: np.ndarray = self._samples[name][
+                :min(timed, self._max_samples)]
+            p50, p90, p99 = np.percentile(samples, (50, 90, 99)).tolist()
+            stats[name].update({"total": self._totals[name],
+                                "mean": self._totals[name] / timed,
+                                "p50": p50,
+                                "p90": p90,
+                                "p99": p99,
+                                "max": float(samples.max())})
+        return stats
+
+    def reset(self) -> None:
+        """Discards the statistics collected so far."""
+        self._counts = {}
+        self._timed_counts = {}
+        self._totals = {}
+        self._samples = {}
+
+    def _timed(self, name: str, method: Callable) -> Callable:
+        """Wraps a method so that its calls are recorded.
+
+        Args:
+            name (str): The name under which the method is reported.
+            method (Callable): The bound method.
+
+        Returns:
+            Callable: The wrapper.
+        """
+        perf_counter = time.perf_counter
+        record = self.record
+
+        def timed(*args, **kwargs):
+            start: float = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(name, perf_counter() - start)
+
+        timed.__wrapped__ = method
+        return timed
@@ -0,0 +1,101 @@
+import csv
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+from network_envs.entities.NetworkEvent import NetworkEvent
+from network_envs.enums.NetworkEventType import NetworkEventType
+
+
+class TraceReader(object):
+    """Streams the NetworkEvents recorded in a trace file. The file is
+    a CSV with the header timestamp,event_type,device_id,x,y,ap_id where
+    event_type is the name of a NetworkEventType and the x, y and ap_id
+    fields may be left empty when the event does not use them. Two
+    optional columns, link_id and load, describe the events of type
+    NetworkEventType.LINK_LOAD. The file is read in chunks, so traces of
+    any length can be replayed with a bounded amount of memory.
+    """
+
+
+    def __init__(self, file_path: Path, chunk_size: int = 4096) -> None:
+        """Creates the reader of the trace. The file is not opened
+        until the events are iterated.
+
+        Args:
+            file_path (Path): The path of the trace file.
+            chunk_size (int, optional): The number of rows parsed at
+            once. Defaults to 4096.
+        """
+        self._file_path: Path = Path(file_path)
+        self._chunk_size: int = chunk_size
+
+    @property
+    def file_path(self) -> Path:
+        """Returns the path of the trace file.
+
+        Returns:
+            Path: The path of the trace file.
+        """
+        return self._file_path
+
+    def __iter__(self) -> Iterator[NetworkEvent]:
+        """Yields the events of the trace in order.
+
+        Raises:
+            ValueError: If the timestamps of the trace decrease.
+
+        Yields:
+            NetworkEvent: The next event of the trace.
+        """
+        last_timestamp: float = float("-inf")
+        with open(self._file_path, newline="") as trace_file:
+            reader = csv.DictReader(trace_file)
+            while (True):
+                # The line of every row is captured as it is read, since
+                # the reader is already at the end of the chunk when the
+                # rows are parsed
+                chunk: list[tuple[int, dict]] = [
+                    (reader.line_num, row)
+                    for row in islice(reader, self._chunk_size)]
+                if (len(chunk) == 0):
+                    return
+                for line_num, row in chunk:
+                    event = self._parse_row(row)
+                    if (event.timestamp < last_timestamp):
+                        raise ValueError(
+                            f"Trace {self._file_path} is not sorted by "
+                            f"timestamp (line {line_num}).")
+                    last_timestamp = event.timestamp
+                    yield event
+
+    def _parse_row(self, row: dict) -> NetworkEvent:
+        """Builds a NetworkEvent from a row of the trace.
+
+        Args:
+            row (dict): The row, as read by csv.DictReader.
+
+        Returns:
+            NetworkEvent: The event that the row describes.
+        """
+        position = None
+        if (row.get("x") and row.get("y")):
+            position = (float(row["x"]), float(row["y"]))
+        ap_id = None
+        if (row.get("ap_id")):
+            ap_id = int(row["ap_id"])
+        device_id = None
+        if (row.get("device_id")):
+            device_id = int(row["device_id"])
+        link_id = None
+        if (row.get("link_id")):
+            link_id = int(row["link_id"])
+        load = None
+        if (row.get("load")):
+            load = float(row["load"])
+        return NetworkEvent(float(row["timestamp"]),
+                            NetworkEventType[row["event_type"]],
+                            device_id,
+                            position,
+                            ap_id,
+                            link_id,
+                            load)
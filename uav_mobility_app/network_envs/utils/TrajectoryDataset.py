@@ -0,0 +1,189 @@
+import json
+import os
+from pathlib import Path
+from typing import Any
+import numpy as np
+
+# The name of the file that describes a recorded dataset
+METADATA_FILE = "metadata.json"
+
+# The directory, within the dataset, of the consolidated columns
+COLUMNS_DIRECTORY = "columns"
+
+
+class TrajectoryDataset(object):
+    """Read-only access to a dataset written by TrajectoryRecorder. The
+    first time a dataset is opened, its chunks are consolidated into one
+    .npy file per column (of the steps or of a table of events); from
+    then on the columns are memory-mapped, so opening the dataset is
+    instantaneous and every process that reads it shares the same pages
+    of the operating system's cache.
+    """
+
+
+    def __init__(self, directory: Path) -> None:
+        """Opens the dataset, consolidating its chunks if needed.
+
+        Args:
+            directory (Path): The directory of the dataset.
+
+        Raises:
+            ValueError: If the dataset has no steps.
+        """
+        self._directory: Path = Path(directory)
+        with open(self._directory.joinpath(METADATA_FILE)) as metadata_file:
+            self._metadata: dict[str, Any] = json.load(metadata_file)
+        if (self._metadata["n_steps"] == 0):
+            raise ValueError(f"Dataset {self._directory} has no steps.")
+        columns_directory: Path = self._directory.joinpath(COLUMNS_DIRECTORY)
+        columns_directory.mkdir(exist_ok=True)
+        self._columns: dict[str, np.ndarray] = {}
+        for name, column in self._metadata["columns"].items():
+            self._columns[name] = self._load(
+                name,
+                column,
+                [chunk["n_steps"] for chunk in self._metadata["chunks"]])
+        self._tables: dict[str, dict[str, np.ndarray]] = {}
+        for table, columns in self._metadata.get("tables", {}).items():
+            n_rows: list[int] = [chunk["n_rows"][table]
+                                 for chunk in self._metadata["chunks"]]
+            self._tables[table] = {
+                name: self._load(f"{table}.{name}", column, n_rows)
+                for name, column in columns.items()}
+        # Each episode is a run of consecutive steps with the same number
+        episodes: np.ndarray = np.asarray(self._columns["episode"])
+        self._episode_starts: np.ndarray = np.concatenate((
+            [0],
+            np.flatnonzero(episodes[1:] != episodes[:-1]) + 1,
+            [len(episodes)]))
+
+    @property
+    def directory(self) -> Path:
+        """Returns the directory of the dataset.
+
+        Returns:
+            Path: The directory of the dataset.
+        """
+        return self._directory
+
+    @property
+    def metadata(self) -> dict[str, Any]:
+        """Returns the metadata written by TrajectoryRecorder.
+
+        Returns:
+            dict[str, Any]: The metadata.
+        """
+        return self._metadata
+
+    @property
+    def n_steps(self) -> int:
+        """Returns the number of recorded steps.
+
+        Returns:
+            int: The number of recorded steps.
+        """
+        return self._metadata["n_steps"]
+
+    @property
+    def n_episodes(self) -> int:
+        """Returns the number of recorded episodes.
+
+        Returns:
+            int: The number of recorded episodes.
+        """
+        return len(self._episode_starts) - 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """Returns a column.
+
+        Args:
+            name (str): The name of the column.
+
+        Returns:
+            np.ndarray: The read-only, memory-mapped column, whose first
+            dimension is the step.
+        """
+        return self._columns[name]
+
+    def table(self, name: str) -> dict[str, np.ndarray]:
+        """Returns a table of events, whose rows are sorted by step.
+
+        Args:
+            name (str): The name of the table.
+
+        Raises:
+            KeyError: If the dataset has no such table.
+
+        Returns:
+            dict[str, np.ndarray]: The read-only, memory-mapped columns
+            of the table, whose first dimension is the event.
+        """
+        return self._tables[name]
+
+    def episode(self, index: int) -> range:
+        """Returns the steps of an episode.
+
+        Args:
+            index (int): The index of the episode, in recording order.
+
+        Returns:
+            range: The indexes of its steps.
+        """
+        return range(int(self._episode_starts[index]),
+                     int(self._episode_starts[index + 1]))
+
+    def _load(self,
+              name: str,
+              column: dict[str, Any],
+              n_rows: list[int]) -> np.ndarray:
+        """Memory-maps a column, consolidating it first if needed.
+
+        Args:
+            name (str): The name of the column in the chunks.
+            column (dict[str, Any]): The shape and dtype of the column.
+            n_rows (list[int]): The number of rows per chunk.
+
+        Returns:
+            np.ndarray: The read-only, memory-mapped column.
+        """
+        file_path: Path = self._directory.joinpath(COLUMNS_DIRECTORY,
+                                                   f"{name}.npy")
+        if (not file_path.exists()):
+            self._consolidate(name, column, sum(n_rows), file_path)
+        return np.load(file_path, mmap_mode="r")
+
+    def _consolidate(self,
+                     name: str,
+                     column: dict[str, Any],
+                     n_rows: int,
+                     file_path: Path) -> None:
+        """Concatenates a column of all the chunks into a .npy file.
+        The file is written under a temporary name and renamed at the
+        end, so processes that open the dataset at the same time never
+        see a partial column.
+
+        Args:
+            name (str): The name of the column in the chunks.
+            column (dict[str, Any]): The shape and dtype of the column.
+            n_rows (int): The number of rows of all the chunks.
+            file_path (Path): The file of the column.
+        """
+        temporary_path: Path = file_path.with_name(
+            f"{file_path.name}.{os.getpid()}.tmp")
+        consolidated = np.lib.format.open_memmap(
+            temporary_path,
+            mode="w+",
+            dtype=np.dtype(column["dtype"]),
+            shape=(n_rows, *column["shape"]))
+        offset: int = 0
+        for chunk in self._metadata["chunks"]:
+            with np.load(self._directory.joinpath(chunk["file"])) as data:
+                values: np.ndarray = data[name]
+            consolidated[offset:offset + len(values)] = values
+            offset += len(values)
+        consolidated.flush()
+        del consolidated
+        os.replace(temporary_path, file_path)
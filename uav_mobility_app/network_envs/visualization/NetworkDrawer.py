@@ -0,0 +1,87 @@
+import networkx as nx
+try:
+    import matplotlib
+except ImportError as error:
+    raise ImportError(
+        "Drawing a Network requires matplotlib. Install the optional "
+        "dependencies with: pip install -r requirements-viz.txt") from error
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.entities.ExtendedNetworkLink import ExtendedNetworkLink
+
+
+class NetworkDrawer(object):
+    """Draws a Network with NetworkX and matplotlib. It lives apart from
+    the Network so that matplotlib is only imported the first time
+    something is drawn: importing network_envs or creating an
+    environment does not pay for it.
+    """
+
+
+    def __init__(self, network: nx.DiGraph) -> None:
+        """Creates the drawer of the given Network.
+
+        Args:
+            network (nx.DiGraph): The Network to draw.
+        """
+        self._network: nx.DiGraph = network
+
+    def show_path(self, path: list[ExtendedNetworkLink]) -> None:
+        """Generates a diagram that shows the NetworkLink (edges) of the
+        network that connect a given NetworkDevice with a given
+        NetworkNode of NetworkNodeType AP.
+
+        Args:
+            path (list[ExtendedNetworkLink]): The list of NetworkLinks
+            that the device's request and responses go through to reach
+            the gateway.
+        """
+        path_ids: set[int] = {l[2]["data"].id for l in path}
+        colors = ["#FF0000" if (l["data"].id in path_ids) else "#000000"
+                  for (_, _, l) in self._network.edges(data=True)]
+        self._draw(colors)
+
+    def show_network_info(self) -> None:
+        """Show the information of the network graph. For each node show
+        its name and for each link, the delay that it introduces.
+        """
+        self._draw(None)
+
+    def _draw(self, colors: list[str] | None) -> None:
+        """Draws the nodes with their names and the edges with their
+        delay. The width of the edges grows with the number of routed
+        workflows.
+
+        Args:
+            colors (list[str] | None): The color of each edge, in the
+            order of Network.edges, or None for the default one.
+        """
+        positions = {}
+        labels = {}
+        for n in self._network.nodes:
+            positions[n] = [n.position[1], n.position[0]]
+            labels[n] = n.name
+        nx.draw_networkx_nodes(self._network,
+                               pos=positions)
+        nx.draw_networkx_labels(self._network,
+                                pos=positions,
+                                labels=labels)
+        edge_labels = {}
+        edge_width = []
+        for (u, v, l) in self._network.edges(data=True):
+            data: NetworkLink = l["data"]
+            edge_labels[(u, v)] = round(data.delay, 2)
+            edge_width.append(1 + len(data.routed_flows) * 1.2)
+        edge_style = {}
+        if (colors != None):
+            edge_style["edge_color"] = colors
+        nx.draw_networkx_edges(
+            self._network,
+            pos=positions,
+            width=edge_width,
+            arrowsize=edge_width,
+            **edge_style
+        )
+        nx.draw_networkx_edge_labels(
+            self._network,
+            pos=positions,
+            edge_labels=edge_labels)
@@ -0,0 +1,182 @@
+import networkx as nx
+import numpy as np
+try:
+    import matplotlib
+    from matplotlib.collections import LineCollection
+except ImportError as error:
+    raise ImportError(
+        "Rendering a Network requires matplotlib. Install the optional "
+        "dependencies with: pip install -r requirements-viz.txt") from error
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkLink import NetworkLink
+from network_envs.envs.NetworkEnv import NetworkEnv
+
+PATH_COLOR = (1.0, 0.0, 0.0, 1.0)
+LINK_COLOR = (0.0, 0.0, 0.0, 1.0)
+
+
+class NetworkRenderer(object):
+    """Renders the frames of an environment. Unlike NetworkDrawer, the
+    figure is built once: the positions of the NetworkNodes, their
+    labels and the segments of the infrastructure NetworkLinks are
+    static artists, and every frame only updates the colors and widths
+    of the NetworkLinks plus the positions of the NetworkDevices, which
+    may move or change their AP.
+    """
+
+
+    def __init__(self,
+                 network: nx.DiGraph,
+                 render_mode: str,
+                 render_fps: int = 4) -> None:
+        """Creates the renderer. The figure is not built until the
+        first frame is rendered.
+
+        Args:
+            network (nx.DiGraph): The Network to render.
+            render_mode (str): "human" to show the frames in a window or
+            "rgb_array" to return them as arrays.
+            render_fps (int, optional): The frames per second in the
+            "human" mode. Defaults to 4.
+
+        Raises:
+            ValueError: If the render mode is not supported.
+        """
+        if (render_mode not in NetworkEnv.metadata["render_modes"]):
+            raise ValueError(
+                f"Unsupported render mode {render_mode}, expected one of "
+                f"{NetworkEnv.metadata['render_modes']}.")
+        self._network: nx.DiGraph = network
+        self._render_mode: str = render_mode
+        self._render_fps: int = render_fps
+        self._figure = None
+
+    @property
+    def render_mode(self) -> str:
+        """Returns the render mode.
+
+        Returns:
+            str: The render mode.
+        """
+        return self._render_mode
+
+    def render(self, path: list[NetworkLink]) -> np.ndarray | None:
+        """Renders a frame where the given path is highlighted and the
+        width of each NetworkLink grows with its routed workflows.
+
+        Args:
+            path (list[NetworkLink]): The NetworkLinks to highlight.
+
+        Returns:
+            np.ndarray | None: In the "rgb_array" mode, the frame as an
+            array of shape (height, width, 3). None otherwise.
+        """
+        if (self._figure == None):
+            self._build()
+        self._update(path)
+        if (self._render_mode == "rgb_array"):
+            self._figure.canvas.draw()
+            return np.asarray(self._figure.canvas.buffer_rgba())[:, :, :3]\
+                .copy()
+        import matplotlib.pyplot as plt
+        self._figure.canvas.draw_idle()
+        self._figure.canvas.flush_events()
+        plt.pause(1.0 / self._render_fps)
+        return None
+
+    def close(self) -> None:
+        """Releases the figure."""
+        if (self._figure != None and self._render_mode == "human"):
+            import matplotlib.pyplot as plt
+            plt.close(self._figure)
+        self._figure = None
+
+    def _build(self) -> None:
+        """Builds the figure and the static artists."""
+        if (self._render_mode == "human"):
+            import matplotlib.pyplot as plt
+            plt.ion()
+            self._figure = plt.figure()
+        else:
+            # A figure without pyplot is not tied to any GUI backend
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self._figure = Figure()
+            FigureCanvasAgg(self._figure)
+        axes = self._figure.add_subplot()
+        axes.set_axis_off()
+        self._nodes: list[NetworkNode | NetworkDevice] =\
+            list(self._network.nodes)
+        self._node_index: dict[NetworkNode | NetworkDevice, int] = {
+            n: i for i, n in enumerate(self._nodes)}
+        self._devices: list[NetworkDevice] = [
+            n for n in self._nodes if (isinstance(n, NetworkDevice))]
+        self._device_rows: np.ndarray = np.array(
+            [self._node_index[d] for d in self._devices],
+            dtype=np.int64)
+        self._positions: np.ndarray = np.array(
+            [[n.position[1], n.position[0]] for n in self._nodes],
+            dtype=np.float64)
+        self._node_artist = axes.scatter(self._positions[:, 0],
+                                         self._positions[:, 1],
+                                         zorder=2)
+        self._label_artists = [
+            axes.text(x, y, n.name, fontsize=6, ha="center", va="bottom")
+            for n, (x, y) in zip(self._nodes, self._positions)]
+        # The infrastructure NetworkLinks first, then the two
+        # NetworkLinks of each NetworkDevice, whose segments are updated
+        # on every frame
+        self._links: list[NetworkLink] = []
+        self._endpoints: list[tuple[int, int]] = []
+        for u, v, l in self._network.edges(data="data"):
+            if (isinstance(u, NetworkNode) and isinstance(v, NetworkNode)):
+                self._links.append(l)
+                self._endpoints.append((self._node_index[u],
+                                        self._node_index[v]))
+        self._n_static: int = len(self._links)
+        for d in self._devices:
+            ap: NetworkNode = self._network.attached_ap(d)
+            self._links.append(self._network[d][ap]["data"])
+            self._links.append(self._network[ap][d]["data"])
+        self._link_index: dict[NetworkLink, int] = {
+            l: i for i, l in enumerate(self._links)}
+        self._colors: np.ndarray = np.tile(LINK_COLOR, (len(self._links), 1))
+        self._edge_artist = LineCollection(self._segments(), zorder=1)
+        axes.add_collection(self._edge_artist)
+        axes.autoscale_view()
+
+    def _segments(self) -> np.ndarray:
+        """Computes the segment of every NetworkLink.
+
+        Returns:
+            np.ndarray: The segments, of shape (n_links, 2, 2).
+        """
+        endpoints = list(self._endpoints)
+        for d in self._devices:
+            device: int = self._node_index[d]
+            ap: int = self._node_index[self._network.attached_ap(d)]
+            endpoints.append((device, ap))
+            endpoints.append((ap, device))
+        return self._positions[np.array(endpoints, dtype=np.int64)]
+
+    def _update(self, path: list[NetworkLink]) -> None:
+        """Updates the dynamic part of the artists.
+
+        Args:
+            path (list[NetworkLink]): The NetworkLinks to highlight.
+        """
+        if (len(self._devices) > 0):
+            self._positions[self._device_rows] = [
+                [d.position[1], d.position[0]] for d in self._devices]
+            self._node_artist.set_offsets(self._positions)
+            for row in self._device_rows.tolist():
+                self._label_artists[row].set_position(self._positions[row])
+            self._edge_artist.set_segments(self._segments())
+        self._colors[:] = LINK_COLOR
+        highlighted = [self._link_index[l] for l in path
+                       if (l in self._link_index)]
+        self._colors[highlighted] = PATH_COLOR
+        self._edge_artist.set_color(self._colors)
+        self._edge_artist.set_linewidth(
+            [1 + len(l.routed_flows) * 1.2 for l in self._links])
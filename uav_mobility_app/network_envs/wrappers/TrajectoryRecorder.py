@@ -0,0 +1,399 @@
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+import numpy as np
+from gymnasium import Wrapper, Env
+from network_envs.entities.Network import Network
+from network_envs.entities.NetworkDevice import NetworkDevice
+from network_envs.entities.NetworkNode import NetworkNode
+from network_envs.enums.NetworkLinkTier import NetworkLinkTier
+from network_envs.utils.TrajectoryDataset import METADATA_FILE
+
+
+class TrajectoryRecorder(Wrapper):
+    """Records every step of a NetworkEnv (or of a PathNetworkEnv) into
+    columnar buffers: the observation the action was taken in, the
+    action, the reward, the next observation, the end-of-episode flags,
+    the id of the routed NetworkDevice, the ids of the NetworkLinks of
+    its path and the utilization of each NetworkLinkTier. Optionally, the
+    state of the Network the action was taken in (the available
+    throughput of every NetworkLink and the AP of every UAV) is stored
+    too, so that ReplayNetworkEnv can reconstruct it. A dense row of
+    every NetworkLink per step would dwarf the rest of the dataset, so
+    only the changes are stored, in tables whose rows are events rather
+    than steps: the NetworkLinks whose available throughput changed
+    since the previous step, the UAVs that were handed over, and a full
+    snapshot every snapshot_interval steps from which the state of any
+    step is rebuilt. The buffers of the steps are preallocated and,
+    when full, written to a NumPy .npz chunk by a background thread
+    while the recording continues in a second set of buffers, so the
+    training loop only pays for copying the row. The dataset directory
+    contains the chunks and a metadata.json that lists them.
+    """
+
+
+    def __init__(self,
+                 env: Env,
+                 directory: Path,
+                 chunk_size: int = 65536,
+                 compress: bool = True,
+                 max_path_length: int = None,
+                 record_network: bool = True,
+                 snapshot_interval: int = 1024) -> None:
+        """Wraps the environment.
+
+        Args:
+            env (Env): The NetworkEnv to record.
+            directory (Path): The directory where the dataset is
+            written. It is created if needed.
+            chunk_size (int, optional): The number of steps per chunk.
+            Defaults to 65536.
+            compress (bool, optional): Whether the chunks are
+            compressed. Defaults to True.
+            max_path_length (int, optional): The number of NetworkLink
+            ids stored per step; shorter paths are padded with -1 and
+            longer ones truncated. Defaults to the number of nodes of
+            the Network, the length of the longest simple path.
+            record_network (bool, optional): Whether to store the
+            state of the Network. Defaults to True.
+            snapshot_interval (int, optional): The number of steps
+            between full snapshots of the Network; the longer, the
+            smaller the dataset and the more changes replayed to rebuild
+            the state of a step. Defaults to 1024.
+        """
+        super().__init__(env)
+        self._directory: Path = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._chunk_size: int = chunk_size
+        self._compress: bool = compress
+        network: Network = self.unwrapped.network
+        if (max_path_length == None):
+            max_path_length = len(network.nodes)
+        observation_shape: tuple = self.observation_space.shape
+        self._columns: dict[str, tuple[tuple, np.dtype]] = {
+            "episode": ((), np.dtype(np.int64)),
+            "step": ((), np.dtype(np.int32)),
+            "observation": (observation_shape, np.dtype(np.float32)),
+            "action": ((), np.dtype(np.int64)),
+            "reward": ((), np.dtype(np.float32)),
+            "next_observation": (observation_shape, np.dtype(np.float32)),
+            "terminated": ((), np.dtype(np.bool_)),
+            "truncated": ((), np.dtype(np.bool_)),
+            "device_id": ((), np.dtype(np.int32)),
+            "link_ids": ((max_path_length,), np.dtype(np.int32)),
+            "utilization": ((len(NetworkLinkTier),),
+                            np.dtype(np.float32))}
+        # Tables of events, whose rows are not steps; each one has a
+        # step column with the step the event is part of
+        self._tables: dict[str, dict[str, tuple[tuple, np.dtype]]] = {}
+        self._record_network: bool = record_network
+        if (record_network):
+            self._tables = {
+                "snapshots": {
+                    "step": ((), np.dtype(np.int64)),
+                    "link_available": ((len(network.network_links),),
+                                       np.dtype(np.float64)),
+                    "uav_ap_ids": ((len(network.uavs),),
+                                   np.dtype(np.int32))},
+                "link_changes": {
+                    "step": ((), np.dtype(np.int64)),
+                    "link": ((), np.dtype(np.int32)),
+                    "available": ((), np.dtype(np.float64))},
+                "handovers": {
+                    "step": ((), np.dtype(np.int64)),
+                    "uav": ((), np.dtype(np.int32)),
+                    "ap_id": ((), np.dtype(np.int32))}}
+            self._snapshot_interval: int = snapshot_interval
+            # State of the Network at the last step, only updated for
+            # the NetworkLinks and UAVs that changed since then
+            self._link_positions: dict = {
+                l: i for i, l in enumerate(network.network_links)}
+            self._link_available: np.ndarray = np.array(
+                [l.available_throughput for l in network.network_links],
+                dtype=np.float64)
+            self._uav_positions: dict[NetworkDevice, int] = {
+                u: i for i, u in enumerate(network.uavs)}
+            self._uav_ap_ids: np.ndarray = np.array(
+                [network.attached_ap(u).id for u in network.uavs],
+                dtype=np.int32)
+            self._dirty_links: set = network.track_dirty_links()
+            self._handovers: dict[NetworkDevice, NetworkNode] = {}
+            network.subscribe_handovers(self._on_handover)
+        # Two sets of buffers: one is filled while the other is written
+        self._buffers: list[dict[str, np.ndarray]] = [self._allocate(),
+                                                      self._allocate()]
+        self._events: list[dict[str, dict[str, list]]] = [
+            self._allocate_events(),
+            self._allocate_events()]
+        self._pending: list[Future | None] = [None, None]
+        self._active: int = 0
+        self._size: int = 0
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self._chunks: list[dict[str, Any]] = []
+        self._n_steps: int = 0
+        self._episode: int = -1
+        self._step: int = 0
+        self._observation: np.ndarray | None = None
+        self._closed: bool = False
+
+    @property
+    def directory(self) -> Path:
+        """Returns the directory of the dataset.
+
+        Returns:
+            Path: The directory of the dataset.
+        """
+        return self._directory
+
+    @property
+    def n_steps(self) -> int:
+        """Returns the number of steps recorded so far.
+
+        Returns:
+            int: The number of steps recorded so far.
+        """
+        return self._n_steps
+
+    def reset(self,
+              *,
+              seed: int | None = None,
+              options: dict | None = None) -> tuple:
+        """Resets the subjacent Env and starts a new episode.
+
+        Args:
+            seed (int | None, optional): The seed to provide
+            reproducibility. Defaults to None.
+            options (dict | None, optional): no use for options.
+            Defaults to None.
+
+        Returns:
+            tuple: The observation and additional info.
+        """
+        obs, info = super().reset(seed=seed, options=options)
+        self._episode += 1
+        self._step = 0
+        self._observation = obs
+        return obs, info
+
+    def step(self, action: Any) -> tuple:
+        """Performs the action in the subjacent Env and records the
+        step.
+
+        Args:
+            action (Any): The action to perform.
+
+        Returns:
+            tuple: The observations and additional info.
+        """
+        if (self._record_network):
+            self._snapshot()
+        obs, reward, terminated, truncated, info = super().step(action=action)
+        self._record(action, reward, obs, terminated, truncated)
+        self._observation = obs
+        self._step += 1
+        return obs, reward, terminated, truncated, info
+
+    def flush(self) -> None:
+        """Writes the steps recorded since the last chunk, if any, as a
+        new chunk. The write happens in the background.
+        """
+        if (self._size == 0):
+            return
+        index: int = len(self._chunks)
+        file_name: str = f"chunk_{index:06d}.npz"
+        columns: dict[str, np.ndarray] = {
+            name: buffer[:self._size]
+            for name, buffer in self._buffers[self._active].items()}
+        n_rows: dict[str, int] = {}
+        events: dict[str, dict[str, list]] = self._events[self._active]
+        for table, table_columns in self._tables.items():
+            n_rows[table] = len(events[table]["step"])
+            for name, (shape, dtype) in table_columns.items():
+                columns[f"{table}.{name}"] = np.array(
+                    events[table][name],
+                    dtype=dtype).reshape((n_rows[table],) + shape)
+                events[table][name].clear()
+        self._chunks.append({"file": file_name,
+                             "n_steps": self._size,
+                             "n_rows": n_rows})
+        self._pending[self._active] = self._executor.submit(
+            self._write_chunk,
+            self._directory.joinpath(file_name),
+            columns)
+        # Switch to the other set of buffers once it has been written
+        self._active = 1 - self._active
+        self._size = 0
+        if (self._pending[self._active] != None):
+            self._pending[self._active].result()
+            self._pending[self._active] = None
+
+    def close(self) -> None:
+        """Writes the pending steps and the metadata of the dataset, and
+        closes the subjacent Env.
+        """
+        if (not self._closed):
+            self.flush()
+            for future in self._pending:
+                if (future != None):
+                    future.result()
+            self._executor.shutdown()
+            metadata: dict[str, Any] = {
+                "n_steps": self._n_steps,
+                "chunk_size": self._chunk_size,
+                "columns": {
+                    name: {"shape": list(shape), "dtype": dtype.str}
+                    for name, (shape, dtype) in self._columns.items()},
+                "tables": {
+                    table: {
+                        name: {"shape": list(shape), "dtype": dtype.str}
+                        for name, (shape, dtype) in table_columns.items()}
+                    for table, table_columns in self._tables.items()},
+                "chunks": self._chunks,
+                "n_actions": int(self.action_space.n),
+                "observation_space": {
+                    "low": self.observation_space.low.tolist(),
+                    "high": self.observation_space.high.tolist()}}
+            if (self._record_network):
+                network: Network = self.unwrapped.network
+                metadata["network"] = {
+                    "link_ids": [l.id for l in network.network_links],
+                    "uav_ids": [u.id for u in network.uavs]}
+                network.untrack_dirty_links(self._dirty_links)
+                network.unsubscribe_handovers(self._on_handover)
+            with open(self._directory.joinpath(METADATA_FILE), "w") as file:
+                json.dump(metadata, file, indent=2)
+            self._closed = True
+        super().close()
+
+    def _allocate(self) -> dict[str, np.ndarray]:
+        """Allocates a set of buffers, one per column.
+
+        Returns:
+            dict[str, np.ndarray]: The buffers indexed by column name.
+        """
+        return {name: np.empty((self._chunk_size,) + shape, dtype=dtype)
+                for name, (shape, dtype) in self._columns.items()}
+
+    def _allocate_events(self) -> dict[str, dict[str, list]]:
+        """Allocates a set of buffers for the tables of events, one
+        growable list per column, as the number of events per step
+        varies.
+
+        Returns:
+            dict[str, dict[str, list]]: The buffers indexed by table and
+            column name.
+        """
+        return {table: {name: [] for name in table_columns}
+                for table, table_columns in self._tables.items()}
+
+    def _on_handover(self,
+                     uav: NetworkDevice,
+                     previous_ap: NetworkNode,
+                     ap: NetworkNode) -> None:
+        """Keeps the AP a UAV has been handed over to until the next
+        snapshot.
+
+        Args:
+            uav (NetworkDevice): The UAV.
+            previous_ap (NetworkNode): The AP it left.
+            ap (NetworkNode): The AP it is connected to.
+        """
+        self._handovers[uav] = ap
+
+    def _snapshot(self) -> None:
+        """Records what changed in the Network since the previous
+        step, or all of it if the next step is due a full snapshot.
+        """
+        events: dict[str, dict[str, list]] = self._events[self._active]
+        step: int = self._n_steps
+        changes: list[int] = []
+        for l in self._dirty_links:
+            i: int = self._link_positions[l]
+            if (l.available_throughput != self._link_available[i]):
+                self._link_available[i] = l.available_throughput
+                changes.append(i)
+        self._dirty_links.clear()
+        handovers: list[int] = []
+        for uav, ap in self._handovers.items():
+            i = self._uav_positions[uav]
+            if (ap.id != self._uav_ap_ids[i]):
+                self._uav_ap_ids[i] = ap.id
+                handovers.append(i)
+        self._handovers.clear()
+        if (step % self._snapshot_interval == 0):
+            snapshots: dict[str, list] = events["snapshots"]
+            snapshots["step"].append(step)
+            snapshots["link_available"].append(self._link_available.copy())
+            snapshots["uav_ap_ids"].append(self._uav_ap_ids.copy())
+            return
+        link_changes: dict[str, list] = events["link_changes"]
+        for i in sorted(changes):
+            link_changes["step"].append(step)
+            link_changes["link"].append(i)
+            link_changes["available"].append(self._link_available[i])
+        handover_events: dict[str, list] = events["handovers"]
+        for i in sorted(handovers):
+            handover_events["step"].append(step)
+            handover_events["uav"].append(i)
+            handover_events["ap_id"].append(self._uav_ap_ids[i])
+
+    def _record(self,
+                action: Any,
+                reward: float,
+                next_observation: np.ndarray,
+                terminated: bool,
+                truncated: bool) -> None:
+        """Copies a step into the active buffers.
+
+        Args:
+            action (Any): The action performed.
+            reward (float): The reward obtained.
+            next_observation (np.ndarray): The observation after the
+            action.
+            terminated (bool): Whether the episode terminated.
+            truncated (bool): Whether the episode was truncated.
+        """
+        buffers: dict[str, np.ndarray] = self._buffers[self._active]
+        row: int = self._size
+        network: Network = self.unwrapped.network
+        device = self.unwrapped.device
+        buffers["episode"][row] = self._episode
+        buffers["step"][row] = self._step
+        buffers["observation"][row] = np.reshape(
+            self._observation,
+            buffers["observation"].shape[1:])
+        buffers["action"][row] = action
+        buffers["reward"][row] = reward
+        buffers["next_observation"][row] = np.reshape(
+            next_observation,
+            buffers["next_observation"].shape[1:])
+        buffers["terminated"][row] = terminated
+        buffers["truncated"][row] = truncated
+        buffers["device_id"][row] = device.id if (device != None) else -1
+        link_ids: np.ndarray = buffers["link_ids"][row]
+        path_ids: list[int] = [l["data"].id
+                               for (_, _, l) in self.unwrapped.path]
+        path_ids = path_ids[:len(link_ids)]
+        link_ids[:] = -1
+        link_ids[:len(path_ids)] = path_ids
+        buffers["utilization"][row] = [network.tier_utilization(tier)
+                                       for tier in NetworkLinkTier]
+        self._size += 1
+        self._n_steps += 1
+        if (self._size == self._chunk_size):
+            self.flush()
+
+    def _write_chunk(self,
+                     file_path: Path,
+                     columns: dict[str, np.ndarray]) -> None:
+        """Writes a chunk. Runs in the background thread.
+
+        Args:
+            file_path (Path): The file of the chunk.
+            columns (dict[str, np.ndarray]): The columns of the chunk.
+        """
+        if (self._compress):
+            np.savez_compressed(file_path, **columns)
+        else:
+            np.savez(file_path, **columns)